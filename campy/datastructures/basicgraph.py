@@ -1,3 +1,26 @@
+"""This file exports a :class:`BasicGraph` of :class:`Vertex` and :class:`Edge` objects, along with
+classic search algorithms over it.
+
+Usage::
+
+    graph = BasicGraph()
+    graph.add_edge('home', 'school', cost=3.0)
+    graph.add_edge('home', 'park', cost=1.0)
+    graph.add_edge('park', 'school', cost=1.0)
+    path = graph.dijkstras_algorithm('home', 'school')
+    print([vertex.name for vertex in path])  # => ['home', 'park', 'school']
+    print(path[-1].cost)  # => 2.0
+
+Every search records its results on the vertices it reaches (``visited``,
+``previous`` and ``cost``). Before each search, the graph forgets the results
+of the last one in constant time, by moving to a new epoch: a vertex whose data
+was stamped in an older epoch reads as unvisited.
+"""
+import campy.datastructures.graph as _graph
+from campy.datastructures.pqueue import PriorityQueue
+
+import collections as _collections
+
 # TODO(sredmond): Implement hash.
 
 class Vertex():
@@ -7,6 +30,10 @@ class Vertex():
     # TODO(sredmond): Investigate whether VertexGen in the C++ library is meaningful.
     def __init__(self, name):
         self.name = name
+        # A graph's epoch clock, shared by all of its vertices. Data stamped
+        # with an older epoch is stale, and reads as reset.
+        self._clock = None
+        self._stamp = 0
         self.reset_data()
 
     ## TODO Copy constructor
@@ -18,6 +45,45 @@ class Vertex():
         self.cost = 0.0
         self._color = 0  # UNCOLORED
 
+    def _refresh(self):
+        """Reset this vertex's search data if it was set in an earlier epoch."""
+        clock = self._clock
+        if clock is not None and self._stamp != clock[0]:
+            self._visited = False
+            self._previous = None
+            self._cost = 0.0
+            self._stamp = clock[0]
+
+    @property
+    def visited(self):
+        self._refresh()
+        return self._visited
+
+    @visited.setter
+    def visited(self, value):
+        self._refresh()
+        self._visited = value
+
+    @property
+    def previous(self):
+        self._refresh()
+        return self._previous
+
+    @previous.setter
+    def previous(self, value):
+        self._refresh()
+        self._previous = value
+
+    @property
+    def cost(self):
+        self._refresh()
+        return self._cost
+
+    @cost.setter
+    def cost(self, value):
+        self._refresh()
+        self._cost = value
+
     @property
     def color(self):
         """Return the color of this vertex."""
@@ -87,6 +153,306 @@ class Edge():
 
 # Arc = Edge  # Should we alias this too?
 
-class BasicGraph():
+class BasicGraph(_graph.Graph):
     def __init__(self):
+        super().__init__(Vertex, Edge)
         self._reset_enabled = True
+        self._clock = [0]
+
+    def add_node(self, node_info, named=False):
+        node = super().add_node(node_info, named=named)
+        node._clock = self._clock
+        return node
+
+    def _make_node(self, name):
+        return Vertex(name)
+
+    def add_vertex(self, name):
+        """Add a new vertex with the given name to this graph, and return it."""
+        return self.add_node(Vertex(name))
+
+    def get_vertex(self, name):
+        """Return the vertex with the given name, or None if there is no such vertex."""
+        return self.node_map.get(name)
+
+    def add_edge(self, start, finish, cost=0.0, directed=True):
+        """Add an edge between two vertices, creating either vertex if needed.
+
+        :param start: The starting vertex, or its name.
+        :param finish: The finishing vertex, or its name.
+        :param cost: The cost of the edge.
+        :param directed: Whether to add only the edge from start to finish, rather than an edge each way.
+        :returns: The edge from start to finish.
+        """
+        start, finish = self._vertex(start, create=True), self._vertex(finish, create=True)
+        if not directed:
+            self.add_arc(Edge(finish, start, cost))
+        return self.add_arc(Edge(start, finish, cost))
+
+    def reset_data(self):
+        """Reset the search data on every vertex, in constant time."""
+        self._clock[0] += 1
+
+    @property
+    def reset_enabled(self):
+        """Whether each search first resets the data left on the vertices by earlier searches."""
+        return self._reset_enabled
+
+    @reset_enabled.setter
+    def reset_enabled(self, enabled):
+        self._reset_enabled = enabled
+
+    ##############
+    # Algorithms #
+    ##############
+    def breadth_first_search(self, start, end):
+        """Return a path from start to end with the fewest edges, or an empty list if there isn't one.
+
+        :param start: The starting vertex, or its name.
+        :param end: The ending vertex, or its name.
+        :returns: A list of vertices from start to end.
+        """
+        start, end = self._begin(start, end)
+        previous = {start: None}
+        frontier = _collections.deque([start])
+        while frontier:
+            vertex = frontier.popleft()
+            if vertex is end:
+                break
+            for arc in vertex.arcs:
+                neighbor = arc.finish
+                if neighbor not in previous:
+                    previous[neighbor] = vertex
+                    frontier.append(neighbor)
+        self._record(previous)
+        return self._path(previous, end)
+
+    def depth_first_search(self, start, end):
+        """Return some path from start to end, found depth first, or an empty list if there isn't one.
+
+        :param start: The starting vertex, or its name.
+        :param end: The ending vertex, or its name.
+        :returns: A list of vertices from start to end.
+        """
+        start, end = self._begin(start, end)
+        previous = {start: None}
+        # An explicit stack of arc iterators avoids Python's recursion limit.
+        stack = [iter(start.arcs)] if start is not end else []
+        vertices = [start]
+        while stack:
+            arc = next(stack[-1], None)
+            if arc is None:
+                stack.pop()
+                vertices.pop()
+                continue
+            neighbor = arc.finish
+            if neighbor in previous:
+                continue
+            previous[neighbor] = vertices[-1]
+            if neighbor is end:
+                break
+            stack.append(iter(neighbor.arcs))
+            vertices.append(neighbor)
+        self._record(previous)
+        return self._path(previous, end)
+
+    def dijkstras_algorithm(self, start, end):
+        """Return a cheapest path from start to end, or an empty list if there isn't one.
+
+        Edge costs must be nonnegative. Afterwards, each visited vertex's cost
+        is its distance from start.
+
+        :param start: The starting vertex, or its name.
+        :param end: The ending vertex, or its name.
+        :returns: A list of vertices from start to end.
+        """
+        return self.a_star(start, end, heuristic=None)
+
+    def a_star(self, start, end, heuristic=None):
+        """Return a cheapest path from start to end using A* search, or an empty list if there isn't one.
+
+        The heuristic estimates the cost of the cheapest path between two
+        vertices. As long as it never overestimates, the returned path is a
+        cheapest one. Without a heuristic, this is Dijkstra's algorithm.
+
+        Usage::
+
+            def straight_line(vertex, end):
+                return math.dist(positions[vertex.name], positions[end.name])
+
+            path = graph.a_star('home', 'school', heuristic=straight_line)
+
+        :param start: The starting vertex, or its name.
+        :param end: The ending vertex, or its name.
+        :param heuristic: A function from (vertex, end) to an estimated remaining cost.
+        :returns: A list of vertices from start to end.
+        """
+        start, end = self._begin(start, end)
+        distance = {start: 0.0}
+        previous = {start: None}
+        settled = set()
+        pq = PriorityQueue()
+        pq.add(start, heuristic(start, end) if heuristic else 0.0)
+        while pq:
+            vertex = pq.dequeue()
+            settled.add(vertex)
+            if vertex is end:
+                break
+            base = distance[vertex]
+            for arc in vertex.arcs:
+                neighbor = arc.finish
+                new_distance = base + arc.cost
+                old_distance = distance.get(neighbor)
+                if old_distance is None or new_distance < old_distance:
+                    distance[neighbor] = new_distance
+                    previous[neighbor] = vertex
+                    priority = new_distance + heuristic(neighbor, end) if heuristic else new_distance
+                    if neighbor in pq:
+                        pq.change_priority(neighbor, priority)
+                    else:
+                        # Includes settled vertices, in case the heuristic is inconsistent.
+                        pq.add(neighbor, priority)
+        self._record(previous, distance, visited=settled)
+        return self._path(previous, end)
+
+    def all_pairs_shortest_paths(self, sources=None, workers=None):
+        """Compute the distances from many source vertices to every vertex, in parallel.
+
+        This graph is frozen (see :meth:`freeze`) and searched by a pool of
+        worker processes, so vertices are never copied between processes. Edge
+        costs must be nonnegative.
+
+        Usage::
+
+            names = list(graph.node_map)
+            for source, distance in graph.all_pairs_shortest_paths(['home', 'school'], workers=4):
+                print(source, dict(zip(names, distance)))
+
+        :param sources: The vertices (or names) to search from. Defaults to every vertex.
+        :param workers: The number of worker processes. Defaults to the number of CPUs.
+        :returns: An iterator of (source name, distances) pairs, in no particular
+                  order. Each distances array holds the distance to every vertex,
+                  in the order of ``graph.node_map`` (infinite if unreachable).
+        """
+        frozen = self.freeze()
+        if sources is not None:
+            sources = [frozen.id_of(self._vertex(source).name) for source in sources]
+        for source, distances in frozen.all_pairs_shortest_paths(sources, workers=workers):
+            yield frozen.name_of(source), distances
+
+    def bidirectional_search(self, start, end):
+        """Return a path from start to end with the fewest edges, searching from both ends at once.
+
+        This explores far fewer vertices than :meth:`breadth_first_search` when
+        vertices have many neighbors.
+
+        :param start: The starting vertex, or its name.
+        :param end: The ending vertex, or its name.
+        :returns: A list of vertices from start to end, or an empty list if there isn't one.
+        """
+        start, end = self._begin(start, end)
+        if start is end:
+            self._record({start: None})
+            return [start]
+        # Each side maps the vertices it has reached to (neighbor toward its origin, depth).
+        forward, backward = {start: (None, 0)}, {end: (None, 0)}
+        forward_frontier, backward_frontier = [start], [end]
+        meeting = None
+        while forward_frontier and backward_frontier and meeting is None:
+            # Expand the smaller frontier by a whole level.
+            if len(forward_frontier) <= len(backward_frontier):
+                forward_frontier, meeting = self._expand(forward_frontier, forward, backward, outgoing=True)
+            else:
+                backward_frontier, meeting = self._expand(backward_frontier, backward, forward, outgoing=False)
+        for vertex in backward:
+            vertex.visited = True
+        previous = {vertex: link for vertex, (link, _) in forward.items()}
+        self._record(previous)
+        if meeting is None:
+            return []
+        path = self._path(previous, meeting)
+        vertex = meeting
+        while vertex is not end:
+            following = backward[vertex][0]
+            following.previous = vertex
+            path.append(following)
+            vertex = following
+        return path
+
+    def _expand(self, frontier, reached, other, outgoing):
+        """Expand a frontier by one level, and return the next frontier and the best meeting vertex."""
+        next_frontier = []
+        best, best_length = None, None
+        for vertex in frontier:
+            depth = reached[vertex][1] + 1
+            arcs = vertex.arcs if outgoing else self._incoming[vertex]
+            for arc in arcs:
+                neighbor = arc.finish if outgoing else arc.start
+                if neighbor in reached:
+                    continue
+                reached[neighbor] = (vertex, depth)
+                next_frontier.append(neighbor)
+                if neighbor in other:
+                    length = depth + other[neighbor][1]
+                    if best is None or length < best_length:
+                        best, best_length = neighbor, length
+        return next_frontier, best
+
+    def topological_sort(self):
+        """Return every vertex, ordered so that each edge goes from an earlier vertex to a later one.
+
+        :returns: A list of vertices.
+        :raises ValueError: If this graph has a cycle.
+        """
+        remaining = {vertex: len(self._incoming[vertex]) for vertex in self.node_map.values()}
+        ready = _collections.deque(vertex for vertex, count in remaining.items() if not count)
+        order = []
+        while ready:
+            vertex = ready.popleft()
+            order.append(vertex)
+            for arc in vertex.arcs:
+                remaining[arc.finish] -= 1
+                if not remaining[arc.finish]:
+                    ready.append(arc.finish)
+        if len(order) != len(remaining):
+            raise ValueError('BasicGraph::topological_sort: graph has a cycle')
+        return order
+
+    def _vertex(self, vertex, create=False):
+        """Look up a vertex by name, if needed."""
+        if isinstance(vertex, Vertex):
+            return vertex
+        found = self.node_map.get(vertex)
+        if found is None:
+            if not create:
+                raise KeyError('BasicGraph: no vertex named {}'.format(vertex))
+            found = self.add_vertex(vertex)
+        return found
+
+    def _begin(self, start, end):
+        """Look up the endpoints of a search, and reset vertex data if enabled."""
+        if self._reset_enabled:
+            self.reset_data()
+        return self._vertex(start), self._vertex(end)
+
+    @staticmethod
+    def _record(previous, distance=None, visited=None):
+        """Record search results on the vertices that the search reached."""
+        for vertex, before in previous.items():
+            vertex.previous = before
+            if distance is not None:
+                vertex.cost = distance[vertex]
+        for vertex in previous if visited is None else visited:
+            vertex.visited = True
+
+    @staticmethod
+    def _path(previous, end):
+        """Follow previous links back from end to build a path."""
+        if end not in previous:
+            return []
+        path = []
+        while end is not None:
+            path.append(end)
+            end = previous[end]
+        path.reverse()
+        return path
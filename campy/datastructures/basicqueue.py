@@ -1,18 +1,66 @@
 """A basic, stripped down queue.
 
+A queue may have a capacity. What happens when a value is added to a full
+queue depends on its :class:`Overflow` policy::
+
+    recent = BasicQueue(capacity=3, overflow=Overflow.DROP_OLDEST)
+    recent.enqueue_many(range(5))
+    print(recent)  # => BasicQueue([2, 3, 4])
+
+Values can be added and removed in bulk, which is much faster than one at a
+time. To share a queue between threads, use :class:`ThreadSafeBasicQueue`,
+whose :meth:`~ThreadSafeBasicQueue.dequeue` waits for a value, and which can
+wait for room when full::
+
+    jobs = ThreadSafeBasicQueue(capacity=100)  # Blocks producers when full.
+    # In producer threads:
+    jobs.enqueue(job)
+    # In consumer threads:
+    job = jobs.dequeue()
 """
 import collections as _collections
 import collections.abc as _collections_abc
+import enum as _enum
 import functools as _functools
+import itertools as _itertools
+import threading as _threading
+
+
+@_enum.unique
+class Overflow(_enum.Enum):
+    """What a bounded queue or stack does when a value is added while it is full."""
+    RAISE = 'raise'  # Raise an OverflowError.
+    DROP_OLDEST = 'drop_oldest'  # Discard the oldest value to make room.
+    BLOCK = 'block'  # Wait for another thread to make room. Only thread-safe variants can block.
+
+
+def _sized(values):
+    """Return values as a sized collection, copying it only if needed."""
+    return values if isinstance(values, _collections_abc.Sized) else list(values)
+
+
+def _popleft_many(d, count):
+    """Pop count values from the left of a deque, looping in C rather than in Python."""
+    return list(_itertools.starmap(d.popleft, _itertools.repeat((), count)))
 
 
 # Implementation note: The head of the queue at index 0.
 @_functools.total_ordering
 # TODO(sredmond): Sized,Iterable,Container is called Collection in 3.6+
 class BasicQueue(_collections_abc.Sized, _collections_abc.Iterable, _collections_abc.Container):
-    def __init__(self, data=None):
-        self._d = _collections.deque()
+    def __init__(self, data=None, capacity=None, overflow=Overflow.RAISE):
+        """Create a new queue.
+
+        :param data: An iterable of values to enqueue, head first.
+        :param capacity: The most values the queue can hold, or None for no limit.
+        :param overflow: The :class:`Overflow` policy (or its value, like 'drop_oldest') for a full queue.
+        """
+        self._capacity, self._overflow = _check_bounds(self, capacity, overflow)
+        # For DROP_OLDEST, the deque itself discards from the head as values are added.
+        self._d = _collections.deque(maxlen=capacity if self._overflow is Overflow.DROP_OLDEST else None)
         if data:
+            data = _sized(data)
+            self._check_room(len(data))
             self._d.extend(data)
 
     def __contains__(self, val):
@@ -24,33 +72,73 @@ class BasicQueue(_collections_abc.Sized, _collections_abc.Iterable, _collections
     def __len__(self):
         return len(self._d)
 
+    @property
+    def capacity(self):
+        """The most values this queue can hold, or None if there is no limit."""
+        return self._capacity
+
+    @property
+    def overflow(self):
+        """The :class:`Overflow` policy for when this queue is full."""
+        return self._overflow
+
+    def is_full(self):
+        return self._capacity is not None and len(self._d) >= self._capacity
+
+    def _check_room(self, count):
+        if (self._capacity is not None and self._overflow is not Overflow.DROP_OLDEST
+                and len(self._d) + count > self._capacity):
+            raise OverflowError("Queue::enqueue: Attempting to enqueue onto a full queue (capacity {})".format(
+                self._capacity))
+
     # Methods from C++ library
     def enqueue(self, value):
+        self._check_room(1)
         self._d.append(value)
 
+    def enqueue_many(self, values):
+        """Add every value from an iterable to the back of this queue, in order.
+
+        If the values don't all fit (and the queue doesn't drop old values),
+        none are added.
+
+        :raises OverflowError: If the values don't fit in this queue.
+        """
+        if self._capacity is not None:
+            values = _sized(values)
+            self._check_room(len(values))
+        self._d.extend(values)
+
     def dequeue(self):
         if not self._d:
-            pass
-            # error("Queue::dequeue: Attempting to dequeue an empty queue")
+            raise IndexError("Queue::dequeue: Attempting to dequeue an empty queue")
         return self._d.popleft()
 
+    def dequeue_many(self, count=None):
+        """Remove and return up to count values from the front of this queue, front first.
+
+        :param count: The most values to remove, or None to remove them all.
+        :returns: A list of the removed values.
+        """
+        d = self._d
+        count = len(d) if count is None else min(count, len(d))
+        return _popleft_many(d, count)
+
     def clear(self):
         self._d.clear()
 
     def peek(self):
         if not self._d:
-            pass
-            # error("Queue::dequeue: Attempting to dequeue an empty queue")
+            raise IndexError("Queue::peek: Attempting to peek at an empty queue")
         return self._d[0]
 
     def back(self):
         if not self._d:
-            pass
-            # error("Queue::dequeue: Attempting to dequeue an empty queue")
+            raise IndexError("Queue::back: Attempting to read back of an empty queue")
         return self._d[-1]
 
     def __str__(self):
-        return str(self._d).replace('deque', 'BasicQueue', 1)
+        return 'BasicQueue({})'.format(list(self._d))
 
     # TODO(sredmond): Add a repr method?
 
@@ -68,4 +156,143 @@ class BasicQueue(_collections_abc.Sized, _collections_abc.Iterable, _collections
     front = peek
     # Removed: isempty, size, equals
 
-__all__ = ['BasicQueue']
+
+def _check_bounds(collection, capacity, overflow):
+    """Validate the capacity and overflow policy of a new queue or stack."""
+    overflow = Overflow(overflow)
+    if capacity is not None and capacity < 1:
+        raise ValueError('{}: capacity must be positive, not {}'.format(type(collection).__name__, capacity))
+    if overflow is Overflow.BLOCK and not isinstance(collection, _ThreadSafe):
+        raise ValueError('{}: only thread-safe variants can block when full'.format(type(collection).__name__))
+    return capacity, overflow
+
+
+class _ThreadSafe:
+    """A mixin that guards a :class:`BasicQueue` or :class:`~campy.datastructures.basicstack.BasicStack` with a lock.
+
+    Removing a value waits until there is one. With the BLOCK overflow policy,
+    adding a value to a full collection waits until there is room.
+    """
+    def __init__(self, *args, **kwargs):
+        self._lock = _threading.RLock()
+        self._not_empty = _threading.Condition(self._lock)
+        self._not_full = _threading.Condition(self._lock)
+        super().__init__(*args, **kwargs)
+
+    def _add_one(self, add, value, timeout):
+        with self._lock:
+            self._wait_for_room(1, timeout)
+            add(value)
+            self._not_empty.notify()
+
+    def _add_many(self, add_many, values, timeout):
+        with self._lock:
+            if self._capacity is None or self._overflow is not Overflow.BLOCK:
+                add_many(values)
+                self._not_empty.notify_all()
+                return
+            # Add as many values as fit, wait for consumers to make room, and repeat.
+            values = list(values)
+            start = 0
+            while start < len(values):
+                self._wait_for_room(1, timeout)
+                stop = start + self._capacity - len(self._d)
+                add_many(values[start:stop])
+                self._not_empty.notify_all()
+                start = stop
+
+    def _wait_for_room(self, count, timeout):
+        if self._capacity is None or self._overflow is not Overflow.BLOCK:
+            return
+        if not self._not_full.wait_for(lambda: len(self._d) + count <= self._capacity, timeout):
+            raise OverflowError('{}: timed out waiting for room'.format(type(self).__name__))
+
+    def _take(self, take, block, timeout, *args):
+        with self._lock:
+            if block and not self._not_empty.wait_for(lambda: self._d, timeout):
+                raise IndexError('{}: timed out waiting for a value'.format(type(self).__name__))
+            result = take(*args)
+            self._not_full.notify_all()
+            return result
+
+    def __contains__(self, val):
+        with self._lock:
+            return super().__contains__(val)
+
+    def __iter__(self):
+        # Iterate over a snapshot, so that other threads can change the collection meanwhile.
+        with self._lock:
+            return iter(list(super().__iter__()))
+
+    def __len__(self):
+        with self._lock:
+            return super().__len__()
+
+    def is_full(self):
+        with self._lock:
+            return super().is_full()
+
+    def clear(self):
+        with self._lock:
+            super().clear()
+            self._not_full.notify_all()
+
+    def peek(self):
+        with self._lock:
+            return super().peek()
+
+    def back(self):
+        with self._lock:
+            return super().back()
+
+    def __str__(self):
+        with self._lock:
+            return super().__str__()
+
+    def __eq__(self, other):
+        with self._lock:
+            return super().__eq__(other)
+
+    def __le__(self, other):
+        with self._lock:
+            return super().__le__(other)
+
+
+class ThreadSafeBasicQueue(_ThreadSafe, BasicQueue):
+    """A :class:`BasicQueue` that can be shared between producer and consumer threads."""
+    def __init__(self, data=None, capacity=None, overflow=Overflow.BLOCK):
+        super().__init__(data, capacity, overflow)
+
+    def enqueue(self, value, timeout=None):
+        """Add a value to the back of this queue, waiting up to timeout seconds for room if it is full and blocking."""
+        self._add_one(super().enqueue, value, timeout)
+
+    def enqueue_many(self, values, timeout=None):
+        """Add every value from an iterable to the back of this queue.
+
+        If the queue blocks when full, values are added as room is made for them.
+        """
+        self._add_many(super().enqueue_many, values, timeout)
+
+    def dequeue(self, block=True, timeout=None):
+        """Remove and return the value at the front of this queue.
+
+        :param block: Whether to wait for a value if the queue is empty.
+        :param timeout: The most seconds to wait, or None to wait forever.
+        :raises IndexError: If there is no value (in time).
+        """
+        return self._take(super().dequeue, block, timeout)
+
+    def dequeue_many(self, count=None, block=True, timeout=None):
+        """Remove and return up to count values from the front of this queue.
+
+        If block is true, first wait (up to timeout seconds) for at least one value.
+        """
+        return self._take(super().dequeue_many, block, timeout, count)
+
+    add = enqueue
+    remove = dequeue
+    front = _ThreadSafe.peek
+
+
+__all__ = ['BasicQueue', 'Overflow', 'ThreadSafeBasicQueue']
@@ -1,53 +1,122 @@
+"""A basic, stripped down stack.
+
+Like a :class:`~campy.datastructures.basicqueue.BasicQueue`, a stack may have a
+capacity, and an :class:`~campy.datastructures.basicqueue.Overflow` policy for
+when it is full. Dropping the oldest value of a stack discards the value at the
+bottom::
+
+    undo = BasicStack(capacity=2, overflow='drop_oldest')
+    undo.push_many(['type', 'delete', 'paste'])
+    print(undo.pop_many())  # => ['paste', 'delete']
+
+To share a stack between threads, use :class:`ThreadSafeBasicStack`.
+"""
+from campy.datastructures.basicqueue import Overflow, _ThreadSafe, _check_bounds, _popleft_many, _sized
+
 import collections as _collections
 import collections.abc as _collections_abc
 import functools as _functools
+import itertools as _itertools
 
 
 # Implementation note: The head of the stack is at index 0.
 @_functools.total_ordering
 # TODO(sredmond): Sized,Iterable,Container is called Collection in 3.6+
 class BasicStack(_collections_abc.Sized, _collections_abc.Iterable, _collections_abc.Container):
-    def __init__(self, data=None):
-        self._d = _collections.deque()
+    def __init__(self, data=None, capacity=None, overflow=Overflow.RAISE):
+        """Create a new stack.
+
+        :param data: An iterable of values, top first.
+        :param capacity: The most values the stack can hold, or None for no limit.
+        :param overflow: The :class:`~campy.datastructures.basicqueue.Overflow` policy (or its value) for a full stack.
+        """
+        self._capacity, self._overflow = _check_bounds(self, capacity, overflow)
+        # For DROP_OLDEST, the deque itself discards from the bottom as values are pushed.
+        self._d = _collections.deque(maxlen=capacity if self._overflow is Overflow.DROP_OLDEST else None)
         if data:
+            data = _sized(data)
+            self._check_room(len(data))
+            if self._d.maxlen is not None:
+                # The data is top first, so the values to drop are at its end.
+                data = _itertools.islice(data, self._d.maxlen)
             self._d.extend(data)
 
     def __contains__(self, val):
         return val in self._d
 
     def __iter__(self):
-        return reversed(iter(self._d))
+        return reversed(self._d)
 
     def __len__(self):
         return len(self._d)
 
+    @property
+    def capacity(self):
+        """The most values this stack can hold, or None if there is no limit."""
+        return self._capacity
+
+    @property
+    def overflow(self):
+        """The :class:`~campy.datastructures.basicqueue.Overflow` policy for when this stack is full."""
+        return self._overflow
+
+    def is_full(self):
+        return self._capacity is not None and len(self._d) >= self._capacity
+
+    def _check_room(self, count):
+        if (self._capacity is not None and self._overflow is not Overflow.DROP_OLDEST
+                and len(self._d) + count > self._capacity):
+            raise OverflowError("Stack::push: Attempting to push onto a full stack (capacity {})".format(
+                self._capacity))
+
     # Methods from C++ library
     def push(self, value):
+        self._check_room(1)
         self._d.appendleft(value)  # NOTE(sredmond): This is the only difference between BasicStack and BasicQueue
 
+    def push_many(self, values):
+        """Push every value from an iterable onto this stack, in order, so the last value ends up on top.
+
+        If the values don't all fit (and the stack doesn't drop old values),
+        none are pushed.
+
+        :raises OverflowError: If the values don't fit on this stack.
+        """
+        if self._capacity is not None:
+            values = _sized(values)
+            self._check_room(len(values))
+        self._d.extendleft(values)
+
     def pop(self):
         if not self._d:
-            pass
-            # error("Queue::dequeue: Attempting to dequeue an empty queue")
+            raise IndexError("Stack::pop: Attempting to pop an empty stack")
         return self._d.popleft()
 
+    def pop_many(self, count=None):
+        """Pop and return up to count values from this stack, top first.
+
+        :param count: The most values to pop, or None to pop them all.
+        :returns: A list of the popped values.
+        """
+        d = self._d
+        count = len(d) if count is None else min(count, len(d))
+        return _popleft_many(d, count)
+
     def clear(self):
         self._d.clear()
 
     def peek(self):
         if not self._d:
-            pass
-            # error("Queue::dequeue: Attempting to dequeue an empty queue")
+            raise IndexError("Stack::peek: Attempting to peek at an empty stack")
         return self._d[0]
 
     def back(self):
         if not self._d:
-            pass
-            # error("Queue::dequeue: Attempting to dequeue an empty queue")
+            raise IndexError("Stack::back: Attempting to read bottom of an empty stack")
         return self._d[-1]
 
     def __str__(self):
-        return str(self._d).replace('deque', 'BasicStack', 1)
+        return 'BasicStack({})'.format(list(self._d))
 
     # TODO(sredmond): Add a repr method?
 
@@ -66,3 +135,30 @@ class BasicStack(_collections_abc.Sized, _collections_abc.Iterable, _collections
     # Removed: isempty, size, equals
 
 
+class ThreadSafeBasicStack(_ThreadSafe, BasicStack):
+    """A :class:`BasicStack` that can be shared between threads."""
+    def __init__(self, data=None, capacity=None, overflow=Overflow.BLOCK):
+        super().__init__(data, capacity, overflow)
+
+    def push(self, value, timeout=None):
+        """Push a value, waiting up to timeout seconds for room if the stack is full and blocking."""
+        self._add_one(super().push, value, timeout)
+
+    def push_many(self, values, timeout=None):
+        """Push every value from an iterable. If the stack blocks when full, values are pushed as room is made."""
+        self._add_many(super().push_many, values, timeout)
+
+    def pop(self, block=True, timeout=None):
+        """Pop and return the top value, waiting up to timeout seconds for one if block is true.
+
+        :raises IndexError: If there is no value (in time).
+        """
+        return self._take(super().pop, block, timeout)
+
+    def pop_many(self, count=None, block=True, timeout=None):
+        """Pop and return up to count values, top first. If block is true, first wait for at least one value."""
+        return self._take(super().pop_many, block, timeout, count)
+
+    add = push
+    remove = pop
+    front = _ThreadSafe.peek
@@ -0,0 +1,352 @@
+"""This file exports a :class:`FrozenGraph`, a compact, immutable snapshot of a graph.
+
+A frozen graph stores its arcs in compressed sparse row (CSR) form. Nodes are
+numbered 0 through n - 1, the arcs leaving node ``u`` are at positions
+``offsets[u]`` up to ``offsets[u + 1]`` of the ``targets`` and ``costs``
+arrays, and nothing else is stored. Compared to a graph of node and arc objects,
+this takes about a tenth of the memory, and searches over it run faster.
+
+Usage::
+
+    graph = BasicGraph()
+    graph.add_edge('home', 'park', cost=1.0)
+    graph.add_edge('park', 'school', cost=1.0)
+    frozen = graph.freeze()
+    path = frozen.dijkstras_algorithm(frozen.id_of('home'), frozen.id_of('school'))
+    print(frozen.names_of(path))  # => ['home', 'park', 'school']
+
+Searches take and return node ids. Use :meth:`FrozenGraph.id_of` and
+:meth:`FrozenGraph.names_of` to translate to and from node names.
+"""
+import campy.datastructures.graphio as _graphio
+
+import array as _array
+import collections as _collections
+import heapq as _heapq
+import multiprocessing as _multiprocessing
+import os as _os
+
+INFINITY = float('inf')
+
+# The graph searched by a worker process of all_pairs_shortest_paths, set when
+# the worker starts. It is only ever set in worker processes.
+_worker_graph = None
+
+
+class FrozenGraph:
+    def __init__(self, names, offsets, targets, costs):
+        """Create a frozen graph directly from its CSR arrays.
+
+        Most clients should call :meth:`campy.datastructures.graph.Graph.freeze` instead.
+
+        :param names: The name of each node, by id.
+        :param offsets: An array('i') of n + 1 offsets into targets and costs.
+        :param targets: An array('i') of the node id at the end of each arc.
+        :param costs: An array('d') of the cost of each arc.
+        """
+        if len(offsets) != len(names) + 1 or len(targets) != len(costs) or offsets[-1] != len(targets):
+            raise ValueError('FrozenGraph: inconsistent CSR arrays')
+        self._names = tuple(names)
+        self._ids = {name: node for node, name in enumerate(self._names)}
+        self._offsets = offsets
+        self._targets = targets
+        self._costs = costs
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Create a frozen snapshot of a :class:`~campy.datastructures.graph.Graph`.
+
+        Nodes are numbered in the order in which they were added to the graph.
+        Arcs without a cost attribute cost 0.
+
+        :param graph: The graph to freeze.
+        :returns: A new :class:`FrozenGraph`.
+        """
+        nodes = list(graph.node_map.values())
+        ids = {node: index for index, node in enumerate(nodes)}
+        offsets = _array.array('i', [0])
+        targets = _array.array('i')
+        costs = _array.array('d')
+        for node in nodes:
+            for arc in node.arcs:
+                targets.append(ids[arc.finish])
+                costs.append(getattr(arc, 'cost', _graphio.DEFAULT_ARC_COST))
+            offsets.append(len(targets))
+        return cls([node.name for node in nodes], offsets, targets, costs)
+
+    @classmethod
+    def from_arcs(cls, names, arcs):
+        """Create a frozen graph from node names and (start id, finish id, cost) triples.
+
+        :param names: The name of each node, by id.
+        :param arcs: An iterable of (start id, finish id, cost) triples.
+        :returns: A new :class:`FrozenGraph`.
+        """
+        starts = _array.array('i')
+        finishes = _array.array('i')
+        costs = _array.array('d')
+        for start, finish, cost in arcs:
+            starts.append(start)
+            finishes.append(finish)
+            costs.append(cost)
+        return cls._from_columns(names, starts, finishes, costs)
+
+    @classmethod
+    def read_binary(cls, filename):
+        """Read a frozen graph from a file in binary format.
+
+        The arc columns are read straight from a memory map into the frozen
+        graph's arrays, so reading takes little memory beyond the graph itself.
+
+        :param filename: The path of the file to read.
+        :returns: A new :class:`FrozenGraph`.
+        """
+        with _graphio.open_binary(filename) as (names, starts, finishes, costs):
+            return cls._from_columns(names, starts, finishes, costs)
+
+    def write_binary(self, filename):
+        """Write this graph to a file in binary format."""
+        offsets = self._offsets
+        starts = (node for node in range(len(self._names)) for _ in range(offsets[node], offsets[node + 1]))
+        _graphio.write_binary(filename, self._names, starts, self._targets, self._costs)
+
+    @classmethod
+    def _from_columns(cls, names, starts, finishes, weights):
+        """Create a frozen graph from the start ids, finish ids, and costs of its arcs."""
+        names = list(names)
+        # Counting sort the arcs by their starting node.
+        offsets = _array.array('i', bytes(4 * (len(names) + 1)))
+        ordered = True
+        previous = 0
+        for start in starts:
+            offsets[start + 1] += 1
+            if start < previous:
+                ordered = False
+            previous = start
+        for node in range(len(names)):
+            offsets[node + 1] += offsets[node]
+        if ordered:
+            # The arcs are already grouped by start node (as in files written by
+            # write_binary), so copy the columns in bulk.
+            return cls(names, offsets, _copy_column('i', finishes), _copy_column('d', weights))
+        fill = _array.array('i', offsets[:-1])
+        targets = _array.array('i', bytes(4 * len(starts)))
+        costs = _array.array('d', bytes(8 * len(starts)))
+        for start, finish, cost in zip(starts, finishes, weights):
+            position = fill[start]
+            targets[position] = finish
+            costs[position] = cost
+            fill[start] = position + 1
+        return cls(names, offsets, targets, costs)
+
+    ###########
+    # Queries #
+    ###########
+    @property
+    def num_nodes(self):
+        return len(self._names)
+
+    @property
+    def num_arcs(self):
+        return len(self._targets)
+
+    def __len__(self):
+        return len(self._names)
+
+    @property
+    def names(self):
+        """The name of each node, by id."""
+        return self._names
+
+    def id_of(self, name):
+        """Return the id of the node with the given name.
+
+        :raises KeyError: If there is no such node.
+        """
+        return self._ids[name]
+
+    def name_of(self, node):
+        """Return the name of the node with the given id."""
+        return self._names[node]
+
+    def names_of(self, nodes):
+        """Translate a list of node ids, such as a path, into a list of names."""
+        names = self._names
+        return [names[node] for node in nodes]
+
+    def neighbors(self, node):
+        """Return the ids at the end of the arcs leaving a node, as an array."""
+        return self._targets[self._offsets[node]:self._offsets[node + 1]]
+
+    def arcs(self, node):
+        """Return the (finish id, cost) pairs of the arcs leaving a node."""
+        start, stop = self._offsets[node], self._offsets[node + 1]
+        return list(zip(self._targets[start:stop], self._costs[start:stop]))
+
+    def degree(self, node):
+        return self._offsets[node + 1] - self._offsets[node]
+
+    def is_connected(self, start, finish):
+        return finish in self.neighbors(start)
+
+    ##############
+    # Algorithms #
+    ##############
+    def breadth_first_search(self, start, end):
+        """Return a path of ids from start to end with the fewest arcs, or an empty list if there isn't one."""
+        offsets, targets = self._offsets, self._targets
+        previous = _array.array('i', [-1]) * len(self._names)
+        previous[start] = start
+        frontier = _collections.deque([start])
+        while frontier:
+            node = frontier.popleft()
+            if node == end:
+                break
+            for neighbor in targets[offsets[node]:offsets[node + 1]]:
+                if previous[neighbor] < 0:
+                    previous[neighbor] = node
+                    frontier.append(neighbor)
+        return self._path(previous, start, end)
+
+    def shortest_path_costs(self, source, end=None, heuristic=None):
+        """Run Dijkstra's algorithm (or A*, with a heuristic) from a source node.
+
+        Arc costs must be nonnegative. If end is given, stop as soon as its
+        distance is known.
+
+        :param source: The id of the node to search from.
+        :param end: The id of a node at which to stop early, if any.
+        :param heuristic: A function from (id, end id) to an estimated remaining cost.
+        :returns: A pair of arrays: the distance to each node (infinite if
+                  unreached) and the previous node on a cheapest path to each
+                  node (-1 if unreached).
+        """
+        offsets, targets, costs = self._offsets, self._targets, self._costs
+        n = len(self._names)
+        distance = _array.array('d', [INFINITY]) * n
+        previous = _array.array('i', [-1]) * n
+        done = bytearray(n)
+        distance[source] = 0.0
+        previous[source] = source
+        # Node ids are ints, so the heap never needs a tiebreaker. Stale heap
+        # entries are skipped instead of being updated in place.
+        heap = [(heuristic(source, end) if heuristic else 0.0, source)]
+        while heap:
+            _, node = _heapq.heappop(heap)
+            if done[node]:
+                continue
+            done[node] = 1
+            if node == end:
+                break
+            base = distance[node]
+            for position in range(offsets[node], offsets[node + 1]):
+                neighbor = targets[position]
+                new_distance = base + costs[position]
+                if new_distance < distance[neighbor]:
+                    distance[neighbor] = new_distance
+                    previous[neighbor] = node
+                    if heuristic:
+                        done[neighbor] = 0  # Reopen, in case the heuristic is inconsistent.
+                        _heapq.heappush(heap, (new_distance + heuristic(neighbor, end), neighbor))
+                    else:
+                        _heapq.heappush(heap, (new_distance, neighbor))
+        return distance, previous
+
+    def all_pairs_shortest_paths(self, sources=None, workers=None):
+        """Compute the distances from many source nodes to every node, in parallel.
+
+        Each source is searched with Dijkstra's algorithm in a pool of worker
+        processes. Where processes can be forked (as on Linux), the workers
+        share this graph's arrays with the parent, copy-on-write. Elsewhere,
+        each worker receives one copy of the arrays when it starts. Results are
+        yielded as soon as they're ready, in no particular order.
+
+        Usage::
+
+            for source, distance in frozen.all_pairs_shortest_paths(workers=8):
+                print(frozen.name_of(source), max(distance))
+
+        :param sources: The ids of the nodes to search from. Defaults to every node.
+        :param workers: The number of worker processes. Defaults to the number of
+                        CPUs. With a single worker, the searches run in this process.
+        :returns: An iterator of (source id, distances) pairs, where distances is
+                  an array('d') of the distance to each node (infinite if unreachable).
+        """
+        sources = list(range(len(self._names)) if sources is None else sources)
+        if workers is None:
+            workers = _os.cpu_count() or 1
+        workers = min(workers, len(sources))
+        if workers <= 1:
+            for source in sources:
+                yield source, self.shortest_path_costs(source)[0]
+            return
+
+        if 'fork' in _multiprocessing.get_all_start_methods():
+            # Forked workers receive the initializer's arguments without pickling.
+            context = _multiprocessing.get_context('fork')
+            initializer, initargs = _set_worker_graph, (self,)
+        else:
+            context = _multiprocessing.get_context()
+            initializer, initargs = _init_worker, (len(self._names), self._offsets, self._targets, self._costs)
+        # Send a few chunks of sources to each worker, to balance the load with little overhead.
+        chunksize = max(1, len(sources) // (4 * workers))
+        with context.Pool(workers, initializer, initargs) as pool:
+            yield from pool.imap_unordered(_single_source, sources, chunksize)
+
+    def dijkstras_algorithm(self, start, end):
+        """Return a cheapest path of ids from start to end, or an empty list if there isn't one."""
+        _, previous = self.shortest_path_costs(start, end)
+        return self._path(previous, start, end)
+
+    def a_star(self, start, end, heuristic=None):
+        """Return a cheapest path of ids from start to end using A* search, or an empty list if there isn't one.
+
+        :param heuristic: A function from (id, end id) to an estimated remaining
+                          cost, which should never overestimate.
+        """
+        _, previous = self.shortest_path_costs(start, end, heuristic=heuristic)
+        return self._path(previous, start, end)
+
+    @staticmethod
+    def _path(previous, start, end):
+        """Follow previous links back from end to build a path."""
+        if previous[end] < 0:
+            return []
+        path = [end]
+        while end != start:
+            end = previous[end]
+            path.append(end)
+        path.reverse()
+        return path
+
+    def __repr__(self):
+        return 'FrozenGraph(num_nodes={}, num_arcs={})'.format(self.num_nodes, self.num_arcs)
+
+
+def _set_worker_graph(graph):
+    """Set the graph to search in a forked worker process."""
+    global _worker_graph
+    _worker_graph = graph
+
+
+def _init_worker(num_nodes, offsets, targets, costs):
+    """Rebuild the graph to search in a worker process that wasn't forked."""
+    global _worker_graph
+    _worker_graph = FrozenGraph(range(num_nodes), offsets, targets, costs)
+
+
+def _single_source(source):
+    """Search from one source in a worker process."""
+    return source, _worker_graph.shortest_path_costs(source)[0]
+
+
+def _copy_column(typecode, values):
+    """Copy values into a new array, in bulk if they support the buffer protocol."""
+    try:
+        view = memoryview(values)
+    except TypeError:
+        return _array.array(typecode, values)
+    with view, view.cast('B') as raw:
+        column = _array.array(typecode)
+        column.frombytes(raw)
+    return column
@@ -1,3 +1,22 @@
+"""A generic directed graph, parameterized by its node and arc types.
+
+A :class:`Graph` indexes each node's outgoing arcs (in ``node.arcs``), its
+incoming arcs, and the arcs between every connected pair of nodes, so that
+adding or removing an arc takes constant time, removing a node takes time
+proportional to its degree, and :meth:`Graph.is_connected` takes constant
+time::
+
+    graph = Graph(Vertex, Edge)
+    a, b = graph.add_node(Vertex('a')), graph.add_node(Vertex('b'))
+    graph.add_arc(Edge(a, b))
+    print(graph.is_connected(a, b))  # => True
+    graph.remove_node(b)
+    print(graph.get_neighbors(a))  # => set()
+"""
+import campy.datastructures.graphio as _graphio
+from campy.datastructures.frozengraph import FrozenGraph
+
+
 def error(str):
     print(str)
 
@@ -9,6 +28,8 @@ class Graph():
         self.nodes = set()
         self.arcs = set()
         self.node_map = dict()
+        self._incoming = dict()  # {node: {arc}}, the arcs finishing at each node.
+        self._arcs_between = dict()  # {(start, finish): {arc}}
         # self.comparator = None  # TODO
         if src:
             self._deep_copy(src)
@@ -16,20 +37,23 @@ class Graph():
     def add_arc_by_nodes(self, n1, n2, named=False):
         if named:
             n1 = self._get_node_by_name(n1, member='add_arc')
-            n2 = self._get_node_by_name(n1, member='add_arc')
+            n2 = self._get_node_by_name(n2, member='add_arc')
         self._verify_existing_node(n1)
         self._verify_existing_node(n2)
         arc = self._ArcType()
         arc.start = n1
         arc.finish = n2
+        return self.add_arc(arc)
 
     def add_arc(self, arc):
         self._verify_not_none(arc)
         if not self._node_exists(arc.start):
             self.add_node(arc.start)
-        if not self._node_exists(arc.end):
-            self.add_node(arc.end)
+        if not self._node_exists(arc.finish):
+            self.add_node(arc.finish)
         arc.start.arcs.add(arc)
+        self._incoming[arc.finish].add(arc)
+        self._arcs_between.setdefault((arc.start, arc.finish), set()).add(arc)
         self.arcs.add(arc)
         return arc
 
@@ -37,23 +61,32 @@ class Graph():
         if named:
             node = self._get_node_by_name(node_info, member='add_node')
             if not node:
-                node = self._NodeType()
-                node.arcs = set()
-                node.name = node_info
+                node = self._make_node(node_info)
         else:
             node = node_info
         self._verify_not_none(node, 'add_node')
         if node.name in self.node_map:
             error("Graph::add_node: node {} already exists".format(node.name))
+            return self.node_map[node.name]
 
         self.nodes.add(node)
         self.node_map[node.name] = node
+        self._incoming[node] = set()
         return node
 
     def clear(self):
         self.nodes = set()
         self.arcs = set()
         self.node_map = dict()
+        self._incoming = dict()
+        self._arcs_between = dict()
+
+    def freeze(self):
+        """Return a compact, immutable :class:`~campy.datastructures.frozengraph.FrozenGraph` snapshot of this graph.
+
+        Later changes to this graph do not affect the snapshot.
+        """
+        return FrozenGraph.from_graph(self)
 
     def get_arc_set(self, node_info, named=False):
         if named:
@@ -71,15 +104,32 @@ class Graph():
         self._verify_existing_node(node, member='get_neighbors')
         return {arc.finish for arc in node.arcs}
 
+    def get_inverse_arc_set(self, node_info, named=False):
+        """Return the set of arcs finishing at a node."""
+        if named:
+            node = self._get_node_by_name(node_info)
+        else:
+            node = node_info
+        self._verify_existing_node(node, member='get_inverse_arc_set')
+        return self._incoming[node]
+
+    def get_inverse_neighbors(self, node_info, named=False):
+        """Return the set of nodes with an arc to a node."""
+        return {arc.start for arc in self.get_inverse_arc_set(node_info, named=named)}
+
+    def get_arcs_between(self, n1, n2, named=False):
+        """Return the set of arcs from n1 to n2."""
+        if named:
+            n1 = self._get_node_by_name(n1, member='get_arcs_between')
+            n2 = self._get_node_by_name(n2, member='get_arcs_between')
+        return set(self._arcs_between.get((n1, n2), ()))
+
     def is_connected(self, n1, n2, named=False):
         if named:
-            n1 = self._get_node_by_name(n1, member='add_arc')
-            n2 = self._get_node_by_name(n1, member='add_arc')
+            n1 = self._get_node_by_name(n1, member='is_connected')
+            n2 = self._get_node_by_name(n2, member='is_connected')
         # TODO error checking here
-        for arc in n1.arcs:
-            if arc.finish == n2:
-                return True
-        return False
+        return (n1, n2) in self._arcs_between
 
     def is_empty(self):
         return len(self.nodes) == 0
@@ -87,52 +137,161 @@ class Graph():
     def remove_arc_by_nodes(self, n1, n2, named=False):
         if named:
             n1 = self._get_node_by_name(n1)
-            n2 = self._get_node_by_name(n1)
+            n2 = self._get_node_by_name(n2)
             return self.remove_arc_by_nodes(n1, n2, named=False)
         if not self._node_exists(n1) or not self._node_exists(n2):
             return
-        to_remove = []
-        for arc in self.arcs:
-            if arc.start == n1 and arc.finish == n2:
-                to_remove.append(arc)
-
-        for arc in to_remove:
+        for arc in list(self._arcs_between.get((n1, n2), ())):
             self.remove_arc(arc)
 
     def remove_arc(self, arc):
+        if arc not in self.arcs:
+            return
         arc.start.arcs.discard(arc)
+        self._incoming[arc.finish].discard(arc)
+        key = (arc.start, arc.finish)
+        between = self._arcs_between[key]
+        between.discard(arc)
+        if not between:
+            del self._arcs_between[key]
         self.arcs.discard(arc)
 
     def remove_node(self, node, named=False):
         if named:
             node = self._get_node_by_name(node)
-            self.remove_node(node, named=True)
         if not self._node_exists(node):
             return
 
-        to_remove = []
-        for arc in self.arcs:
-            if arc.start == node or arc.end == node:
-                to_remove.append(arc)
-        for arc in to_remove:
+        # Only the arcs touching this node need to be visited.
+        for arc in list(node.arcs) + list(self._incoming[node]):
             self.remove_arc(arc)
 
         self.nodes.discard(node)
+        del self._incoming[node]
         del self.node_map[node.name]
 
-    def scan_arc_data(self):
-        pass
-
-    def scan_node_data(self):
-        pass
-
-    def scan_graph_entry(self, stream):
-        pass
-
-    def write_arc_data(self, ostream):
-        pass
-
-    def write_node_data(self, ostream):
+    def read(self, stream):
+        """Add the nodes and arcs of a graph in text format to this graph.
+
+        The input is processed one line at a time, so it is never held in memory all at once.
+
+        Usage::
+
+            with open('roads.txt') as f:
+                graph.read(f)
+
+        :param stream: A text stream, or any iterable of lines.
+        :returns: This graph.
+        :raises ValueError: If the input is malformed.
+        """
+        for entry in _graphio.iter_entries(stream):
+            self.scan_graph_entry(entry)
+        return self
+
+    def write(self, ostream):
+        """Write this graph to a text stream in text format, one entry per line.
+
+        Every node is written first, then every arc.
+        """
+        ostream.write('{')
+        separator = ''
+        for node in self.node_map.values():
+            ostream.write(separator)
+            ostream.write(_graphio.format_name(node.name))
+            self.write_node_data(ostream, node)
+            separator = ',\n'
+        for node in self.node_map.values():
+            start = _graphio.format_name(node.name)
+            for arc in node.arcs:
+                ostream.write('{}{} -> {}'.format(separator, start, _graphio.format_name(arc.finish.name)))
+                self.write_arc_data(ostream, arc)
+        ostream.write('}\n')
+
+    def read_binary(self, filename):
+        """Add the nodes and arcs of a graph in binary format to this graph.
+
+        :param filename: The path of the file to read.
+        :returns: This graph.
+        """
+        with _graphio.open_binary(filename) as (names, starts, finishes, costs):
+            nodes = [self.node_map.get(name) or self.add_node(self._make_node(name)) for name in names]
+            for start, finish, cost in zip(starts, finishes, costs):
+                arc = self._ArcType()
+                arc.start = nodes[start]
+                arc.finish = nodes[finish]
+                arc.cost = cost
+                self.add_arc(arc)
+        return self
+
+    def write_binary(self, filename):
+        """Write this graph to a file in binary format. Arcs without a cost attribute are written with cost 0."""
+        nodes = list(self.node_map.values())
+        ids = {node: index for index, node in enumerate(nodes)}
+
+        def arcs():
+            for node in nodes:
+                yield from node.arcs
+
+        _graphio.write_binary(filename, [node.name for node in nodes],
+                              (ids[arc.start] for arc in arcs()),
+                              (ids[arc.finish] for arc in arcs()),
+                              (getattr(arc, 'cost', _graphio.DEFAULT_ARC_COST) for arc in arcs()))
+
+    def scan_arc_data(self, data, arc, inverse=None):
+        """Read the data written after an arc in text format, such as ': 2.5' for a cost.
+
+        Subclasses can override this to read other data.
+
+        :param data: The text after the arc's finish node.
+        :param arc: The new arc.
+        :param inverse: The new arc in the opposite direction, if the arc was written with '<->'.
+        :raises ValueError: If the data is malformed.
+        """
+        if not data:
+            return
+        if not data.startswith(':'):
+            raise ValueError('Graph: unexpected data {!r} after arc'.format(data))
+        cost = float(data[1:])
+        arc.cost = cost
+        if inverse is not None:
+            inverse.cost = cost
+
+    def scan_node_data(self, data, node):
+        """Read the data written after a node in text format. By default, nodes have no data.
+
+        :param data: The text after the node's name.
+        :param node: The node.
+        :raises ValueError: If the data is malformed.
+        """
+        if data:
+            raise ValueError('Graph: unexpected data {!r} after node {}'.format(data, node.name))
+
+    def scan_graph_entry(self, entry):
+        """Add the node or arc described by one entry of a graph in text format.
+
+        Nodes named in an arc are added if they don't yet exist.
+
+        :param entry: The text of the entry, such as 'a', 'a -> b : 2.5' or 'a <-> b'.
+        :raises ValueError: If the entry is malformed.
+        """
+        start_name, arrow, finish_name, data = _graphio.parse_entry(entry)
+        start = self.node_map.get(start_name) or self.add_node(self._make_node(start_name))
+        if arrow is None:
+            self.scan_node_data(data, start)
+            return
+        finish = self.node_map.get(finish_name) or self.add_node(self._make_node(finish_name))
+        arc = self._make_arc(start, finish)
+        inverse = self._make_arc(finish, start) if arrow == '<->' else None
+        self.scan_arc_data(data, arc, inverse)
+
+    def write_arc_data(self, ostream, arc):
+        """Write the data for an arc in text format: its cost, if it has a nonzero cost."""
+        cost = getattr(arc, 'cost', _graphio.DEFAULT_ARC_COST)
+        if cost != _graphio.DEFAULT_ARC_COST:
+            ostream.write(' : {!r}'.format(cost))
+
+    def write_node_data(self, ostream, node):
+        """Write the data for a node in text format. By default, nodes have no data."""
         pass
 
     @property
@@ -143,6 +302,25 @@ class Graph():
     def _deep_copy(self):
         pass
 
+    def _make_node(self, name):
+        """Create (but don't add) a new node with the given name."""
+        try:
+            # Node types like Vertex take their name when constructed.
+            node = self._NodeType(name)
+        except TypeError:
+            node = self._NodeType()
+            node.name = name
+        if not hasattr(node, 'arcs'):
+            node.arcs = set()
+        return node
+
+    def _make_arc(self, start, finish):
+        """Create and add a new arc from start to finish."""
+        arc = self._ArcType()
+        arc.start = start
+        arc.finish = finish
+        return self.add_arc(arc)
+
     def _get_node_by_name(self, name, member=''):
         node = self.node_map.get(name)
         if not node:
@@ -0,0 +1,249 @@
+"""Readers and writers for the file formats of :class:`~campy.datastructures.graph.Graph`.
+
+There are two formats.
+
+The text format is the one used by the Stanford C++ libraries: a braced,
+comma-separated list of node names and arcs, where each arc may be followed by
+data such as a cost::
+
+    {home, park, school,
+    home -> park : 1.5,
+    park <-> school}
+
+Names that aren't simple words are written in double quotes. Writers put one
+entry on each line, and the reader processes one line at a time, so files of
+any size can be read without loading them into memory.
+
+The binary format is a compact edge list for large graphs. After a header and
+the node names, it stores the start ids, finish ids, and costs of every arc as
+three little-endian columns. The columns are read through a memory map, without
+copying them into memory.
+
+Most clients should use the methods that wrap these functions, such as
+:meth:`Graph.read <campy.datastructures.graph.Graph.read>` and
+:meth:`FrozenGraph.read_binary <campy.datastructures.frozengraph.FrozenGraph.read_binary>`.
+"""
+from campy.io.tokenscanner import TokenScanner
+
+import array as _array
+import contextlib as _contextlib
+import mmap as _mmap
+import re as _re
+import struct as _struct
+import sys as _sys
+
+# The cost of an arc with no cost attribute, in every format and in frozen graphs.
+DEFAULT_ARC_COST = 0.0
+BINARY_MAGIC = b'CAMPYGR1'
+# The magic number, the number of nodes, and the number of arcs.
+_HEADER = _struct.Struct('<8sQQ')
+_NAME_LENGTH = _struct.Struct('<I')
+# How many values to buffer when writing a column.
+_CHUNK_SIZE = 1 << 16
+
+_NAME = r'"(?:[^"\\]|\\.)*"|[^\s"<>:,{}\-]+'
+_BARE_NAME = _re.compile(r'[^\s"<>:,{}\-]+')
+_ENTRY = _re.compile(r'\s*(?P<start>{0})(?:\s*(?P<arrow><?->)\s*(?P<finish>{0}))?(?P<data>.*?)\s*'.format(_NAME),
+                     _re.DOTALL)
+
+
+##########
+#  Text  #
+##########
+def iter_entries(stream):
+    """Yield the text of each entry of a graph in text format, one at a time.
+
+    :param stream: A text stream, or any iterable of lines.
+    :raises ValueError: If the graph doesn't start with '{' or end with '}'.
+    """
+    pending = ''
+    started = False
+    for line in stream:
+        if not started:
+            line = line.lstrip()
+            if not line:
+                continue
+            if line[0] != '{':
+                raise ValueError('Graph: expected "{{" but found {!r}'.format(line[0]))
+            line = line[1:]
+            started = True
+        text = pending + line
+        if '"' in text:
+            # Commas and braces inside quoted names don't count.
+            pieces, closed = _split_quoted(text)
+        else:
+            closed = '}' in text
+            if closed:
+                text = text[:text.index('}')]
+            pieces = text.split(',')
+        pending = pieces.pop()
+        for piece in pieces:
+            if piece.strip():
+                yield piece
+        if closed:
+            if pending.strip():
+                yield pending
+            return
+    raise ValueError('Graph: missing "}" at end of graph' if started else 'Graph: missing "{" at start of graph')
+
+
+def _split_quoted(text):
+    """Split text on the commas outside of quotes, stopping at the first closing brace outside of quotes.
+
+    Return the pieces and whether a closing brace was found. The last piece may be incomplete.
+    """
+    pieces = []
+    start = 0
+    quoted = False
+    escaped = False
+    for index, ch in enumerate(text):
+        if escaped:
+            escaped = False
+        elif quoted:
+            if ch == '\\':
+                escaped = True
+            elif ch == '"':
+                quoted = False
+        elif ch == '"':
+            quoted = True
+        elif ch == ',':
+            pieces.append(text[start:index])
+            start = index + 1
+        elif ch == '}':
+            pieces.append(text[start:index])
+            return pieces, True
+    pieces.append(text[start:])
+    return pieces, False
+
+
+def parse_entry(entry):
+    """Split the text of an entry into its parts.
+
+    :param entry: The text of one entry, such as 'a -> b : 2.5'.
+    :returns: A (start name, arrow, finish name, data) tuple. The arrow and
+              finish name are None if the entry is a single node.
+    :raises ValueError: If the entry is malformed.
+    """
+    match = _ENTRY.fullmatch(entry)
+    if not match:
+        raise ValueError('Graph: cannot parse entry {!r}'.format(entry.strip()))
+    finish = match.group('finish')
+    return (decode_name(match.group('start')), match.group('arrow'),
+            decode_name(finish) if finish is not None else None, match.group('data').strip())
+
+
+def decode_name(token):
+    """Return the name written as a token, removing quotes if necessary."""
+    if token.startswith('"'):
+        return TokenScanner(None).get_string_value(token)
+    return token
+
+
+def format_name(name):
+    """Return a name as it should be written, quoting it if necessary."""
+    name = str(name)
+    if _BARE_NAME.fullmatch(name):
+        return name
+    return '"{}"'.format(name.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+
+
+############
+#  Binary  #
+############
+def write_binary(filename, names, starts, finishes, costs):
+    """Write a graph in binary format.
+
+    Each column is consumed one chunk at a time, so the columns may be
+    generators.
+
+    :param filename: The path of the file to write.
+    :param names: The name of each node, by id.
+    :param starts: The start id of each arc.
+    :param finishes: The finish id of each arc.
+    :param costs: The cost of each arc.
+    :raises ValueError: If the columns have different lengths.
+    """
+    names = [str(name).encode('utf-8') for name in names]
+    with open(filename, 'wb') as out:
+        out.write(_HEADER.pack(BINARY_MAGIC, len(names), 0))
+        for name in names:
+            out.write(_NAME_LENGTH.pack(len(name)))
+            out.write(name)
+        out.write(bytes(-out.tell() % 8))
+        num_arcs = _write_column(out, starts, 'i')
+        if _write_column(out, finishes, 'i') != num_arcs or _write_column(out, costs, 'd') != num_arcs:
+            raise ValueError('Graph: arc columns have different lengths')
+        out.seek(0)
+        out.write(_HEADER.pack(BINARY_MAGIC, len(names), num_arcs))
+
+
+def _write_column(out, values, typecode):
+    """Write values to a file as a little-endian array, and return how many there were."""
+    count = 0
+    chunk = _array.array(typecode)
+    for value in values:
+        chunk.append(value)
+        if len(chunk) == _CHUNK_SIZE:
+            count += _flush(out, chunk)
+            chunk = _array.array(typecode)
+    return count + _flush(out, chunk)
+
+
+def _flush(out, chunk):
+    if _sys.byteorder == 'big':
+        chunk.byteswap()
+    chunk.tofile(out)
+    return len(chunk)
+
+
+@_contextlib.contextmanager
+def open_binary(filename):
+    """Open a graph in binary format.
+
+    Usage::
+
+        with open_binary('roads.graph') as (names, starts, finishes, costs):
+            for start, finish, cost in zip(starts, finishes, costs):
+                ...
+
+    The columns are views of a memory map, and are only valid inside the with block.
+
+    :param filename: The path of the file to read.
+    :raises ValueError: If the file is not a graph in binary format.
+    """
+    with open(filename, 'rb') as f, _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ) as data:
+        if len(data) < _HEADER.size:
+            raise ValueError('Graph: {} is not a binary graph file'.format(filename))
+        magic, num_nodes, num_arcs = _HEADER.unpack_from(data, 0)
+        if magic != BINARY_MAGIC:
+            raise ValueError('Graph: {} is not a binary graph file'.format(filename))
+        position = _HEADER.size
+        names = []
+        for _ in range(num_nodes):
+            length, = _NAME_LENGTH.unpack_from(data, position)
+            position += _NAME_LENGTH.size
+            names.append(data[position:position + length].decode('utf-8'))
+            position += length
+        position += -position % 8
+        if len(data) < position + 16 * num_arcs:
+            raise ValueError('Graph: {} is truncated'.format(filename))
+
+        view = memoryview(data)
+        columns = []
+        for typecode, size in (('i', 4), ('i', 4), ('d', 8)):
+            column = view[position:position + size * num_arcs].cast(typecode)
+            if _sys.byteorder == 'big':
+                swapped = _array.array(typecode, column)
+                swapped.byteswap()
+                column.release()
+                column = swapped
+            columns.append(column)
+            position += size * num_arcs
+        try:
+            yield (names, *columns)
+        finally:
+            # The memory map can't close while views of it remain.
+            for column in columns:
+                if isinstance(column, memoryview):
+                    column.release()
+            view.release()
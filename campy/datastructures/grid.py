@@ -1,74 +1,519 @@
 #!/usr/bin/env python3 -tt
-"""
+"""This file exports a :class:`Grid` class, a two-dimensional array of values.
+
+A :class:`Grid` has a fixed number of rows and columns, and every cell holds a
+single value. Cells can be accessed either by method or by indexing::
+
+    grid = Grid(3, 4, value=0)
+    grid.set(1, 2, 5)
+    grid[2, 3] = 7
+    print(grid.get(1, 2), grid[2, 3], grid[1][2])  # => 5 7 5
+
+Internally, the cells are stored in a single flat buffer in row-major order.
+Numeric grids (those created with a ``dtype``) pack their values into an
+:class:`array.array`, or into a NumPy array if NumPy is installed::
+
+    heights = Grid(4000, 4000, value=0.0, dtype=float)
+    heights.apply(lambda h: h + 1)
+
+Grids also support whole-grid neighborhood operations, such as blurring with a
+kernel or stepping a cellular automaton like Conway's Game of Life::
 
+    def life(alive, num_neighbors):
+        return 1 if num_neighbors == 3 or (alive and num_neighbors == 2) else 0
+
+    world = Grid(100, 100, value=0, dtype=int)
+    world.step(life)
+
+These run as vectorized NumPy code when the grid is backed by NumPy.
 """
+import array as _array
+import collections as _collections
+
+# Use NumPy to back numeric grids if it's available.
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+
+# Python types that can stand in for a dtype, and their equivalent typecodes.
+_TYPECODES = {int: 'q', float: 'd'}
+
+
 class Grid(list):
-    def __init__(self, num_rows=0, num_cols=0, value=None):
+    def __init__(self, num_rows=0, num_cols=0, value=None, dtype=None):
+        """Create a new grid with the given number of rows and columns.
+
+        Every cell starts out holding value. If a dtype is given (either an
+        :mod:`array` typecode such as ``'i'`` or ``'d'``, or one of the types
+        ``int`` or ``float``) then the grid can only hold numbers of that type,
+        but is stored much more compactly.
+
+        Usage::
+
+            board = Grid(8, 8)  # Every cell is None.
+            counts = Grid(100, 100, value=0, dtype=int)
+
+        :param num_rows: The number of rows in the grid.
+        :param num_cols: The number of columns in the grid.
+        :param value: The initial value of every cell.
+        :param dtype: The numeric type of every cell, or None for any value.
+        """
+        if num_rows < 0 or num_cols < 0:
+            raise ValueError('Grid dimensions must be nonnegative, not {}x{}'.format(num_rows, num_cols))
         self.num_rows = num_rows
         self.num_cols = num_cols
+        if isinstance(dtype, type) and dtype not in _TYPECODES:
+            raise TypeError('Grid: dtype must be an array typecode, int or float, not {}'.format(dtype.__name__))
+        self._dtype = _TYPECODES.get(dtype, dtype)
+        if self._dtype is not None and value is None:
+            value = 0
+        self._default = value
         # Elements are stored in row-major order
-        self.elems = [[value for __ in range(num_cols)] for _ in range(num_rows)]
+        self._elems = self._allocate(num_rows * num_cols, value)
+        # A second buffer, reused by step() to avoid reallocating every generation.
+        self._scratch = None
+
+    def _allocate(self, size, value):
+        """Return a new flat buffer of the given size, filled with value."""
+        if self._dtype is None:
+            return [value] * size
+        if _np is not None:
+            return _np.full(size, value, dtype=self._dtype)
+        return _array.array(self._dtype, [value]) * size
+
+    def _wrap(self, elems):
+        """Convert any iterable of elements into this grid's kind of buffer."""
+        if self._dtype is None:
+            return list(elems)
+        if _np is not None:
+            return self._cast(_np.array(list(elems)))
+        return _array.array(self._dtype, elems)
+
+    def _cast(self, values):
+        """Convert values to a NumPy array of this grid's dtype.
+
+        Like an :mod:`array`, this refuses to store non-integers in an integer
+        grid, or integers that don't fit, rather than silently changing them.
+        """
+        values = _np.asarray(values)
+        dtype = _np.dtype(self._dtype)
+        if values.size and dtype.kind in 'iu' and not _np.can_cast(values.dtype, dtype):
+            if values.dtype.kind not in 'biu':
+                raise TypeError('Grid: cannot store {} values in a grid of {}'.format(values.dtype, dtype))
+            cast = values.astype(dtype)
+            if not _np.array_equal(cast, values):
+                raise OverflowError('Grid: values out of range for a grid of {}'.format(dtype))
+            return cast
+        return values.astype(dtype, copy=False)
+
+    def _like(self, num_rows, num_cols, elems):
+        """Return a new grid with this grid's dtype, wrapping a flat buffer."""
+        new = self.__class__(0, 0, value=self._default, dtype=self._dtype)
+        new.num_rows = num_rows
+        new.num_cols = num_cols
+        new._elems = elems
+        return new
+
+    @property
+    def uses_numpy(self):
+        """Whether this grid's cells are stored in a NumPy array."""
+        return _np is not None and isinstance(self._elems, _np.ndarray)
 
     def empty(self):
         return self.num_rows == 0 or self.num_cols == 0
 
     def fill(self, value):
-        self.elems = [[value for __ in range(self.num_cols)] for _ in range(self.num_rows)]
+        """Set every cell in this grid to value."""
+        if self.uses_numpy:
+            self._elems.fill(value)
+        else:
+            self._elems = self._allocate(len(self._elems), value)
+
+    @staticmethod
+    def _normalize(index, size, name):
+        """Return a row or column index, counting negative indices from the end like a list."""
+        if not -size <= index < size:
+            raise IndexError('Grid: {} {} is outside of valid range'.format(name, index))
+        return index % size
+
+    def _index(self, row, col):
+        row = self._normalize(row, self.num_rows, 'row')
+        return row * self.num_cols + self._normalize(col, self.num_cols, 'column')
 
     def get(self, row, col):
-        return self.elems[row][col]
+        return self._elems[self._index(row, col)]
 
     def set(self, row, col, value):
-        self.elems[row][col] = value
+        self._elems[self._index(row, col)] = value
 
     def in_bounds(self, row, col):
-        pass
+        return 0 <= row < self.num_rows and 0 <= col < self.num_cols
+
+    def row(self, row):
+        """Return a list of the values in a single row."""
+        start = self._normalize(row, self.num_rows, 'row') * self.num_cols
+        return self._to_list(self._elems[start:start + self.num_cols])
+
+    def col(self, col):
+        """Return a list of the values in a single column."""
+        col = self._normalize(col, self.num_cols, 'column')
+        return self._to_list(self._elems[col::self.num_cols])
+
+    @staticmethod
+    def _to_list(elems):
+        return elems.tolist() if hasattr(elems, 'tolist') else list(elems)
+
+    def map(self, fn, vectorized=False):
+        """Return a new grid holding the result of fn applied to every cell.
+
+        If this grid is backed by NumPy and vectorized is True, fn is called
+        once with the whole array of cells, rather than once per cell::
+
+            doubled = heights.map(lambda cells: cells * 2, vectorized=True)
+
+        :param fn: The function to apply to every cell.
+        :param vectorized: Whether fn accepts (and returns) a whole NumPy array.
+        :returns: A new grid of the same size.
+        """
+        if vectorized and self.uses_numpy:
+            elems = self._cast(fn(self._elems))
+        else:
+            elems = self._wrap(map(fn, self._elems))
+        return self._like(self.num_rows, self.num_cols, elems)
+
+    def apply(self, fn, vectorized=False):
+        """Replace every cell in this grid with the result of fn applied to it.
+
+        This is the in-place version of :meth:`map`.
+        """
+        if vectorized and self.uses_numpy:
+            self._elems[:] = self._cast(fn(self._elems))
+        else:
+            self._elems = self._wrap(map(fn, self._elems))
 
     def resize(self, num_rows, num_cols, retain=False):
+        """Change the size of this grid.
+
+        If retain is True, the values in the region that the old and new sizes
+        have in common are kept in place. Every other cell holds this grid's
+        initial value.
+        """
         if not retain:
-            self.__init__(num_rows, num_cols)
+            self.__init__(num_rows, num_cols, value=self._default, dtype=self._dtype)
+            return
+        self._scratch = None
+        old, old_cols = self._elems, self.num_cols
+        self._elems = self._allocate(num_rows * num_cols, self._default)
+        # Copy the overlapping prefix of each retained row in a single slice.
+        width = min(old_cols, num_cols)
+        for row in range(min(self.num_rows, num_rows)):
+            self._elems[row * num_cols:row * num_cols + width] = old[row * old_cols:row * old_cols + width]
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+
+    ###########################
+    # Neighborhood operations #
+    ###########################
+    def neighbors(self, row, col, diagonal=False):
+        """Return a list of the in-bounds locations next to a cell.
+
+        By default, the neighbors of a cell are the (up to) four cells that
+        share an edge with it. If diagonal is True, the (up to) four cells that
+        share only a corner are also included.
+
+        :param row: The row of the cell.
+        :param col: The column of the cell.
+        :param diagonal: Whether to include diagonally adjacent cells.
+        :returns: A list of (row, col) tuples.
+        """
+        offsets = _DIAGONAL_OFFSETS if diagonal else _ORTHOGONAL_OFFSETS
+        return [(row + dr, col + dc) for dr, dc in offsets if self.in_bounds(row + dr, col + dc)]
+
+    def flood_fill(self, row, col, value, diagonal=False):
+        """Replace the connected region of identical cells around a cell with value.
+
+        Starting at (row, col), every cell that holds the same value as the
+        starting cell and is connected to it through neighboring cells (see
+        :meth:`neighbors`) is set to the new value.
+
+        To paint the region containing the top-left corner::
+
+            canvas.flood_fill(0, 0, 'red')
+
+        :param row: The row of the starting cell.
+        :param col: The column of the starting cell.
+        :param value: The new value for the region.
+        :param diagonal: Whether diagonally adjacent cells are connected.
+        :returns: The number of cells that were changed.
+        """
+        elems = self._elems
+        num_rows, num_cols = self.num_rows, self.num_cols
+        start = self._index(row, col)
+        target = elems[start]
+        if target == value:
+            return 0
+        offsets = _DIAGONAL_OFFSETS if diagonal else _ORTHOGONAL_OFFSETS
+
+        # Breadth-first search over flat indices, painting cells as they're queued
+        # so that no cell is ever queued twice.
+        elems[start] = value
+        filled = 1
+        queue = _collections.deque([start])
+        while queue:
+            r, c = divmod(queue.popleft(), num_cols)
+            for dr, dc in offsets:
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < num_rows and 0 <= nc < num_cols:
+                    index = nr * num_cols + nc
+                    if elems[index] == target:
+                        elems[index] = value
+                        filled += 1
+                        queue.append(index)
+        return filled
+
+    def stencil_apply(self, kernel, boundary=0):
+        """Return a new grid in which each cell is a weighted sum of its neighborhood.
+
+        The kernel is a rectangular list of lists of weights, with an odd
+        number of rows and columns, and is centered over each cell in turn.
+        Cells beyond the edge of the grid are treated as holding boundary.
+
+        To blur a grid of brightnesses::
+
+            blurred = image.stencil_apply([[1/9, 1/9, 1/9],
+                                           [1/9, 1/9, 1/9],
+                                           [1/9, 1/9, 1/9]])
+
+        :param kernel: A list of lists of numeric weights.
+        :param boundary: The value of every cell beyond the edges.
+        :returns: A new grid of the same size.
+        """
+        weights = _kernel_offsets(kernel)
+        dtype = self._dtype
+        if dtype is not None and any(isinstance(w, float) for _, _, w in weights):
+            dtype = 'd'
+        sums = self._correlate(weights, boundary)
+        new = self.__class__(0, 0, value=self._default, dtype=dtype)
+        new.num_rows = self.num_rows
+        new.num_cols = self.num_cols
+        new._elems = new._wrap(sums) if not self.uses_numpy else sums.astype(dtype)
+        return new
+
+    def step(self, rule, diagonal=True, vectorized=False):
+        """Advance this grid by one generation of a cellular automaton.
+
+        Every cell is replaced (simultaneously) by ``rule(value, total)``, where
+        value is the cell's current value and total is the sum of the values of
+        its neighbors (see :meth:`neighbors`). Cells beyond the edge of the grid
+        count as 0.
+
+        To run one generation of Conway's Game of Life::
+
+            def life(alive, num_neighbors):
+                return 1 if num_neighbors == 3 or (alive and num_neighbors == 2) else 0
+
+            world.step(life)
+
+        If this grid is backed by NumPy and vectorized is True, rule is called
+        once with an array of values and an array of totals instead::
+
+            world.step(lambda alive, n: (n == 3) | ((alive == 1) & (n == 2)), vectorized=True)
+
+        :param rule: A function from a cell's value and its neighbors' total to its next value.
+        :param diagonal: Whether diagonally adjacent cells are neighbors.
+        :param vectorized: Whether rule accepts (and returns) whole NumPy arrays.
+        """
+        offsets = _DIAGONAL_OFFSETS if diagonal else _ORTHOGONAL_OFFSETS
+        totals = self._correlate([(dr, dc, 1) for dr, dc in offsets], 0)
+
+        # Double buffering: compute into the spare buffer, then swap.
+        size = len(self._elems)
+        if self._scratch is None or len(self._scratch) != size or type(self._scratch) is not type(self._elems):
+            self._scratch = self._allocate(size, self._default)
+        if vectorized and self.uses_numpy:
+            self._scratch[:] = self._cast(rule(self._elems, totals))
         else:
-            old = self.elems
-            self.elems = [[None for __ in range(self.num_cols)] for _ in range(self.num_rows)]
-            for oldrow, newrow in zip(old, self.elems):
-                for pos, elems in enumerate(zip(oldelems, newelems)):
-                    oldelem, newelem = elems
-                    if oldelem != newelem:
-                        newrow[pos] = oldelem
+            self._scratch[:] = self._wrap(map(rule, self._elems, totals))
+        self._elems, self._scratch = self._scratch, self._elems
+
+    def _correlate(self, weights, boundary):
+        """Return a flat buffer of weighted neighborhood sums for every cell.
+
+        weights is a list of (row offset, column offset, weight) triples.
+        """
+        num_rows, num_cols = self.num_rows, self.num_cols
+        pad_rows = max([abs(dr) for dr, _, _ in weights] + [0])
+        pad_cols = max([abs(dc) for _, dc, _ in weights] + [0])
+
+        if self.uses_numpy:
+            # Pad once, then add up one shifted view of the padded array per weight.
+            padded = _np.pad(self._elems.reshape(num_rows, num_cols),
+                             ((pad_rows, pad_rows), (pad_cols, pad_cols)),
+                             mode='constant', constant_values=boundary)
+            total = _np.zeros((num_rows, num_cols), dtype=_np.result_type(padded, *[w for _, _, w in weights]))
+            for dr, dc, w in weights:
+                total += w * padded[pad_rows + dr:pad_rows + dr + num_rows, pad_cols + dc:pad_cols + dc + num_cols]
+            return total.reshape(-1)
+
+        # Pad each row, then accumulate whole rows at a time with zip.
+        edge = [boundary] * pad_cols
+        blank = [boundary] * (num_cols + 2 * pad_cols)
+        padded = [blank] * pad_rows
+        for r in range(num_rows):
+            padded.append(edge + list(self._elems[r * num_cols:(r + 1) * num_cols]) + edge)
+        padded.extend([blank] * pad_rows)
+
+        sums = []
+        for r in range(num_rows):
+            acc = [0] * num_cols
+            for dr, dc, w in weights:
+                source = padded[pad_rows + r + dr][pad_cols + dc:pad_cols + dc + num_cols]
+                if w == 1:
+                    acc = [a + s for a, s in zip(acc, source)]
+                else:
+                    acc = [a + w * s for a, s in zip(acc, source)]
+            sums.extend(acc)
+        return sums
 
     # Use this when you need to copy
     @classmethod
     def from_grid(cls, grid):
-        new = cls(grid.num_rows, grid.num_cols)
-        new.elems = grid.elems
+        new = cls(0, 0, value=grid._default, dtype=grid._dtype)
+        new.num_rows = grid.num_rows
+        new.num_cols = grid.num_cols
+        new._elems = grid._elems.copy() if hasattr(grid._elems, 'copy') else grid._elems[:]
         return new
 
     @property
     def height(self):
-        return num_rows
+        return self.num_rows
 
     @property
     def width(self):
-        return num_cols
+        return self.num_cols
 
     # Magic methods to make a grid look like a list of lists
 
     def __len__(self):
-        return len(self.elems)
+        return self.num_rows
 
-    # Note - setitem and delitem don't make sense in this case
     def __getitem__(self, key):
-        return self.elems[key]
+        """Index into this grid.
+
+        ``grid[row]`` is a view of a single row, so ``grid[row][col]`` works
+        just like a list of lists, and ``grid[rows]`` is a list of row views.
+        ``grid[row, col]`` is the value in a single cell, and if either index is
+        a slice, ``grid[rows, cols]`` is a new grid holding a copy of that region.
+        Negative indices count from the end, as they do for lists.
+        """
+        if isinstance(key, slice):
+            return [_GridRow(self, row) for row in range(self.num_rows)[key]]
+        if not isinstance(key, tuple):
+            return _GridRow(self, self._normalize(key, self.num_rows, 'row'))
+        row, col = key
+        if not isinstance(row, slice) and not isinstance(col, slice):
+            return self.get(row, col)
+
+        if not isinstance(row, slice):
+            row = self._normalize(row, self.num_rows, 'row')
+            row = slice(row, row + 1)
+        if not isinstance(col, slice):
+            col = self._normalize(col, self.num_cols, 'column')
+            col = slice(col, col + 1)
+        rows = range(self.num_rows)[row]
+        cols = range(self.num_cols)[col]
+        elems = []
+        for r in rows:
+            start = r * self.num_cols
+            if cols.step > 0:
+                elems.extend(self._elems[start + cols.start:start + cols.stop:cols.step])
+            else:  # A negative stop can't be offset into the flat buffer.
+                elems.extend(self._elems[start + c] for c in cols)
+        return self._like(len(rows), len(cols), self._wrap(elems))
+
+    def __setitem__(self, key, value):
+        if not isinstance(key, tuple):
+            raise TypeError('Grid: assign to a single cell with grid[row, col] = value')
+        row, col = key
+        self.set(row, col, value)
 
     def __iter__(self):
-        return iter(self.elems)
+        for row in range(self.num_rows):
+            yield _GridRow(self, row)
 
     def __reversed__(self):
-        return reversed(self.elems)
+        for row in reversed(range(self.num_rows)):
+            yield _GridRow(self, row)
 
     def __contains__(self, item):
-        return item in self.elems
+        return item in self._elems
+
+    def __eq__(self, other):
+        if not isinstance(other, Grid):
+            return NotImplemented
+        if (self.num_rows, self.num_cols) != (other.num_rows, other.num_cols):
+            return False
+        if self.uses_numpy or other.uses_numpy:
+            return bool(_np.array_equal(self._elems, other._elems))
+        return all(a == b for a, b in zip(self._elems, other._elems))
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
 
     def __repr__(self):
-        return repr(self.elems)
+        return repr([self.row(row) for row in range(self.num_rows)])
+
+
+# Offsets to the neighbors of a cell, in reading order.
+_ORTHOGONAL_OFFSETS = ((-1, 0), (0, -1), (0, 1), (1, 0))
+_DIAGONAL_OFFSETS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+
+def _kernel_offsets(kernel):
+    """Convert a centered kernel into a list of (row offset, column offset, weight) triples.
+
+    Zero weights are dropped, since they never contribute to a sum.
+    """
+    height = len(kernel)
+    width = len(kernel[0]) if kernel else 0
+    if height % 2 == 0 or width % 2 == 0 or any(len(row) != width for row in kernel):
+        raise ValueError('A kernel must be rectangular with an odd number of rows and columns.')
+    return [
+        (i - height // 2, j - width // 2, w)
+        for i, row in enumerate(kernel)
+        for j, w in enumerate(row)
+        if w
+    ]
 
+
+class _GridRow:
+    """A view of a single row of a :class:`Grid`, so that grid[row][col] works."""
+    __slots__ = ('_grid', '_row')
+
+    def __init__(self, grid, row):
+        self._grid = grid
+        self._row = row
+
+    def __len__(self):
+        return self._grid.num_cols
+
+    def __getitem__(self, col):
+        if isinstance(col, slice):
+            return self._grid.row(self._row)[col]
+        return self._grid.get(self._row, col)
+
+    def __setitem__(self, col, value):
+        self._grid.set(self._row, col, value)
+
+    def __iter__(self):
+        return iter(self._grid.row(self._row))
+
+    def __eq__(self, other):
+        return self._grid.row(self._row) == list(other)
+
+    def __repr__(self):
+        return repr(self._grid.row(self._row))
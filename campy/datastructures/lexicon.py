@@ -2,11 +2,36 @@
 This file exports a :class:`Lexicon` class, a compact structure for storing a list of words.
 
 This :class:`Lexicon` implementation is backed by a data structure called a prefix tree or trie ("try").
+
+Lexicons loaded from a precompiled binary ``.dat`` file (such as the
+``EnglishWords.dat`` file that ships with the CS106B starter code) are instead
+backed by a read-only directed acyclic word graph (DAWG), which is read
+directly from the memory-mapped file. The first time such a lexicon is
+modified, its words are copied into a trie.
+
+Loading a large text word list over and over is slow, so a lexicon can
+optionally cache a compiled copy of a text file on disk::
+
+    lex = Lexicon('dictionary.txt', cache=True)  # Slow the first time, fast afterwards.
+
+The cached copy is rebuilt whenever the contents of the text file change.
 """
 
 # from ..decorators import print_args
 import collections as _collections
 import collections.abc as _collections_abc
+import functools as _functools
+import hashlib as _hashlib
+import logging as _logging
+import mmap as _mmap
+import os as _os
+import tempfile as _tempfile
+
+# Module-level logger.
+logger = _logging.getLogger(__name__)
+
+# The extension of compiled lexicon caches.
+CACHE_SUFFIX = '.lexcache'
 
 class Lexicon(_collections.abc.MutableSet):
     """Representation of a :class:`Lexicon`, or word list.
@@ -28,85 +53,360 @@ class Lexicon(_collections.abc.MutableSet):
                 print(word)
 
     """
-    def __init__(self, file=None):
+    def __init__(self, file=None, cache=False):
         """Initialize a new lexicon.
 
         The default constructor creates an empty lexicon. The second form reads
         in the contents of the lexicon from a specified data filename.
 
+        The data file must be in one of two formats: (1) a space-efficient
+        precompiled binary format (a DAWG file, usually ending in ``.dat``) or
+        (2) a text file containing one word per line.
+
+        Text files can optionally be cached in a compiled binary form. If
+        ``cache`` is True, the cache is stored beside the text file. If
+        ``cache`` is the name of a directory, the cache is stored there instead.
+        The cache is only reused while the text file's contents are unchanged.
+
         Usage::
 
             lex = Lexicon()
             lex_with_words = Lexicon('english.lex')
+            english = Lexicon('EnglishWords.dat')
+            cached = Lexicon('dictionary.txt', cache=True)
 
-     * Initializes a new lexicon.  The default constructor creates an empty
-     * lexicon.  The second form reads in the contents of the lexicon from
-     * the specified data file.  The data file must be in one of two formats:
-     * (1) a space-efficient precompiled binary format or (2) a text file
-     * containing one word per line.  The Stanford library distribution
-     * includes a binary lexicon file named <code>English.dat</code>
-     * containing a list of words in English.  The standard code pattern
-     * to initialize that lexicon looks like this:
-     *
-     *<pre>
-     *    Lexicon english("English.dat");
-     *</pre>
-     */
+        :param file: The name of a file from which to read words.
+        :param cache: Whether (or in which directory) to cache a compiled text file.
         """
 
         self._root = None
-        self.size = 0
+        self._dawg = None
+        self._size = 0
         if file:
-            self._add_words_from_file(file)
+            if _Dawg.is_dawg_file(file):
+                self._dawg = _Dawg.from_file(file)
+            elif cache:
+                self._load_with_cache(file, cache)
+            else:
+                self._add_words_from_file(file)
+
+    @property
+    def size(self):
+        """Get the number of words in this lexicon."""
+        return len(self)
 
-    def _add_words_from_file(self, file, delimiter='\n'):
+    @classmethod
+    def from_words(cls, words):
+        """Create a new lexicon containing every word from an iterable.
+
+        Usage::
+
+            lex = Lexicon.from_words(['hello', 'world'])
+
+        :param words: An iterable of words to add to the new lexicon.
+        :returns: A new :class:`Lexicon` containing the given words.
+        """
+        lex = cls()
+        lex.update(words)
+        return lex
+
+    def _thaw(self):
+        """Copy the words of a read-only DAWG into a mutable trie."""
+        dawg = self._dawg
+        if dawg is None:
+            return
+        self._dawg = None
+        self.update(dawg)
+
+    def _add_words_from_file(self, file):
         with open(file, 'r') as f:
-            raw = f.read()
+            self.update(line.strip() for line in f)
+
+    def _load_with_cache(self, file, cache):
+        """Load a text file through its compiled cache, creating the cache if needed."""
+        cache_file = _cache_path(file, cache)
+        dawg = _read_cache(cache_file, file)
+        if dawg is not None:
+            logger.debug('Loaded lexicon {!r} from cache {!r}.'.format(file, cache_file))
+            self._dawg = dawg
+            return
+
+        # Fingerprint the source before reading it, so that a concurrent edit
+        # leaves a stale key (and a later rebuild) rather than a wrong cache.
+        stat = _os.stat(file)
+        digest = _hash_file(file)
+        self._add_words_from_file(file)
+        try:
+            data = _Dawg.from_trie(self._root).to_bytes()
+        except ValueError as exc:
+            logger.warning('Not caching lexicon {!r}: {}'.format(file, exc))
+            return
+        _write_cache(cache_file, stat, digest, data)
 
-        # TODO: make this dynamically loaded?
-        for line in raw.split(delimiter):
-            self.add(line)
+    def save(self, file):
+        """Write this lexicon to a file in the compact binary (DAWG) format.
+
+        The saved file can be loaded again much faster than a text file::
+
+            lex = Lexicon('dictionary.txt')
+            lex.save('dictionary.dat')
+            same_lex = Lexicon('dictionary.dat')
+
+        Only words made of the letters 'a' through 'z' can be saved.
+
+        :param file: The name of the file to write.
+        :raises ValueError: If this lexicon can't be represented in the binary format.
+        """
+        dawg = self._dawg if self._dawg is not None else _Dawg.from_trie(self._root)
+        with open(file, 'wb') as f:
+            f.write(dawg.to_bytes())
+
+    def _insert(self, word):
+        """Add a lowercase word to the trie and return whether it was already present."""
+        node = self._root
+        for ch in word:
+            children = node.children
+            child = children.get(ch)
+            if child is None:
+                child = children[ch] = _TrieNode()
+            node = child
+        if node.is_word:
+            return True
+        node.is_word = True
+        self._size += 1
+        return False
 
     def add(self, word):
         if not word or not word.isalpha():
             return False
-        word = word.lower()
+        self._thaw()
+        if not self._root:
+            self._root = _TrieNode()
+        return self._insert(word.lower())
+
+    def update(self, words):
+        """Add every word from an iterable to this lexicon.
+
+        Words that are empty or that contain non-alphabetic characters are
+        skipped, just as with :meth:`add`.
+
+        :param words: An iterable of words to add.
+        """
+        self._thaw()
         if not self._root:
             self._root = _TrieNode()
-        return self._add_helper(self._root, word, word)
+        insert = self._insert
+        for word in words:
+            if word and word.isalpha():
+                insert(word.lower())
 
     def clear(self):
-        self.size = 0
+        self._size = 0
         self._root = None
+        self._dawg = None
+
+    def _find(self, word):
+        """Return the trie node reached by spelling out a lowercase word, or None."""
+        node = self._root
+        for ch in word:
+            if node is None:
+                return None
+            node = node.children.get(ch)
+        return node
 
     def __contains__(self, word):
         if not word or not word.isalpha():
             return False
         word = word.lower()
-        return self._contains_helper(self._root, word, is_prefix=False)
+        if self._dawg is not None:
+            return word in self._dawg
+        node = self._find(word)
+        return node is not None and node.is_word
 
     def contains_prefix(self, word):
         if not word or not word.isalpha():
             return False
         word = word.lower()
-        return self._contains_helper(self._root, word, is_prefix=True)
+        if self._dawg is not None:
+            return self._dawg.contains_prefix(word)
+        return self._find(word) is not None
 
     def remove(self, word):
         if not word or not word.isalpha():
             return False
-        word = word.lower()
-        return self._remove_helper(self._root, word, is_prefix=False)
+        self._thaw()
+        return self._remove(word.lower(), is_prefix=False)
 
     discard = remove
 
     def remove_prefix(self, word):
         if not word or not word.isalpha():
             return False
+        self._thaw()
+        return self._remove(word.lower(), is_prefix=True)
+
+    def _structure(self):
+        """Return the structure backing this lexicon, viewed through the traversal interface.
+
+        Both :class:`_Trie` and :class:`_Dawg` provide ``root()``, ``step(node, letter)``,
+        ``children(node)`` and ``accepts(node)``, so the queries below can prune
+        on either one as they walk.
+        """
+        if self._dawg is not None:
+            return self._dawg
+        return _Trie(self._root)
+
+    def words_with_prefix(self, prefix):
+        """Lazily yield, in alphabetical order, every word that starts with a prefix.
+
+        Only the part of the lexicon below the prefix is visited, so this is
+        much faster than filtering every word.
+
+        To print all words that start with 'qu'::
+
+            lex = Lexicon('EnglishWords.dat')
+            for word in lex.words_with_prefix('qu'):
+                print(word)
+
+        :param prefix: The prefix to search for. An empty prefix yields every word.
+        :returns: A generator of matching words.
+        """
+        if prefix and not prefix.isalpha():
+            return
+        prefix = prefix.lower()
+        graph = self._structure()
+        node = graph.root()
+        for ch in prefix:
+            node = graph.step(node, ch)
+            if node is None:
+                return
+
+        stack = [(node, prefix)]
+        while stack:
+            node, sofar = stack.pop()
+            if graph.accepts(node):
+                yield sofar
+            for letter, child in reversed(graph.children(node)):
+                stack.append((child, sofar + letter))
+
+    def match(self, pattern):
+        """Lazily yield, in alphabetical order, every word matching a wildcard pattern.
+
+        In the pattern, a ``?`` matches any single letter and a ``*`` matches
+        any run of zero or more letters. All other characters match themselves.
+        Branches of the lexicon that can't possibly match are never visited.
+
+        To find all three-letter words that start with 'c' and end with 't'::
+
+            lex = Lexicon('EnglishWords.dat')
+            print(list(lex.match('c?t')))  # => ['cat', 'cot', 'cut']
+
+        :param pattern: The wildcard pattern to match.
+        :returns: A generator of matching words.
+        """
+        pattern = pattern.lower()
+        final = len(pattern)
+
+        def skip_stars(positions):
+            """Extend a set of positions in the pattern to skip over empty runs of '*'."""
+            closed = set()
+            for i in positions:
+                closed.add(i)
+                while i < final and pattern[i] == '*':
+                    i += 1
+                    closed.add(i)
+            return closed
+
+        # Track every position in the pattern that could be reached by the
+        # letters so far, so each node in the lexicon is only visited once.
+        graph = self._structure()
+        stack = [(graph.root(), '', skip_stars({0}))]
+        while stack:
+            node, sofar, positions = stack.pop()
+            if final in positions and graph.accepts(node):
+                yield sofar
+            for letter, child in reversed(graph.children(node)):
+                advanced = set()
+                for i in positions:
+                    if i < final:
+                        wildcard = pattern[i]
+                        if wildcard == '*':
+                            advanced.add(i)
+                        elif wildcard == '?' or wildcard == letter:
+                            advanced.add(i + 1)
+                if advanced:
+                    stack.append((child, sofar + letter, skip_stars(advanced)))
+
+    def neighbors(self, word, max_edits=1, same_length=False):
+        """Lazily yield, in alphabetical order, the words within a few edits of a word.
+
+        An edit is an insertion, deletion, or substitution of a single letter,
+        so this yields every other word whose Levenshtein distance from the
+        given word is at most ``max_edits``. If ``same_length`` is True, only
+        substitutions are allowed, which is exactly what a word ladder needs.
+        The word itself is never yielded.
+
+        To find every word one letter away from 'cat'::
+
+            lex = Lexicon('EnglishWords.dat')
+            for neighbor in lex.neighbors('cat', same_length=True):
+                print(neighbor)  # 'bat', 'cab', 'cot', ...
+
+        :param word: The word whose neighbors to find.
+        :param max_edits: The maximum number of edits between a neighbor and the word.
+        :param same_length: Whether to only allow substitutions.
+        :returns: A generator of neighboring words.
+        """
+        if not word or not word.isalpha():
+            return
         word = word.lower()
-        return self._remove_helper(self._root, word, is_prefix=True)
+        graph = self._structure()
+        if same_length:
+            yield from self._hamming_neighbors(graph, word, max_edits)
+            return
+
+        # Each node carries one row of the edit distance table between its
+        # prefix and the word. A branch is pruned once every entry in its row
+        # exceeds the edit budget, since the distance can only grow from there.
+        length = len(word)
+        stack = [(graph.root(), '', list(range(length + 1)))]
+        while stack:
+            node, sofar, row = stack.pop()
+            if row[-1] <= max_edits and sofar != word and graph.accepts(node):
+                yield sofar
+            for letter, child in reversed(graph.children(node)):
+                next_row = [row[0] + 1]
+                for i in range(1, length + 1):
+                    next_row.append(min(
+                        next_row[i - 1] + 1,  # Insertion.
+                        row[i] + 1,  # Deletion.
+                        row[i - 1] + (word[i - 1] != letter),  # Substitution (or match).
+                    ))
+                if min(next_row) <= max_edits:
+                    stack.append((child, sofar + letter, next_row))
+
+    @staticmethod
+    def _hamming_neighbors(graph, word, max_edits):
+        """Yield the words that differ from word in between 1 and max_edits positions."""
+        length = len(word)
+        stack = [(graph.root(), '', 0)]
+        while stack:
+            node, sofar, mismatches = stack.pop()
+            depth = len(sofar)
+            if depth == length:
+                if mismatches and graph.accepts(node):
+                    yield sofar
+                continue
+            expected = word[depth]
+            for letter, child in reversed(graph.children(node)):
+                cost = mismatches + (letter != expected)
+                if cost <= max_edits:
+                    stack.append((child, sofar + letter, cost))
 
     def __len__(self):
-        return self.size
+        if self._dawg is not None:
+            return len(self._dawg)
+        return self._size
 
     def __str__(self):
         return "Lexicon(num_words={self.size})".format(self=self)
@@ -120,79 +420,407 @@ class Lexicon(_collections.abc.MutableSet):
     def __eq__(self, other):
         pass
 
-    #TODO: this is gross
     def __iter__(self):
-        yield from self.__iter_helper__(self._root, '')
-
-    def __iter_helper__(self, node, sofar):
-        if not node:
+        if self._dawg is not None:
+            yield from self._dawg
             return
-        if node.is_word:
-            yield sofar
-        for letter in 'abcdefghijklmnopqrstuvwxyz':
-            yield from self.__iter_helper__(node.get_child(letter), sofar + letter)
-
+        if not self._root:
+            return
+        yield from _TrieNode.walk(self._root, '')
 
     def __hash__(self):
         pass
 
-    def _add_helper(self, node, word, original):
-
-        if not word:  # We've reached the end, mark it as a word
-            already_exists = node.is_word
-            if not already_exists:
-                self.size += 1
-                node.is_word = True
-            return already_exists
+    def _remove(self, word, is_prefix=False):
+        """Remove a lowercase word (or every word with a given prefix) from the trie.
 
-        first, *rest = word  # 'word' -> 'w', ['o', 'r', 'd']
-        child = node.get_child(first)
-        if not child:
-            child = node.add_child(first)
-        return self._add_helper(child, rest, original)
-
-    def _contains_helper(self, node, word, is_prefix=False):
-        if not node:
-            # BC: No node reaches this far, so the prefix must not exist.
+        Nodes that no longer lead to any word are pruned on the way back up.
+        Return whether anything was removed.
+        """
+        # Remember the path so that we can prune dead branches afterwards.
+        path = []
+        node = self._root
+        for ch in word:
+            if node is None:
+                return False
+            path.append((node, ch))
+            node = node.children.get(ch)
+        if node is None:
             return False
-        if not word:
-            # BC: Found nodes this far. We found it if we're looking for a prefix or we're at a word
-            return is_prefix or node.is_word
-        # RC: Take one step forward
-        return self._contains_helper(node.get_child(word[0]), word[1:], is_prefix)
-
-    def _remove_helper(self, node, word, ):
-        if not node:
-            # BC: Dead end!
+
+        if is_prefix:
+            removed = sum(1 for _ in _TrieNode.walk(node, ''))
+            node.children = {}
+            node.is_word = False
+        elif node.is_word:
+            removed = 1
+            node.is_word = False
+        else:
             return False
-        if not word:
-            # BC: We've walked down the whole tree
-            pass
+        self._size -= removed
+
+        # Prune upwards until we reach a node that is still needed.
+        for parent, ch in reversed(path):
+            if node.is_word or node.children:
+                break
+            del parent.children[ch]
+            node = parent
+        return removed > 0
 
 
 class _TrieNode(object):
-    ALPHABET_SIZE = 26
+    """A single node of a trie, whose children are keyed by lowercase letter."""
+    __slots__ = ('is_word', 'children')
 
     def __init__(self):
         self.is_word = False
-        self.children = [None for _ in range(_TrieNode.ALPHABET_SIZE)]
-        self.num_children = 0
-        self.num_descendants = 0
+        self.children = {}
 
     def get_child(self, letter):
         """# pre: letter is between 'a' and 'z' in lowercase"""
-        return self.children[ord(letter) - ord('a')]
+        return self.children.get(letter)
 
     def add_child(self, letter):
-        child = _TrieNode()
-        self.children[ord(letter) - ord('a')] = child
-        self.num_children += 1
-        self.num_descendants += 1
+        child = self.children[letter] = _TrieNode()
         return child
 
     @property
-    def is_leaf_node():
-        return self.num_children == 0
+    def num_children(self):
+        return len(self.children)
+
+    @property
+    def is_leaf_node(self):
+        return not self.children
+
+    @staticmethod
+    def walk(node, prefix):
+        """Yield, in alphabetical order, every word at or below node.
+
+        Each yielded word starts with the given prefix, which spells out node.
+        """
+        stack = [(node, prefix)]
+        while stack:
+            node, sofar = stack.pop()
+            if node.is_word:
+                yield sofar
+            children = node.children
+            # Push in reverse so that the alphabetically first child is popped first.
+            for letter in sorted(children, reverse=True):
+                stack.append((children[letter], sofar + letter))
+
+class _Trie(object):
+    """The traversal interface (shared with :class:`_Dawg`) over a trie of :class:`_TrieNode`."""
+    __slots__ = ('_root',)
+
+    def __init__(self, root):
+        self._root = root
+
+    def root(self):
+        return self._root
+
+    def step(self, node, letter):
+        return node.children.get(letter) if node is not None else None
+
+    def children(self, node):
+        if node is None:
+            return []
+        return sorted(node.children.items())
+
+    def accepts(self, node):
+        return node is not None and node.is_word
+
+
+class _Dawg:
+    """A read-only directed acyclic word graph in the Stanford binary format.
+
+    The file starts with an ASCII header ``DAWG:<start>:<num_bytes>:`` and is
+    followed by a flat table of 4-byte big-endian edges. Each edge packs (from
+    the most significant bit) a 24-bit index of its first child edge, an unused
+    bit, an accept bit, a last-sibling bit, and a 5-bit letter (with 'a' = 1).
+    The children of an edge are the run of edges from its child index up to
+    and including the first edge marked as a last sibling. Index 0 means there
+    are no children, and ``<start>`` is the index of the root's first edge.
+
+    The edges are never unpacked - they are read directly from the (usually
+    memory-mapped) buffer, one byte at a time, so loading a DAWG costs a single
+    mmap call regardless of the number of words.
+    """
+    MAGIC = b'DAWG:'
+
+    # Masks for the low byte of each edge.
+    LETTER_MASK = 0x1f
+    LAST_EDGE = 0x20
+    ACCEPT = 0x40
+
+    def __init__(self, data, start):
+        """Create a DAWG over a buffer of edges whose root list begins at start."""
+        self._data = memoryview(data)
+        self._start = start
+        self._size = None
+
+    @classmethod
+    def is_dawg_file(cls, filename):
+        """Return whether the file at filename begins with a DAWG header."""
+        with open(filename, 'rb') as f:
+            return f.read(len(cls.MAGIC)) == cls.MAGIC
+
+    @classmethod
+    def from_file(cls, filename, offset=0):
+        """Load a DAWG by memory-mapping the binary file at filename.
+
+        The DAWG begins offset bytes into the file.
+        """
+        with open(filename, 'rb') as f:
+            try:
+                buffer = _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ)
+            except (ValueError, OSError):  # Empty files (and some filesystems) can't be mapped.
+                buffer = f.read()
+
+        magic, start, num_bytes, _ = bytes(buffer[offset:offset + 64]).split(b':', 3)
+        if magic + b':' != cls.MAGIC:
+            raise ValueError('{!r} is not a DAWG file.'.format(filename))
+        offset += len(magic) + len(start) + len(num_bytes) + 3
+        num_bytes = int(num_bytes)
+        if offset + num_bytes > len(buffer):
+            raise ValueError('{!r} is truncated: expected {} bytes of edges.'.format(filename, num_bytes))
+        return cls(memoryview(buffer)[offset:offset + num_bytes], int(start))
+
+    @classmethod
+    def from_trie(cls, root):
+        """Compile a trie into a minimal DAWG by sharing identical child lists.
+
+        :raises ValueError: If a word contains a letter outside of 'a' through 'z'.
+        """
+        data = bytearray(4)  # Edge 0 is reserved to mean "no children".
+        registry = {}  # Maps each distinct child list to its index.
+
+        def compile_list(node):
+            # Compile the child lists below this node first, bottom-up.
+            entries = tuple(
+                (letter, child.is_word, compile_list(child))
+                for letter, child in sorted(node.children.items())
+            )
+            if not entries:
+                return 0
+            index = registry.get(entries)
+            if index is None:
+                index = registry[entries] = len(data) // 4
+                for i, (letter, accept, children) in enumerate(entries):
+                    code = ord(letter) - 96
+                    if not 1 <= code <= 26:
+                        raise ValueError('{!r} is not a letter from a to z.'.format(letter))
+                    if children >= 1 << 24:
+                        raise ValueError('Too many distinct words to compile.')
+                    flags = code
+                    if accept:
+                        flags |= cls.ACCEPT
+                    if i == len(entries) - 1:
+                        flags |= cls.LAST_EDGE
+                    data.extend(((children << 8) | flags).to_bytes(4, 'big'))
+            return index
+
+        start = compile_list(root) if root is not None else 0
+        return cls(data if start else b'', start)
+
+    def to_bytes(self):
+        """Return the contents of a DAWG file that holds this DAWG."""
+        header = '{}{}:{}:'.format(self.MAGIC.decode(), self._start, len(self._data)).encode()
+        return header + bytes(self._data)
+
+    def _children(self, index):
+        """Return the index of the first child of the edge at index, or 0."""
+        data = self._data
+        base = 4 * index
+        return (data[base] << 16) | (data[base + 1] << 8) | data[base + 2]
+
+    def _find(self, word):
+        """Return the edge index reached by spelling out word, or -1 if there is none."""
+        data = self._data
+        mask = self.LETTER_MASK
+        index = self._start
+        found = -1
+        for ch in word:
+            if not index:
+                return -1
+            letter = ord(ch) - 96  # ord('a') - 1
+            # Scan the sibling list for the matching letter.
+            while True:
+                flags = data[4 * index + 3]
+                if flags & mask == letter:
+                    break
+                if flags & self.LAST_EDGE:
+                    return -1
+                index += 1
+            found = index
+            index = self._children(index)
+        return found
+
+    # The traversal interface. A node is the index of the edge that leads to it,
+    # and the root (which no edge leads to) is represented by -1.
+    def root(self):
+        return -1
+
+    def _first_child(self, node):
+        if node < 0:
+            return self._start if self._data else 0
+        return self._children(node)
+
+    def step(self, node, letter):
+        index = self._first_child(node)
+        if not index:
+            return None
+        data = self._data
+        letter = ord(letter) - 96
+        while True:
+            flags = data[4 * index + 3]
+            if flags & self.LETTER_MASK == letter:
+                return index
+            if flags & self.LAST_EDGE:
+                return None
+            index += 1
+
+    def children(self, node):
+        index = self._first_child(node)
+        if not index:
+            return []
+        data = self._data
+        children = []
+        while True:
+            flags = data[4 * index + 3]
+            children.append((chr(96 + (flags & self.LETTER_MASK)), index))
+            if flags & self.LAST_EDGE:
+                return children
+            index += 1
+
+    def accepts(self, node):
+        return node >= 0 and bool(self._data[4 * node + 3] & self.ACCEPT)
+
+    def __contains__(self, word):
+        index = self._find(word)
+        return index >= 0 and bool(self._data[4 * index + 3] & self.ACCEPT)
+
+    def contains_prefix(self, prefix):
+        return self._find(prefix) >= 0
+
+    def __len__(self):
+        if self._size is None:
+            self._size = self._count()
+        return self._size
+
+    def _count(self):
+        """Count the words in this DAWG, visiting each shared edge list only once."""
+        data = self._data
+        counts = {0: 0}  # Number of words spelled out below each edge list.
+
+        def count_list(first):
+            if first in counts:
+                return counts[first]
+            total = 0
+            index = first
+            while True:
+                flags = data[4 * index + 3]
+                if flags & self.ACCEPT:
+                    total += 1
+                total += count_list(self._children(index))
+                if flags & self.LAST_EDGE:
+                    break
+                index += 1
+            counts[first] = total
+            return total
+
+        return count_list(self._start) if data else 0
+
+    def __iter__(self):
+        """Yield every word in this DAWG in alphabetical order."""
+        data = self._data
+        if not data:
+            return
+        # Each stack entry is an edge still to visit along with the prefix that leads to it.
+        stack = [(self._start, '')]
+        while stack:
+            index, prefix = stack.pop()
+            flags = data[4 * index + 3]
+            word = prefix + chr(96 + (flags & self.LETTER_MASK))
+            # Visit the next sibling only after this edge's entire subtree.
+            if not flags & self.LAST_EDGE:
+                stack.append((index + 1, prefix))
+            if flags & self.ACCEPT:
+                yield word
+            child = self._children(index)
+            if child:
+                stack.append((child, word))
+
+
+# The first line of a cache file identifies the source it was compiled from,
+# as `CAMPYLEX:1:<mtime_ns>:<size>:<sha256>`. A DAWG file follows.
+_CACHE_MAGIC = b'CAMPYLEX:1:'
+
+
+def _cache_path(file, cache):
+    """Return the cache filename for a source file.
+
+    If cache is True, the cache lives beside the source. Otherwise, cache names
+    a directory, and the cache filename includes a digest of the source's path.
+    """
+    if cache is True:
+        return file + CACHE_SUFFIX
+    digest = _hashlib.sha1(_os.path.abspath(file).encode()).hexdigest()[:16]
+    return _os.path.join(cache, '{}-{}{}'.format(_os.path.basename(file), digest, CACHE_SUFFIX))
+
+
+def _hash_file(file):
+    """Return the hex SHA-256 digest of a file's contents."""
+    digest = _hashlib.sha256()
+    with open(file, 'rb') as f:
+        for chunk in iter(_functools.partial(f.read, 1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_cache(cache_file, source):
+    """Return the cached DAWG for a source file, or None if there's no valid cache."""
+    try:
+        with open(cache_file, 'rb') as f:
+            header = f.readline()
+        magic, mtime, size, digest = header.rstrip(b'\n').rsplit(b':', 3)
+        stat = _os.stat(source)
+    except (OSError, ValueError):
+        return None
+    if magic + b':' != _CACHE_MAGIC:
+        return None
+
+    try:
+        if int(mtime) == stat.st_mtime_ns and int(size) == stat.st_size:
+            return _Dawg.from_file(cache_file, offset=len(header))
+        # The source was touched, but it might not have changed.
+        if digest.decode() != _hash_file(source):
+            return None
+        dawg = _Dawg.from_file(cache_file, offset=len(header))
+    except (OSError, ValueError):
+        logger.warning('Ignoring unreadable lexicon cache {!r}.'.format(cache_file))
+        return None
+    # Refresh the key so that next time we don't need to rehash the source.
+    _write_cache(cache_file, stat, digest.decode(), dawg.to_bytes())
+    return dawg
+
+
+def _write_cache(cache_file, stat, digest, data):
+    """Atomically write a cache file for a source with the given stat and digest."""
+    header = _CACHE_MAGIC + '{}:{}:{}\n'.format(stat.st_mtime_ns, stat.st_size, digest).encode()
+    directory = _os.path.dirname(_os.path.abspath(cache_file))
+    try:
+        _os.makedirs(directory, exist_ok=True)
+        fd, tmp = _tempfile.mkstemp(dir=directory, suffix=CACHE_SUFFIX)
+        try:
+            with _os.fdopen(fd, 'wb') as f:
+                f.write(header)
+                f.write(data)
+            _os.replace(tmp, cache_file)
+        except BaseException:
+            _os.unlink(tmp)
+            raise
+    except OSError as exc:
+        logger.warning('Unable to write lexicon cache {!r}: {}'.format(cache_file, exc))
 
 
 def _scrub(string):
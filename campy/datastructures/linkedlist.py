@@ -1,21 +1,354 @@
-"""
+"""This file exports a doubly linked :class:`LinkedList`.
+
+A :class:`LinkedList` adds and removes values at either end in constant time,
+and moves whole lists into one another in constant time::
+
+    lst = LinkedList([2, 3])
+    lst.appendleft(1)
+    lst.append(4)
+    print(lst.popleft(), lst.pop())  # => 1 4
+
+To edit the middle of a list in constant time, use a cursor, which stays on the
+same node while the list changes around it::
 
+    cursor = lst.cursor()
+    while not cursor.at_end:
+        if cursor.value % 2 == 0:
+            cursor.insert_before(0)
+        cursor.move_next()
+    print(lst)  # => LinkedList([0, 2, 3])
+
+Indexing walks from whichever is nearest to the index: the head, the tail, or
+the node most recently found by index. So stepping through a list by index
+takes constant time per step.
 """
-import collections as _collections
+import collections.abc as _collections_abc
+
 
-class LinkedList(_collections.abc.MutableSequence):
-    def __init__(self):
+class LinkedList(_collections_abc.MutableSequence):
+    def __init__(self, data=None):
         self.head = None
+        self.tail = None
+        self._size = 0
+        # The node most recently found by index, and its index.
+        self._cached_index = None
+        self._cached_node = None
+        if data:
+            self.extend(data)
+
+    ##################
+    # Linking nodes. #
+    ##################
+    def _link_before(self, node, successor):
+        """Link a new node into the list before successor, or at the end if successor is None."""
+        if successor is None:
+            node.prev = self.tail
+            node.next = None
+            if self.tail is None:
+                self.head = node
+            else:
+                self.tail.next = node
+            self.tail = node
+        else:
+            node.prev = successor.prev
+            node.next = successor
+            if successor.prev is None:
+                self.head = node
+            else:
+                successor.prev.next = node
+            successor.prev = node
+        self._size += 1
+        self._cached_node = None
+        return node
+
+    def _unlink(self, node):
+        """Unlink a node from the list and return its value."""
+        if node.prev is None:
+            self.head = node.next
+        else:
+            node.prev.next = node.next
+        if node.next is None:
+            self.tail = node.prev
+        else:
+            node.next.prev = node.prev
+        node.prev = node.next = None
+        self._size -= 1
+        self._cached_node = None
+        return node.value
+
+    def _node_at(self, index):
+        """Return the node at an index, walking from the nearest known node."""
+        size = self._size
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError('LinkedList index out of range')
+        # Walk from the head, the tail, or the cached node, whichever is closest.
+        node, position = self.head, 0
+        if size - 1 - index < index:
+            node, position = self.tail, size - 1
+        if self._cached_node is not None and abs(self._cached_index - index) < abs(position - index):
+            node, position = self._cached_node, self._cached_index
+        while position < index:
+            node = node.next
+            position += 1
+        while position > index:
+            node = node.prev
+            position -= 1
+        self._cached_index, self._cached_node = index, node
+        return node
+
+    def _nodes(self):
+        node = self.head
+        while node is not None:
+            # Fetch the next node first, so the current one can be unlinked.
+            following = node.next
+            yield node
+            node = following
+
+    ############################
+    # MutableSequence methods. #
+    ############################
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        node = self.head
+        while node is not None:
+            yield node.value
+            node = node.next
+
+    def __reversed__(self):
+        node = self.tail
+        while node is not None:
+            yield node.value
+            node = node.prev
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return LinkedList(list(self)[index])
+        return self._node_at(index).value
+
+    def __setitem__(self, index, value):
+        if not isinstance(index, slice):
+            self._node_at(index).value = value
+            return
+        start, stop, step = index.indices(self._size)
+        if step == 1:
+            # Copy first, in case value is this list or reads from it.
+            values = list(value)
+            del self[start:stop]
+            successor = self._node_at(start) if start < self._size else None
+            for item in values:
+                self._link_before(LinkedListNode(item), successor)
+            return
+        positions = range(start, stop, step)
+        values = list(value)
+        if len(values) != len(positions):
+            raise ValueError('attempt to assign sequence of size {} to extended slice of size {}'.format(
+                len(values), len(positions)))
+        for position, item in zip(positions, values):
+            self._node_at(position).value = item
+
+    def __delitem__(self, index):
+        if not isinstance(index, slice):
+            self._unlink(self._node_at(index))
+            return
+        positions = set(range(*index.indices(self._size)))
+        for position, node in enumerate(list(self._nodes())):
+            if position in positions:
+                self._unlink(node)
+
+    def insert(self, index, value):
+        """Insert a value before an index, as in list.insert."""
+        if index < 0:
+            index = max(index + self._size, 0)
+        successor = self._node_at(index) if index < self._size else None
+        self._link_before(LinkedListNode(value), successor)
+
+    # Constant-time operations at either end.
+    def append(self, value):
+        self._link_before(LinkedListNode(value), None)
+
+    def appendleft(self, value):
+        self._link_before(LinkedListNode(value), self.head)
+
+    def pop(self, index=-1):
+        """Remove and return the value at an index (by default, the last one)."""
+        if not self._size:
+            raise IndexError('pop from empty LinkedList')
+        node = self.tail if index == -1 else self._node_at(index)
+        return self._unlink(node)
+
+    def popleft(self):
+        """Remove and return the first value."""
+        if not self._size:
+            raise IndexError('pop from empty LinkedList')
+        return self._unlink(self.head)
+
+    def clear(self):
+        # Break the links between nodes, so cursors can tell their nodes are gone.
+        for node in self._nodes():
+            node.prev = node.next = None
+        self.head = self.tail = None
+        self._size = 0
+        self._cached_node = None
+
+    def splice(self, other, index=None):
+        """Move every node of another linked list into this one, leaving the other list empty.
+
+        Splicing at either end takes constant time.
+
+        Usage::
 
-    # __getitem__, __setitem__, __delitem__, __len__, insert
+            first, second = LinkedList([1, 2]), LinkedList([3, 4])
+            first.splice(second)
+            print(first, second)  # => LinkedList([1, 2, 3, 4]) LinkedList([])
+
+        :param other: The :class:`LinkedList` whose nodes to move.
+        :param index: The index before which to insert the nodes. Defaults to the end.
+        """
+        if index is None or index >= self._size:
+            successor = None
+        else:
+            if index < 0:
+                index = max(index + self._size, 0)
+            successor = self._node_at(index)
+        self._splice_before(other, successor)
+
+    def _splice_before(self, other, successor):
+        if other is self:
+            raise ValueError('LinkedList: cannot splice a list into itself')
+        if not other._size:
+            return
+        first, last = other.head, other.tail
+        predecessor = self.tail if successor is None else successor.prev
+        first.prev = predecessor
+        last.next = successor
+        if predecessor is None:
+            self.head = first
+        else:
+            predecessor.next = first
+        if successor is None:
+            self.tail = last
+        else:
+            successor.prev = last
+        self._size += other._size
+        self._cached_node = None
+        other.head = other.tail = None
+        other._size = 0
+        other._cached_node = None
+
+    def cursor(self, index=0):
+        """Return a :class:`Cursor` on the node at an index.
+
+        An index equal to the length of the list gives a cursor past the end.
+        """
+        if index == self._size:
+            return Cursor(self, None)
+        return Cursor(self, self._node_at(index))
+
+    def __eq__(self, other):
+        if not isinstance(other, LinkedList):
+            return NotImplemented
+        return self._size == other._size and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self):
+        return 'LinkedList({!r})'.format(list(self))
+
+    # Synonyms
+    add = append
+
+
+class Cursor:
+    """A position in a :class:`LinkedList`, for editing the list in constant time.
+
+    A cursor is on a node of the list, or past the end of the list. It stays on
+    its node as other values are added or removed, but removing its node through
+    anything other than this cursor leaves the cursor invalid.
+    """
+    __slots__ = ('_list', '_node')
+
+    def __init__(self, linked_list, node):
+        self._list = linked_list
+        self._node = node
+
+    def _current(self):
+        node = self._node
+        if node is None:
+            raise IndexError('Cursor: cursor is past the end of the list')
+        if node.prev is None and self._list.head is not node:
+            raise ValueError('Cursor: node was removed from the list')
+        return node
+
+    @property
+    def at_end(self):
+        """Whether this cursor is past the end of the list."""
+        return self._node is None
+
+    @property
+    def value(self):
+        return self._current().value
+
+    @value.setter
+    def value(self, value):
+        self._current().value = value
+
+    def move_next(self):
+        """Move to the next node, or past the end of the list. Return whether the cursor is still on a node."""
+        self._node = self._current().next
+        return self._node is not None
+
+    def move_prev(self):
+        """Move to the previous node. Return whether there was one; if not, the cursor doesn't move."""
+        node = self._list.tail if self._node is None else self._current().prev
+        if node is None:
+            return False
+        self._node = node
+        return True
+
+    def insert_before(self, value):
+        """Insert a value before this cursor (at the end, if the cursor is past the end)."""
+        successor = None if self._node is None else self._current()
+        self._list._link_before(LinkedListNode(value), successor)
+
+    def insert_after(self, value):
+        """Insert a value after this cursor's node."""
+        self._list._link_before(LinkedListNode(value), self._current().next)
+
+    def remove(self):
+        """Remove this cursor's node, move to the next node, and return the removed value."""
+        node = self._current()
+        self._node = node.next
+        return self._list._unlink(node)
+
+    def splice(self, other):
+        """Move every node of another linked list before this cursor, in constant time."""
+        successor = None if self._node is None else self._current()
+        self._list._splice_before(other, successor)
+
+    def __iter__(self):
+        """Iterate over the values from this cursor to the end, moving the cursor along."""
+        while self._node is not None:
+            node = self._current()
+            yield node.value
+            # If the loop body removed the node, the cursor has already moved on.
+            if self._node is node:
+                self._node = node.next
+
+    def __repr__(self):
+        if self._node is None:
+            return 'Cursor(at_end=True)'
+        return 'Cursor(value={!r})'.format(self._node.value)
 
-    def add(self):
-        pass
 
 class LinkedListNode(object):
-    def __init__(self, value, next_node):
+    __slots__ = ('value', 'next', 'prev')
+
+    def __init__(self, value, next_node=None, prev_node=None):
         self.value = value
         self.next = next_node
+        self.prev = prev_node
 
     def __str__(self):
         return "LLNode(value={self.value})".format(self=self)
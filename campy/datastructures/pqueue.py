@@ -1,39 +1,302 @@
 # TODO(sredmond): Possibly rename this file priorityqueue.h for compatibility.
 """
 Min-heap.
+
+This :class:`PriorityQueue` is an indexed binary heap. Besides the usual
+operations, it can find, reprioritize, or remove any value in logarithmic
+time::
+
+    pq = PriorityQueue()
+    pq.add('write essay', 3)
+    pq.add('eat lunch', 1)
+    pq.change_priority('write essay', 0)  # Deadline moved up!
+    print(pq.dequeue())  # => 'write essay'
+
+Values with equal priorities come out in the order in which they were added,
+and values themselves are never compared, so they need not be orderable.
+Values must be hashable to be found quickly by :meth:`PriorityQueue.change_priority`,
+:meth:`PriorityQueue.remove` and ``in``; unhashable values are found by a
+linear scan instead.
 """
 import collections as _collections
+import heapq as _heapq
+import itertools as _itertools
 
 # TODO(sredmond): Make this into a collection subclass.
 # TODO(sredmond): Use namedtuples.
-import heapq as _heapq
+
+# The fields of a heap entry. Each entry is a small list so that its position
+# can be updated in place as the entry moves through the heap.
+_KEY, _VALUE, _POS = 0, 1, 2
+
+# Sentinel for distinguishing remove() from remove(value).
+_MISSING = object()
+
 
 class PriorityQueue(object):
     def __init__(self, initializer=None, priorities_first=True):
         if not initializer:
             initializer = []
 
-        if priorities_first:
-            self._heap = [(priority, value) for priority, value in initializer]
+        if not priorities_first:
+            initializer = ((priority, value) for value, priority in initializer)
+
+        # Each entry is [(priority, sequence number), value, position in heap].
+        # The sequence number breaks ties in FIFO order.
+        self._counter = _itertools.count()
+        self._heap = []
+        self._entries = {}  # Maps each (hashable) value to its entries, oldest first.
+        self.extend(initializer)
+
+    ###################
+    # Heap internals. #
+    ###################
+    def _index(self, entry):
+        try:
+            self._entries.setdefault(entry[_VALUE], []).append(entry)
+        except TypeError:  # Unhashable values are found by scanning.
+            pass
+
+    def _unindex(self, entry):
+        try:
+            entries = self._entries[entry[_VALUE]]
+        except (TypeError, KeyError):
+            return
+        entries.remove(entry)
+        if not entries:
+            del self._entries[entry[_VALUE]]
+
+    def _find(self, value):
+        """Return the oldest entry holding value, or raise a KeyError."""
+        try:
+            return self._entries[value][0]
+        except KeyError:
+            raise KeyError(value) from None
+        except TypeError:
+            for entry in sorted(self._heap, key=lambda entry: entry[_KEY][1]):
+                if entry[_VALUE] == value:
+                    return entry
+            raise KeyError(value) from None
+
+    def _sift_up(self, pos):
+        heap = self._heap
+        entry = heap[pos]
+        key = entry[_KEY]
+        while pos > 0:
+            parent_pos = (pos - 1) >> 1
+            parent = heap[parent_pos]
+            if key < parent[_KEY]:
+                heap[pos] = parent
+                parent[_POS] = pos
+                pos = parent_pos
+            else:
+                break
+        heap[pos] = entry
+        entry[_POS] = pos
+
+    def _sift_down(self, pos):
+        heap = self._heap
+        end = len(heap)
+        entry = heap[pos]
+        key = entry[_KEY]
+        child_pos = 2 * pos + 1
+        while child_pos < end:
+            # Pick the smaller of the two children.
+            right_pos = child_pos + 1
+            if right_pos < end and heap[right_pos][_KEY] < heap[child_pos][_KEY]:
+                child_pos = right_pos
+            child = heap[child_pos]
+            if child[_KEY] < key:
+                heap[pos] = child
+                child[_POS] = pos
+                pos = child_pos
+                child_pos = 2 * pos + 1
+            else:
+                break
+        heap[pos] = entry
+        entry[_POS] = pos
+
+    def _heapify(self):
+        """Restore the heap property over the whole heap, bottom-up, in linear time."""
+        for pos in reversed(range(len(self._heap) // 2)):
+            self._sift_down(pos)
+
+    def _append_all(self, entries):
+        """Add new entries to the heap, then restore the heap property."""
+        heap = self._heap
+        start = len(heap)
+        for entry in entries:
+            entry[_POS] = len(heap)
+            heap.append(entry)
+            self._index(entry)
+        added = len(heap) - start
+        # Sifting up each new entry costs about log(n) per entry, whereas
+        # heapifying costs about n in total, so pick whichever is cheaper.
+        if added * len(heap).bit_length() > len(heap):
+            self._heapify()
+        else:
+            for pos in range(start, len(heap)):
+                self._sift_up(pos)
+
+    def _remove_entry(self, entry):
+        """Remove an entry from anywhere in the heap."""
+        heap = self._heap
+        last = heap.pop()
+        self._unindex(entry)
+        if last is entry:
+            return
+        # Move the last entry into the hole, and restore the heap in whichever
+        # direction it is out of order.
+        pos = entry[_POS]
+        heap[pos] = last
+        last[_POS] = pos
+        if pos > 0 and last[_KEY] < heap[(pos - 1) >> 1][_KEY]:
+            self._sift_up(pos)
         else:
-            self._heap = [(priority, value) for value, priority in initializer]
-        _heapq.heapify(self._heap)
+            self._sift_down(pos)
 
+    ##############
+    # Public API #
+    ##############
     def add(self, value, priority):
-        _heapq.heappush(self._heap, (priority, value))
+        entry = [(priority, next(self._counter)), value, len(self._heap)]
+        self._heap.append(entry)
+        self._index(entry)
+        self._sift_up(entry[_POS])
+
+    def extend(self, pairs, priorities_first=True):
+        """Add many values to this priority queue at once.
+
+        Large batches are merged into the heap in linear time, rather than by
+        adding values one at a time.
+
+        Usage::
+
+            pq.extend([(2, 'laundry'), (1, 'dishes')])
+            pq.extend([('groceries', 3)], priorities_first=False)
+
+        :param pairs: An iterable of (priority, value) pairs.
+        :param priorities_first: Whether each pair is (priority, value), rather than (value, priority).
+        """
+        counter = self._counter
+        if priorities_first:
+            entries = [[(priority, next(counter)), value, 0] for priority, value in pairs]
+        else:
+            entries = [[(priority, next(counter)), value, 0] for value, priority in pairs]
+        self._append_all(entries)
+
+    def merge(self, other):
+        """Add every value in another priority queue to this one, in linear time.
+
+        The other priority queue is unchanged. Among equal priorities, the
+        values from the other priority queue come after this one's, in their
+        original order.
+
+        :param other: The :class:`PriorityQueue` whose values to add.
+        """
+        # Offset the other queue's sequence numbers past ours, which keeps
+        # their relative order without sorting.
+        base = next(self._counter)
+        entries = [[(key[0], base + key[1]), value, 0] for key, value, _ in other._heap]
+        if entries:
+            self._counter = _itertools.count(max(entry[_KEY][1] for entry in entries) + 1)
+        self._append_all(entries)
+
+    def pop_many(self, k):
+        """Remove and return the k most urgent values, most urgent first.
+
+        If there are fewer than k values, remove and return all of them.
+
+        :param k: The number of values to remove.
+        :returns: A list of the removed values.
+        """
+        k = min(k, len(self._heap))
+        if k * 2 < len(self._heap):
+            return [self.dequeue() for _ in range(k)]
+        # When removing most of the heap, sort once and rebuild the rest.
+        ordered = sorted(self._heap, key=lambda entry: entry[_KEY])
+        removed, kept = ordered[:k], ordered[k:]
+        for entry in removed:
+            self._unindex(entry)
+        # A sorted list is already a heap.
+        for pos, entry in enumerate(kept):
+            entry[_POS] = pos
+        self._heap = kept
+        return [entry[_VALUE] for entry in removed]
+
+    def nsmallest(self, k):
+        """Return the k most urgent (priority, value) pairs, most urgent first, without removing them.
+
+        :param k: The number of pairs to return.
+        :returns: A list of at most k (priority, value) pairs.
+        """
+        return [(entry[_KEY][0], entry[_VALUE])
+                for entry in _heapq.nsmallest(k, self._heap, key=lambda entry: entry[_KEY])]
+
+    def drain(self):
+        """Remove and yield every value in this priority queue, most urgent first.
+
+        Values added while draining are yielded in priority order as well.
+
+        Usage::
+
+            for task in pq.drain():
+                do(task)
+            print(len(pq))  # => 0
+        """
+        while self._heap:
+            yield self.dequeue()
 
     def back(self):
         raise NotImplementedError
 
     def change_priority(self, value, new_priority):
-        raise NotImplementerError
+        """Change the priority of a value already in this priority queue.
+
+        The new priority may be either more or less urgent than the old one. If
+        the value appears more than once, only the oldest copy is changed.
+
+        :param value: The value whose priority to change.
+        :param new_priority: The new priority for the value.
+        :raises KeyError: If the value is not in this priority queue.
+        """
+        entry = self._find(value)
+        old_key = entry[_KEY]
+        # Keep the original sequence number, so ties still resolve in the order of addition.
+        entry[_KEY] = (new_priority, old_key[1])
+        if entry[_KEY] < old_key:
+            self._sift_up(entry[_POS])
+        else:
+            self._sift_down(entry[_POS])
 
     def clear(self):
         self._heap = []
+        self._entries = {}
+
+    def remove(self, value=_MISSING):
+        """Remove and return a value from this priority queue.
 
-    def remove(self):
-        top = _heapq.heappop(self._heap)
-        return top[1]
+        With no arguments, remove the most urgent value, exactly like
+        :meth:`dequeue`. Otherwise, remove the (oldest copy of the) given value.
+
+        :param value: The value to remove, if any.
+        :returns: The removed value.
+        :raises KeyError: If the given value is not in this priority queue.
+        :raises IndexError: If this priority queue is empty.
+        """
+        if value is _MISSING:
+            return self.dequeue()
+        entry = self._find(value)
+        self._remove_entry(entry)
+        return entry[_VALUE]
+
+    def dequeue(self):
+        """Remove and return the most urgent value from this priority queue."""
+        if not self._heap:
+            raise IndexError('dequeue from an empty priority queue')
+        top = self._heap[0]
+        self._remove_entry(top)
+        return top[_VALUE]
 
     def front(self):
         raise NotImplementedError
@@ -41,27 +304,33 @@ class PriorityQueue(object):
     def __len__(self):
         return len(self._heap)
 
+    def __contains__(self, value):
+        try:
+            self._find(value)
+        except KeyError:
+            return False
+        return True
+
+    def _ordered(self):
+        """Return the (priority, value) pairs in the order they would be dequeued."""
+        return [(entry[_KEY][0], entry[_VALUE]) for entry in sorted(self._heap, key=lambda entry: entry[_KEY])]
+
     def __eq__(self, other):
-        return self._heap == other._heap
+        return self._ordered() == other._ordered()
 
     def peek(self):
         top = self._heap[0]
-        return top
+        return top[_KEY][0], top[_VALUE]
 
     def peek_value(self):
         top = self._heap[0]
-        return top[1]
+        return top[_VALUE]
 
     def peek_priority(self):
         top = self._heap[0]
-        return top[0]
+        return top[_KEY][0]
 
     enqueue = add
-    dequeue = remove
 
     def __str__(self):
         pass
-
-
-
-
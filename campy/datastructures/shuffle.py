@@ -1,5 +1,18 @@
-"""Shuffle an immutable collection and return a copy of the collection."""
-import random
+"""Shuffle an immutable collection and return a copy of the collection.
+
+To visit the elements of a large collection in a random order without copying
+it, use :func:`shuffled_iter`, which yields elements lazily::
+
+    for index in shuffled_iter(range(100000000), random=RandomGenerator(seed=106)):
+        ...
+"""
+import collections.abc as _collections_abc
+import random as _random
+
+# Multiplier for the Feistel round function: 2**64 divided by the golden ratio.
+_GOLDEN = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+_ROUNDS = 6
 
 def shuffle(collection, random=None):
     """Return a randomly shuffled copy of a collection.
@@ -7,11 +20,84 @@ def shuffle(collection, random=None):
     Note that this function's behavior depends on the type of its input.
 
     If collection represents an infinite iterable, this will loop indefinitely.
+
+    :param collection: The collection to shuffle.
+    :param random: A random number generator, like a :class:`random.Random`. Defaults to the random module.
     """
+    rng = random if random is not None else _random
     elements = list(collection)  # Consume all elements.
-    random.shuffle(elements, random=random)
+    rng.shuffle(elements)
     if isinstance(collection, str):
         return ''.join(elements)
     return collection.__class__(elements)
 
-__all__ = ['shuffle']
+def shuffled_iter(collection, random=None, buffer_size=1024):
+    """Lazily yield the elements of a collection in a random order.
+
+    For a sequence (like a list, string, or range), elements are yielded in the
+    order of a pseudorandom permutation of its indices, which is computed on
+    the fly, so only constant memory is used no matter how long the sequence
+    is. Every element is yielded exactly once, though (as with any shuffle of a
+    large sequence) not every possible order is equally likely.
+
+    Any other iterable is treated as a stream, and shuffled through a buffer of
+    buffer_size elements: as each new element arrives, a random element from
+    the buffer is yielded to make room for it. Elements can only move about
+    buffer_size positions earlier, so for a thorough shuffle of a stream, use a
+    buffer as large as you can afford.
+
+    Usage::
+
+        rng = RandomGenerator(seed=106)
+        print(list(shuffled_iter('abcde', random=rng)))  # The same order for the same seed.
+
+    :param collection: The sequence or iterable to shuffle.
+    :param random: A random number generator, like a :class:`random.Random`. Defaults to the random module.
+    :param buffer_size: The number of elements to buffer when shuffling a stream.
+    """
+    rng = random if random is not None else _random
+    if isinstance(collection, _collections_abc.Sequence):
+        return (collection[index] for index in _permuted_indices(len(collection), rng))
+    return _buffered_shuffle(iter(collection), rng, buffer_size)
+
+def _permuted_indices(n, rng):
+    """Yield range(n) in a pseudorandom order, using a Feistel network with cycle walking."""
+    if n <= 1:
+        yield from range(n)
+        return
+    # A Feistel network permutes the integers of 2 * half bits. Values that
+    # land outside of range(n) are permuted again until they land inside it;
+    # since the domain is less than 4n, that takes fewer than 4 tries on average.
+    half = max(((n - 1).bit_length() + 1) // 2, 1)
+    if half > 64:
+        raise ValueError('shuffled_iter: sequence is too long to shuffle lazily')
+    mask = (1 << half) - 1
+    shift = 64 - half
+    keys = [rng.getrandbits(64) for _ in range(_ROUNDS)]
+    for index in range(n):
+        value = index
+        while True:
+            left, right = value >> half, value & mask
+            for key in keys:
+                left, right = right, left ^ ((((right ^ key) * _GOLDEN) & _MASK64) >> shift)
+            value = (left << half) | right
+            if value < n:
+                break
+        yield value
+
+def _buffered_shuffle(iterator, rng, buffer_size):
+    """Shuffle a stream through a bounded buffer."""
+    if buffer_size < 1:
+        raise ValueError('shuffled_iter: buffer_size must be positive, not {}'.format(buffer_size))
+    buffer = []
+    for element in iterator:
+        if len(buffer) < buffer_size:
+            buffer.append(element)
+            continue
+        index = rng.randrange(buffer_size)
+        yield buffer[index]
+        buffer[index] = element
+    rng.shuffle(buffer)
+    yield from buffer
+
+__all__ = ['shuffle', 'shuffled_iter']
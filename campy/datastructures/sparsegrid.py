@@ -1,84 +1,162 @@
+"""This file exports a :class:`SparseGrid` class, a two-dimensional array in which most cells are empty.
+
+A :class:`SparseGrid` has a fixed number of rows and columns, like a
+:class:`~campy.datastructures.grid.Grid`, but only stores the cells that have
+been set. Every other cell holds the grid's default value::
+
+    grid = SparseGrid(1000000, 1000000, value=0)
+    grid[3, 4] = 5
+    print(grid[3, 4], grid[5, 6], len(grid))  # => 5 0 1
+
+Iterating over a sparse grid, taking its length, and comparing it to another
+grid all take time proportional to the number of stored cells, not the size of
+the grid.
+"""
+import campy.datastructures.grid as _grid
+
 import collections as _collections
 import functools as _functools
 
 @_functools.total_ordering
 class SparseGrid(_collections.abc.MutableMapping):
     def __init__(self, rows=0, cols=0, value=None):
+        """Create a new sparse grid with the given number of rows and columns.
+
+        Every cell that hasn't been set holds value.
+
+        :param rows: The number of rows in the grid.
+        :param cols: The number of columns in the grid.
+        :param value: The default value of every cell.
+        """
         self.rows = rows
         self.cols = cols
-        self._elements = _collections.defaultdict(dict)
-        if value is not None:  # Even if user supplies an empty string, we want to fill
-            self.fill(value)
+        self.default = value
+        # Maps (row, col) to the value in every cell that has been set.
+        self._cells = {}
 
     @classmethod
-    def from_2d_iterable(cls):
-        pass
+    def from_2d_iterable(cls, rows, value=None):
+        """Create a sparse grid from an iterable of rows.
+
+        Only the cells that differ from value are stored. The grid is as wide
+        as its longest row.
+
+        Usage::
+
+            grid = SparseGrid.from_2d_iterable([[0, 0, 1], [0, 2, 0]], value=0)
+            print(len(grid))  # => 2
+
+        :param rows: An iterable of iterables of cell values.
+        :param value: The default value of every cell.
+        :returns: A new :class:`SparseGrid`.
+        """
+        grid = cls(value=value)
+        cells = grid._cells
+        num_rows = num_cols = 0
+        for row, values in enumerate(rows):
+            num_rows += 1
+            col = -1
+            for col, cell in enumerate(values):
+                if cell != value:
+                    cells[row, col] = cell
+            num_cols = max(num_cols, col + 1)
+        grid.rows = num_rows
+        grid.cols = num_cols
+        return grid
 
-    def resize():
-        pass
+    @classmethod
+    def from_grid(cls, grid, value=None):
+        """Create a sparse grid holding the cells of a :class:`Grid` that differ from value."""
+        return cls.from_2d_iterable(grid, value=value)
+
+    def to_dense(self):
+        """Return a new :class:`Grid` with the same contents as this sparse grid."""
+        dense = _grid.Grid(self.rows, self.cols, value=self.default)
+        for (row, col), value in self._cells.items():
+            dense.set(row, col, value)
+        return dense
+
+    def _key(self, key):
+        """Validate a (row, col) key and return it as a tuple."""
+        if not isinstance(key, tuple):
+            raise TypeError('SparseGrid: expected a (row, col) key, not {!r}'.format(key))
+        row, col = key
+        self.check_indexes(row, col)
+        return row, col
 
     def __getitem__(self, key):
         if isinstance(key, tuple):
             # Invoked like grid[row, col]
-            row, col = key
-            self.check_indexes(row, col);
-            if row not in self._elements:
-                raise KeyError(key)
-            if col not in self._elements[row]:
-                raise KeyError(key)
-            return self._elements[row][col]
+            return self._cells.get(self._key(key), self.default)
         else:
             # Invoked like grid[row][col]
-            if key not in self._elements:
-                raise KeyError(key)
-            return self._elements[key]
+            if not 0 <= key < self.rows:
+                raise IndexError('SparseGrid: row {} is outside of valid range'.format(key))
+            return _SparseRow(self, key)
 
     def __setitem__(self, key, value):
-        # If invoked as grid[row][val], the first grid[row] will be use __getitem__, and then the latter is a usual dictionary lookup
-        if not isinstance(key, tuple):
-            error('Invalid key.')
-        row, col = key
-        self.check_indexes(row, col);
-        self._elements[row][col] = value
+        # If invoked as grid[row][col], the first grid[row] will use __getitem__ to get a row view.
+        self._cells[self._key(key)] = value
 
     def __delitem__(self, key):
-        if not isinstance(key, tuple):
-            error('Invalid key.')
-        self.check_indexes(row, col);
-        del self._elements[row][col]
+        """Reset a cell to the default value."""
+        del self._cells[self._key(key)]
+
+    def __contains__(self, key):
+        """Return whether a cell has been set."""
+        return key in self._cells
 
     def __iter__(self):
-        for row in range(self.num_rows):
-            for col in range(self.num_cols):
-                if (row, col) in self:
-                    yield self[row, col]
+        """Iterate over the (row, col) locations of every cell that has been set."""
+        return iter(self._cells)
 
     def __len__(self):
-        return sum(len(row) for row in self._elements)
+        """Return the number of cells that have been set."""
+        return len(self._cells)
+
+    def items(self):
+        return self._cells.items()
+
+    def keys(self):
+        return self._cells.keys()
+
+    def values(self):
+        return self._cells.values()
 
     def check_indexes(self, row, col):
         if not self.in_bounds(row, col):
-            error('SparseGrid: ({}, {}) is outside of valid range'.format(row, col)) # TODO: better errors
+            raise IndexError('SparseGrid: ({}, {}) is outside of valid range'.format(row, col))
 
     def in_bounds(self, row, col):
-        return 0 <= row < self.num_rows and 0 <= col < self.num_cols
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def bounding_box(self):
+        """Return the smallest (min_row, min_col, max_row, max_col) containing every set cell.
+
+        The bounds are inclusive. If no cells are set, return None.
+        """
+        if not self._cells:
+            return None
+        rows = [row for row, _ in self._cells]
+        cols = [col for _, col in self._cells]
+        return min(rows), min(cols), max(rows), max(cols)
 
     def fill(self, value):
         # Optimization: Instead of filling the whole grid
-        # (and thus populating a huge number of cells, fill by
+        # (and thus populating a huge number of cells), fill by
         # clearing the existing elements and setting a new default
-        # value!)
-        self._elements.clear()
-        # TODO(sredmond): If value is mutable, all copies will share
+        # value!
+        # TODO(sredmond): If value is mutable, all cells will share
         # the same reference. This might be bad for students.
-        # Consider forcing this to be filled with a 0-arg callable.
-        self._elements.default_factory = lambda: value
-        for row in range(self.num_rows):
-            for col in range(self.num_cols):
-                self[row, col] = value
+        self._cells.clear()
+        self.default = value
 
-    def resize(self, ):
-        pass
+    def resize(self, rows, cols):
+        """Change the size of this grid, keeping the set cells that are still in bounds."""
+        self.rows = rows
+        self.cols = cols
+        self._cells = {(row, col): value for (row, col), value in self._cells.items()
+                       if row < rows and col < cols}
 
     def __le__(self, other):
         rows = max(self.height, other.height)
@@ -88,18 +166,14 @@ class SparseGrid(_collections.abc.MutableMapping):
     def __eq__(self, other):
         # optimization: if literally same grid, stop
         if self is other: return True
-        if self.num_rows != other.num_rows or self.num_cols != other.num_cols: return False
-        for row in range(self.num_rows):
-            for col in range(self.num_cols):
-                if (row, col) in self:
-                    # I have data there; she must, too, and it must be the same data
-                    if (row, col) not in other or self[row, col] != other[row, col]:
-                        return False
-                else:
-                    # I don't have data there; she must also not have it there
-                    if (row, col) in other:
-                        return False
-        return True
+        if not isinstance(other, SparseGrid): return NotImplemented
+        if self.rows != other.rows or self.cols != other.cols: return False
+        if self.default != other.default and (len(self) < self.rows * self.cols or len(other) < other.rows * other.cols):
+            # Some cell holds the default value in one grid, so compare every cell.
+            return all(self[row, col] == other[row, col] for row in range(self.rows) for col in range(self.cols))
+        # Otherwise, the grids can only differ where one of them has set a cell.
+        return all(self[key] == other[key] for key in self._cells) and \
+            all(self[key] == other[key] for key in other._cells if key not in self._cells)
 
     def __str__(self):
         pass
@@ -118,9 +192,42 @@ class SparseGrid(_collections.abc.MutableMapping):
 
     # Alternate names for cols and rows.
     @property
-    def width():
+    def width(self):
         return self.cols
 
     @property
-    def height():
+    def height(self):
+        return self.rows
+
+    @property
+    def num_rows(self):
         return self.rows
+
+    @property
+    def num_cols(self):
+        return self.cols
+
+
+class _SparseRow:
+    """A view of a single row of a :class:`SparseGrid`, so that grid[row][col] works."""
+    __slots__ = ('_grid', '_row')
+
+    def __init__(self, grid, row):
+        self._grid = grid
+        self._row = row
+
+    def __len__(self):
+        return self._grid.cols
+
+    def __getitem__(self, col):
+        return self._grid[self._row, col]
+
+    def __setitem__(self, col, value):
+        self._grid[self._row, col] = value
+
+    def __delitem__(self, col):
+        del self._grid[self._row, col]
+
+    def __iter__(self):
+        for col in range(self._grid.cols):
+            yield self._grid[self._row, col]
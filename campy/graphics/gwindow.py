@@ -1,5 +1,6 @@
 """Provide a :class:`GWindow` that supports drawing graphical objects on screen."""
 from collections import namedtuple as _nt
+import contextlib as _contextlib
 import enum as _enum
 import math
 
@@ -507,6 +508,32 @@ class GWindow:
                 return gobj
         return None
 
+    @_contextlib.contextmanager
+    def batch(self):
+        """Defer redrawing this GWindow until the end of a block of updates.
+
+        Normally, every change to a :class:`GObject` on screen is drawn right
+        away. When animating many objects at once, it's much faster to make all
+        of the changes first and then redraw the window a single time.
+
+        To move many objects, but only redraw once::
+
+            window = GWindow()
+            with window.batch():
+                for ball in balls:
+                    ball.move(ball.dx, ball.dy)
+            pause(20)
+
+        Batches can be nested, in which case the window is only redrawn at the
+        end of the outermost batch. Pausing also redraws the window, even in
+        the middle of a batch.
+        """
+        _platform.Platform().gwindow_begin_batch(self)
+        try:
+            yield self
+        finally:
+            _platform.Platform().gwindow_end_batch(self)
+
     def _request_focus(self):
         """Ask the OS to assign keyboard focus to this GWindow.
 
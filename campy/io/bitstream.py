@@ -26,6 +26,21 @@ member functions writeBit and size.
 Note: in keeping with the naming conventions of the Python standard library,
 readBit and writeBit have been renamed as readbit and writebit
 
+Bits are buffered in an accumulator, and bytes only move to or from the
+underlying stream in large chunks, so reading and writing many bits at once
+with readbits and writebits is fast::
+
+    with ofbitstream(filename) as stream:
+        stream.writebits(0b101, 3)  # Writes 1, 0, 1.
+        stream.write_code((0b11, 2))  # Writes a (code, length) pair from a code table.
+
+    with ifbitstream(filename) as stream:
+        print(stream.readbits(5))  # => 23, which is 0b10111
+
+Reading or writing bytes (or seeking) in the middle of a byte skips to the
+start of the next byte, as it always has. For input streams, this requires a
+seekable stream.
+
 Additionally, str() in ibitstream has been removed (doesn't make much sense anyway)
 and for consistency with the standard library str in obitstream has been renamed getvalue()
 
@@ -78,6 +93,11 @@ NOT_A_CHAR = 257;
 
 NUM_BITS_IN_BYTE = 8
 
+# How many bytes to move to or from the underlying stream at once.
+_CHUNK_SIZE = 1 << 16
+# How many bits an output accumulator collects before moving them to the pending bytes.
+_ACCUMULATOR_BITS = 64
+
 def get_nth_bit(pos, byte):
     return (byte >> (NUM_BITS_IN_BYTE - 1 - pos)) & 1
 
@@ -88,31 +108,84 @@ class ibitstream(_io.BufferedReader):
     def __init__(self, raw, buffer_size=_io.DEFAULT_BUFFER_SIZE):
         super().__init__(raw, buffer_size)
         self._fake = False
-        self.pos = NUM_BITS_IN_BYTE
-        self.current_byte = 0
-        self.last_tell = 0
+        # Bytes read ahead from the underlying stream, and how many have been used.
+        self._chunk = b''
+        self._chunk_pos = 0
+        # The low self._nbits bits of self._acc are the next bits to read, most significant first.
+        self._acc = 0
+        self._nbits = 0
+
+    def _fill(self, n):
+        """Try to have at least n bits in the accumulator."""
+        while self._nbits < n:
+            if self._chunk_pos >= len(self._chunk):
+                self._chunk = super().read(_CHUNK_SIZE)
+                self._chunk_pos = 0
+                if not self._chunk:  # EOS
+                    return
+            take = max((n - self._nbits + 7) >> 3, 8)
+            piece = self._chunk[self._chunk_pos:self._chunk_pos + take]
+            self._chunk_pos += len(piece)
+            self._acc = ((self._acc & ((1 << self._nbits) - 1)) << (8 * len(piece))) | int.from_bytes(piece, 'big')
+            self._nbits += 8 * len(piece)
+
+    def _unread_bytes(self):
+        """Return how many bytes have been read ahead from the underlying stream, but not used."""
+        return len(self._chunk) - self._chunk_pos + self._nbits // NUM_BITS_IN_BYTE
+
+    def _sync(self):
+        """Move the underlying stream back to the first byte that hasn't been (even partly) read as bits."""
+        if self._chunk or self._nbits:
+            unread = self._unread_bytes()
+            self._chunk = b''
+            self._chunk_pos = 0
+            self._acc = 0
+            self._nbits = 0
+            if unread:
+                super().seek(-unread, _io.SEEK_CUR)
 
     def readbit(self):
         if self.closed:
             raise ValueError("ibitstream.readbit: Cannot read a bit from a stream that is not open.")
         if self._fake:  # Fake mode is used for autograding, and reads bytes as if they were bits
-            bit = read(1)
-            if bit == 0 or bit == ord('0'):
+            bit = self.read(1)
+            if not bit:
+                return PSEUDO_EOF
+            if bit == b'\x00' or bit == b'0':
                 return 0
             else:
                 return 1
-        else:
-            # We consumed a whole byte, or the stream changed under us
-            if self.pos == NUM_BITS_IN_BYTE or self.last_tell != self.tell():
-                self.current_byte = self.read(1)
-                if not self.current_byte:  # EOS
-                    return PSEUDO_EOF
-                self.current_byte = ord(self.current_byte)
-                self.pos = 0
-                self.last_tell = self.tell()
-            result = get_nth_bit(self.pos, self.current_byte)
-            self.pos += 1
-            return result
+        if not self._nbits:
+            self._fill(1)
+            if not self._nbits:  # EOS
+                return PSEUDO_EOF
+        self._nbits -= 1
+        return (self._acc >> self._nbits) & 1
+
+    def readbits(self, n):
+        """Read n bits, and return them as an integer, most significant bit first.
+
+        :param n: The number of bits to read.
+        :raises EOFError: If fewer than n bits remain. No bits are consumed.
+        """
+        if self.closed:
+            raise ValueError("ibitstream.readbits: Cannot read bits from a stream that is not open.")
+        if n < 0:
+            raise ValueError("ibitstream.readbits: Cannot read a negative number of bits.")
+        if self._fake:
+            value = 0
+            for _ in range(n):
+                bit = self.readbit()
+                if bit == PSEUDO_EOF:
+                    raise EOFError("ibitstream.readbits: Reached end of stream.")
+                value = (value << 1) | bit
+            return value
+        if self._nbits < n:
+            self._fill(n)
+            if self._nbits < n:
+                raise EOFError("ibitstream.readbits: Only {} bits remain, but {} were requested.".format(self._nbits, n))
+        self._nbits -= n
+        return (self._acc >> self._nbits) & ((1 << n) - 1)
 
     def rewind(self):
         if not self.seekable():
@@ -120,22 +193,83 @@ class ibitstream(_io.BufferedReader):
         return self.seek(0) == 0
 
     def size(self):
-        cur = self.tell()
-        self.seek(0, _io.SEEK_END)
-        end = self.tell()
-        self.seek(cur, _io.SEEK_SET)
+        cur = super().tell()
+        end = super().seek(0, _io.SEEK_END)
+        super().seek(cur, _io.SEEK_SET)
         return end * NUM_BITS_IN_BYTE
 
+    # Byte-level operations first give back any bytes read ahead for bits.
+    def read(self, size=-1):
+        self._sync()
+        return super().read(size)
+
+    def read1(self, size=-1):
+        self._sync()
+        return super().read1(size)
+
+    def readinto(self, b):
+        self._sync()
+        return super().readinto(b)
+
+    def readline(self, size=-1):
+        self._sync()
+        return super().readline(size)
+
+    def peek(self, size=0):
+        self._sync()
+        return super().peek(size)
+
+    def seek(self, offset, whence=_io.SEEK_SET):
+        self._sync()
+        return super().seek(offset, whence)
+
+    def tell(self):
+        return super().tell() - self._unread_bytes()
+
 
 class obitstream(_io.BufferedWriter):
     def __init__(self, raw, buffer_size=_io.DEFAULT_BUFFER_SIZE, always_flush=True):
+        """Create an output bitstream.
+
+        always_flush is kept for compatibility. Bits are no longer flushed one
+        at a time, but only when a chunk fills up, on flush(), and on close().
+        """
         super().__init__(raw, buffer_size)
         self._fake = False
-        self.pos = NUM_BITS_IN_BYTE
-        self.current_byte = 0
-        self.last_tell = 0
+        # The low self._nbits bits of self._acc are bits that haven't been written yet.
+        self._acc = 0
+        self._nbits = 0
+        # Whole bytes that haven't been written to the underlying stream yet.
+        self._pending = bytearray()
         self.always_flush = always_flush
 
+    def _spill(self):
+        """Move the whole bytes from the accumulator into the pending bytes."""
+        whole, rest = self._nbits >> 3, self._nbits & 7
+        self._pending += (self._acc >> rest).to_bytes(whole, 'big')
+        self._acc &= (1 << rest) - 1
+        self._nbits = rest
+        if len(self._pending) >= _CHUNK_SIZE:
+            super().write(self._pending)
+            self._pending.clear()
+
+    def _drain(self, finish_byte=False):
+        """Write the pending bytes, and, if finish_byte, a partly written byte padded with 0s."""
+        self._spill()
+        if finish_byte and self._nbits:
+            self._pending.append((self._acc << (NUM_BITS_IN_BYTE - self._nbits)) & 0xFF)
+            self._acc = 0
+            self._nbits = 0
+        if self._pending:
+            super().write(self._pending)
+            self._pending.clear()
+
+    def _partial_byte(self):
+        """Return the partly written byte, padded with 0s, if any."""
+        if not self._nbits:
+            return b''
+        return bytes([(self._acc << (NUM_BITS_IN_BYTE - self._nbits)) & 0xFF])
+
     def writebit(self, bit):
         if bit not in (0, 1):
             raise ValueError("obitstream.writebit: must pass an integer argument of 0 or 1. You passed the integer {}".format(bit))
@@ -145,29 +279,71 @@ class obitstream(_io.BufferedWriter):
             self.write(b'0' if bit == 0 else b'1')
             if self.always_flush:
                 self.flush()
+            return
+        self._acc = (self._acc << 1) | bit
+        self._nbits += 1
+        if self._nbits >= _ACCUMULATOR_BITS:
+            self._spill()
+
+    def writebits(self, value, n):
+        """Write the n low bits of value, most significant bit first.
+
+        :param value: A nonnegative integer less than 2 ** n.
+        :param n: The number of bits to write.
+        """
+        if n < 0 or value < 0 or value >> n:
+            raise ValueError("obitstream.writebits: {} does not fit in {} bits.".format(value, n))
+        if self.closed:
+            raise ValueError("obitstream.writebits: Cannot write bits to a stream that is not open.")
+        if self._fake:
+            for shift in reversed(range(n)):
+                self.writebit((value >> shift) & 1)
+            return
+        self._acc = (self._acc << n) | value
+        self._nbits += n
+        if self._nbits >= _ACCUMULATOR_BITS:
+            self._spill()
+
+    def write_code(self, code):
+        """Write one entry of a code table.
+
+        :param code: Either a (value, length) pair, as for :meth:`writebits`, or a string of '0's and '1's.
+        """
+        if isinstance(code, str):
+            if code:
+                self.writebits(int(code, 2), len(code))
         else:
-            # We wrote a whole byte, or the stream changed under us
-            if self.pos == NUM_BITS_IN_BYTE or self.last_tell != self.tell():
-                self.current_byte = 0
-                self.pos = 0
-            if bit:
-                self.current_byte = set_nth_bit(self.pos, self.current_byte)
-            if self.pos == 0 or bit:  # Write the first bit, or a change from 0 to 1
-                if self.pos:
-                    self.seek(-1, _io.SEEK_CUR)
-                self.write(bytes([self.current_byte]))
-                if self.always_flush:
-                    self.flush()
-
-            self.pos += 1
-            self.last_tell = self.tell()
+            self.writebits(*code)
 
     def size(self):
-        cur = self.tell()
-        self.seek(0, _io.SEEK_END)
-        end = self.tell()
-        self.seek(cur, _io.SEEK_SET)
-        return end * NUM_BITS_IN_BYTE
+        self.flush()
+        cur = super().tell()
+        end = super().seek(0, _io.SEEK_END)
+        super().seek(cur, _io.SEEK_SET)
+        return (end + len(self._partial_byte())) * NUM_BITS_IN_BYTE
+
+    def flush(self):
+        # A partly written byte stays in the accumulator, so that later bits can complete it.
+        if not self.closed:
+            self._drain()
+        super().flush()
+
+    def close(self):
+        if not self.closed:
+            self._drain(finish_byte=True)
+        super().close()
+
+    # Byte-level operations first finish any partly written byte.
+    def write(self, b):
+        self._drain(finish_byte=True)
+        return super().write(b)
+
+    def seek(self, offset, whence=_io.SEEK_SET):
+        self._drain(finish_byte=True)
+        return super().seek(offset, whence)
+
+    def tell(self):
+        return super().tell() + len(self._pending) + (self._nbits + 7) // NUM_BITS_IN_BYTE
 
 class ifbitstream(ibitstream):
     def __init__(self, filename):
@@ -187,6 +363,7 @@ class istringbitstream(ibitstream):
         super().__init__(self.stream)
 
     def setvalue(self, string):
+        self._sync()
         view = self.stream.getbuffer()
         view[:] = string
 
@@ -197,6 +374,7 @@ class ostringbitstream(obitstream):
         super().__init__(self.stream)
 
     def getvalue(self):
-        return self.stream.getvalue()
+        self.flush()
+        return self.stream.getvalue() + self._partial_byte()
 
 __all__ = ['ibitstream', 'obitstream', 'ifbitstream', 'ofbitstream', 'istringbitstream', 'ostringbitstream']
@@ -25,18 +25,96 @@ pathlib library. The compatability is listed here::
         return os.remove(path)
 
 TODO more
+
+To find files in a large tree, :func:`walk_directory` scans directories
+iteratively with :func:`os.scandir`, and can scan many directories at once
+on a pool of threads, which helps most on slow or network file systems::
+
+    for path in walk_directory('assets', '*.png', workers=8):
+        print(path)
 """
 from pathlib import Path as _Path, PurePath as _PurePath
-import campy.private.platform as _platform
+import concurrent.futures as _futures
+import functools as _functools
+import os as _os
+import re as _re
+import time as _time
+
+# How long, in seconds, find_on_path remembers a lookup, and how many lookups it remembers.
+_FIND_CACHE_TTL = 2.0
+_FIND_CACHE_SIZE = 256
+
+# Maps (search directories, filename) to (expiry time, found path).
+_find_cache = {}
 
 def expand_pathname(path):
-    pass
+    """Expand a pathname into the canonical form for this platform.
+
+    A leading ~ or ~user is replaced by the home directory, and both forward
+    and backward slashes become this platform's directory separator.
+
+    :param path: The pathname to expand.
+    :returns: The expanded pathname.
+    """
+    if not path:
+        return ''
+    path = _os.path.expanduser(path)
+    for separator in ('/', '\\'):
+        if separator != _os.sep:
+            path = path.replace(separator, _os.sep)
+    return path
 
 def file_exists(path):
     pass
 
-def find_on_path(path, filename):
-    pass
+def find_on_path(path, filename, cache=True):
+    """Return the pathname of the first file with a given name in a search path.
+
+    The search path is a string of directories separated by colons (Unix or
+    Mac OS) or semicolons (Windows), or a list of directories. Each directory
+    is prepended to the filename in turn, unless the filename is absolute.
+
+    Successful lookups of the same filename on the same search path are
+    remembered for a couple of seconds, so that a program can look up the
+    same files many times without touching every directory on the path. A
+    remembered pathname is checked to still be a file before it is returned.
+
+    Usage::
+
+        find_on_path('images:~/shared/images', 'logo.png')  # => 'images/logo.png'
+
+    :param path: The search path.
+    :param filename: The name of the file to find.
+    :param cache: Whether to use (and remember) recent lookups.
+    :returns: The pathname of the file, or None if it is not on the search path.
+    """
+    directories = tuple(_split_path(path))
+    key = (directories, filename)
+    if cache:
+        entry = _find_cache.get(key)
+        if entry is not None:
+            expiry, found = entry
+            if _time.monotonic() < expiry and _os.path.isfile(found):
+                return found
+    found = None
+    filename = expand_pathname(filename)
+    if _os.path.isabs(filename):
+        if _os.path.isfile(filename):
+            found = filename
+    else:
+        for directory in directories:
+            pathname = _os.path.join(expand_pathname(directory), filename)
+            if _os.path.isfile(pathname):
+                found = pathname
+                break
+    if cache:
+        _find_cache.pop(key, None)
+        # Misses aren't remembered, so that a file is found as soon as it's created.
+        if found is not None:
+            if len(_find_cache) >= _FIND_CACHE_SIZE:
+                del _find_cache[next(iter(_find_cache))]  # Forget the oldest lookup.
+            _find_cache[key] = (_time.monotonic() + _FIND_CACHE_TTL, found)
+    return found
 
 def get_current_directory():
     pass
@@ -71,11 +149,49 @@ def is_file(path):
 def is_symbolic_link(path):
     pass
 
-def list_directory(path):
-    pass
+def list_directory(path, pattern=None):
+    """Return an alphabetized list of the names of the files in a directory.
 
-def match_filename_pattern(path):
-    pass
+    The list excludes the . and .. entries.
+
+    :param path: The directory to list.
+    :param pattern: If given, only names matching this pattern (as in
+                    :func:`match_filename_pattern`) are listed.
+    :returns: The sorted list of names.
+    """
+    # Iterating over every entry closes the scandir iterator.
+    names = [entry.name for entry in _os.scandir(expand_pathname(path) or _os.curdir)]
+    if pattern is not None:
+        match = _compile_pattern(pattern)
+        names = [name for name in names if match(name)]
+    names.sort()
+    return names
+
+def match_filename_pattern(filename, pattern):
+    """Return whether a filename matches a pattern.
+
+    The pattern is interpreted in much the same way that a Unix shell expands
+    filenames, and supports the following wildcards:
+
+    - ? matches any single character.
+    - * matches any sequence of characters.
+    - [...] matches any of the characters listed.
+    - [^...] matches any character except the ones listed.
+
+    In the last two, a range of characters can be given like a-z. Patterns
+    are compiled once and remembered, so matching many names against the same
+    pattern is fast.
+
+    Usage::
+
+        match_filename_pattern('maze3.txt', 'maze[0-9].*')  # => True
+
+    :param filename: The filename to check.
+    :param pattern: The pattern to match against.
+    :returns: Whether the whole filename matches the pattern.
+    :raises ValueError: If a [ in the pattern is missing its ].
+    """
+    return _compile_pattern(pattern)(filename) is not None
 
 def open_file(path):
     pass
@@ -83,8 +199,18 @@ def open_file(path):
 def open_file_dialog(title):
     pass
 
-def open_on_path(path):
-    pass
+def open_on_path(path, filename, mode='r'):
+    """Open the first file with a given name in a search path.
+
+    :param path: The search path, as in :func:`find_on_path`.
+    :param filename: The name of the file to open.
+    :param mode: The mode to open the file in, as in :func:`open`.
+    :returns: The opened file, or None if it is not on the search path.
+    """
+    pathname = find_on_path(path, filename)
+    if pathname is None:
+        return None
+    return open(pathname, mode)
 
 def prompt_user_for_file(prompt="", reprompt=""):
     pass
@@ -101,10 +227,122 @@ def rewindStream(input):
 def set_current_directory(path):
     pass
 
+def walk_directory(path, pattern=None, workers=None):
+    """Yield the pathnames of the files in a directory and all of its subdirectories.
+
+    Directories are scanned iteratively, one level of the tree at a time, so
+    deep trees don't hit the recursion limit. Symbolic links to directories
+    aren't followed, and subdirectories that can't be read are skipped.
+
+    Scanning a directory waits on the file system, so for a large tree on a
+    slow disk or network drive, pass the number of threads to scan directories
+    with at once. Either way, pathnames are yielded in the same order: level
+    by level, with each directory's files in alphabetical order.
+
+    Usage::
+
+        sounds = list(walk_directory('assets', '*.wav', workers=8))
+
+    :param path: The directory to walk.
+    :param pattern: If given, only files whose names match this pattern (as in
+                    :func:`match_filename_pattern`) are yielded.
+    :param workers: The number of threads to scan directories with, or None to scan them one at a time.
+    :raises OSError: If the directory itself can't be read.
+    """
+    match = _compile_pattern(pattern) if pattern is not None else None
+    scan_directory = _functools.partial(_scan_directory, match=match)
+    files, level = scan_directory(expand_pathname(path) or _os.curdir, strict=True)
+    pool = _futures.ThreadPoolExecutor(max_workers=workers) if workers else None
+    try:
+        # Both map in order, so the pool doesn't change the order of the pathnames.
+        scan = pool.map if pool is not None else map
+        while True:
+            yield from files
+            if not level:
+                return
+            directories, files, level = level, [], []
+            for subfiles, subdirectories in scan(scan_directory, directories):
+                files.extend(subfiles)
+                level.extend(subdirectories)
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=False)
+
 def write_entire_file(path):
     pass
 
 
+def _split_path(path):
+    """Split a search path into its directories, dropping empty ones."""
+    if not isinstance(path, str):
+        return [directory for directory in path if directory]
+    return [directory for directory in path.split(_os.pathsep) if directory]
+
+@_functools.lru_cache(maxsize=128)
+def _compile_pattern(pattern):
+    """Translate a filename pattern into an expression, and return a function matching whole names against it."""
+    parts = []
+    index, length = 0, len(pattern)
+    while index < length:
+        ch = pattern[index]
+        index += 1
+        if ch == '*':
+            parts.append('.*')
+        elif ch == '?':
+            parts.append('.')
+        elif ch == '[':
+            end = pattern.find(']', index)
+            if end == -1:
+                raise ValueError('match_filename_pattern: missing ] in pattern {!r}'.format(pattern))
+            members = pattern[index:end]
+            index = end + 1
+            invert = members.startswith('^')
+            if invert:
+                members = members[1:]
+            items = []
+            position = 0
+            while position < len(members):
+                if position + 2 < len(members) and members[position + 1] == '-':
+                    items.append('{}-{}'.format(_re.escape(members[position]), _re.escape(members[position + 2])))
+                    position += 3
+                else:
+                    items.append(_re.escape(members[position]))
+                    position += 1
+            if items:
+                parts.append('[{}{}]'.format('^' if invert else '', ''.join(items)))
+            else:  # [] matches nothing, and [^] matches anything.
+                parts.append('.' if invert else '(?!)')
+        else:
+            parts.append(_re.escape(ch))
+    return _re.compile(''.join(parts), _re.DOTALL).fullmatch
+
+def _scan_directory(directory, match=None, strict=False):
+    """Scan one directory, returning the sorted pathnames of its matching files and of its subdirectories.
+
+    A directory that can't be read is treated as empty, unless strict.
+    """
+    files, subdirectories = [], []
+    try:
+        # Read every entry up front, which closes the scandir iterator.
+        entries = list(_os.scandir(directory))
+    except OSError:
+        if strict:
+            raise
+        entries = []
+    for entry in entries:
+        try:
+            is_directory = entry.is_dir(follow_symlinks=False)
+        except OSError:
+            is_directory = False
+        if is_directory:
+            subdirectories.append(entry.path)
+        elif match is None or match(entry.name):
+            files.append(entry.path)
+    files.sort()
+    subdirectories.sort()
+    return files, subdirectories
+
+
 # '''
 # This file exports a standardized set of tools for working with
 # files.  The library offers at least some portability across the
@@ -227,6 +465,7 @@ def open_file_dialog(title = "Open File", mode="load", path = "", binary=False):
   @param binary: open file in binary mode on windows
   @rtype: file
   '''
+  import campy.private.platform as _platform  # Starts the graphics backend, so only import it when needed.
   filename = _platform.Platform().openFileDialog(title, mode, path)
   if(filename == ""): return None
   return filename
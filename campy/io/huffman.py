@@ -0,0 +1,390 @@
+"""Compress and decompress data with Huffman coding.
+
+Each byte value is given a prefix-free code whose length depends on how often
+the byte appears, and the special PSEUDO_EOF symbol marks the end of the data.
+Codes are canonical, so only the length of each code needs to be stored in the
+header of the compressed data.
+
+To compress and decompress bytes in memory::
+
+    compressed = encode(b'abracadabra')
+    assert decode(compressed) == b'abracadabra'
+
+To compress and decompress files::
+
+    encode_file('mobydick.txt', 'mobydick.huf')
+    decode_file('mobydick.huf', 'mobydick.txt')
+
+The streaming interface writes to an :class:`~campy.io.bitstream.obitstream`
+and reads from an :class:`~campy.io.bitstream.ibitstream`. A
+:class:`HuffmanCode` can also be built up front and shared::
+
+    code = HuffmanCode.from_data(sample)
+    print(code.codes[ord('e')])  # => (code, length), which can be passed to obitstream.write_code
+    with ofbitstream('out.huf') as stream:
+        encode_stream(infile, stream, code=code)
+
+Decoding doesn't walk the tree one bit at a time. Instead, the next
+TABLE_BITS bits index a table of every symbol they completely encode, so each
+lookup decodes several symbols at once.
+
+Compressed data consists of the magic bytes b'CAMPYHF1', the number of
+symbols, a (symbol, code length) pair for each of them (all little-endian
+16-bit integers), and then the encoded symbols, ending with PSEUDO_EOF and
+padded with 0 bits to a whole byte.
+"""
+from campy.io.bitstream import PSEUDO_EOF, ifbitstream, ofbitstream, istringbitstream, ostringbitstream
+
+import collections as _collections
+import heapq as _heapq
+import io as _io
+import struct as _struct
+
+MAGIC = b'CAMPYHF1'
+_COUNT = _struct.Struct('<H')
+_ENTRY = _struct.Struct('<HH')
+
+# How many bits index the decoding table.
+TABLE_BITS = 12
+
+# How many bytes to read or encode at once.
+_CHUNK_SIZE = 1 << 16
+
+
+def count_frequencies(data, frequencies=None):
+    """Count how many times each byte value appears in some data.
+
+    :param data: A bytes-like object.
+    :param frequencies: A :class:`collections.Counter` to add to, for counting data in chunks.
+    :returns: A :class:`collections.Counter` mapping byte values to counts.
+    """
+    if frequencies is None:
+        frequencies = _collections.Counter()
+    view = memoryview(data).cast('B')
+    for start in range(0, len(view), _CHUNK_SIZE):
+        frequencies.update(view[start:start + _CHUNK_SIZE])
+    return frequencies
+
+
+def _code_lengths(frequencies):
+    """Return a dictionary mapping each symbol to the length of its Huffman code."""
+    lengths = {symbol: 0 for symbol, count in frequencies.items() if count}
+    if len(lengths) == 1:
+        # A lone symbol still needs a bit.
+        return {symbol: 1 for symbol in lengths}
+    # Each entry is (total count, tiebreaker, symbols in the subtree).
+    heap = [(frequencies[symbol], symbol, [symbol]) for symbol in sorted(lengths)]
+    _heapq.heapify(heap)
+    order = len(heap)
+    while len(heap) > 1:
+        count1, _, symbols1 = _heapq.heappop(heap)
+        count2, _, symbols2 = _heapq.heappop(heap)
+        # Joining two subtrees puts every symbol in them one level deeper.
+        for symbol in symbols1:
+            lengths[symbol] += 1
+        for symbol in symbols2:
+            lengths[symbol] += 1
+        symbols1.extend(symbols2)
+        _heapq.heappush(heap, (count1 + count2, order, symbols1))
+        order += 1
+    return lengths
+
+
+class HuffmanCode:
+    """A canonical Huffman code for the byte values and PSEUDO_EOF."""
+    def __init__(self, lengths):
+        """Create the canonical code with the given code lengths.
+
+        :param lengths: A mapping from each symbol to the length of its code.
+        """
+        if PSEUDO_EOF not in lengths:
+            raise ValueError('HuffmanCode: the code must include PSEUDO_EOF')
+        if any(not 0 <= symbol <= PSEUDO_EOF or length < 1 for symbol, length in lengths.items()):
+            raise ValueError('HuffmanCode: symbols must be byte values or PSEUDO_EOF, with positive code lengths')
+        self.lengths = dict(lengths)
+        self.max_length = max(self.lengths.values())
+        # Symbols in canonical order: by code length, then by symbol.
+        self._symbols = sorted(self.lengths, key=lambda symbol: (self.lengths[symbol], symbol))
+        self.codes = {}
+        # For each length, the first code of that length, and the index in self._symbols of its symbol.
+        self._first_code = [0] * (self.max_length + 2)
+        self._first_index = [0] * (self.max_length + 2)
+        code, length = 0, 0
+        for index, symbol in enumerate(self._symbols):
+            while length < self.lengths[symbol]:
+                code <<= 1
+                length += 1
+                self._first_code[length] = code
+                self._first_index[length] = index
+            self.codes[symbol] = (code, length)
+            code += 1
+        if code > 1 << length:
+            raise ValueError('HuffmanCode: the code lengths are too short to give a prefix-free code')
+        self._table = None
+
+    @classmethod
+    def from_frequencies(cls, frequencies):
+        """Build the optimal code for symbols with the given counts.
+
+        :param frequencies: A mapping from byte values to counts. PSEUDO_EOF is added automatically.
+        """
+        frequencies = dict(frequencies)
+        frequencies[PSEUDO_EOF] = 1
+        return cls(_code_lengths(frequencies))
+
+    @classmethod
+    def from_data(cls, data):
+        """Build the optimal code for a bytes-like object."""
+        return cls.from_frequencies(count_frequencies(data))
+
+    def __repr__(self):
+        return 'HuffmanCode({!r})'.format(self.lengths)
+
+    ##########
+    # Header #
+    ##########
+    def write_header(self, stream):
+        """Write this code's lengths to a binary stream, like an :class:`~campy.io.bitstream.obitstream`."""
+        entries = [_ENTRY.pack(symbol, self.lengths[symbol]) for symbol in self._symbols]
+        stream.write(MAGIC + _COUNT.pack(len(entries)) + b''.join(entries))
+
+    @classmethod
+    def read_header(cls, stream):
+        """Read a code written by :meth:`write_header` from a binary stream.
+
+        :raises ValueError: If the stream doesn't start with a valid header.
+        """
+        magic = stream.read(len(MAGIC))
+        if magic != MAGIC:
+            raise ValueError('HuffmanCode: not Huffman-encoded data (bad magic {!r})'.format(magic))
+        count, = _COUNT.unpack(_read_exactly(stream, _COUNT.size))
+        data = _read_exactly(stream, count * _ENTRY.size)
+        return cls(dict(_ENTRY.iter_unpack(data)))
+
+    ############
+    # Encoding #
+    ############
+    def encode_to(self, data, stream):
+        """Write the codes for a bytes-like object to an :class:`~campy.io.bitstream.obitstream`.
+
+        This doesn't write a header or PSEUDO_EOF, so it can be called on
+        successive chunks of data.
+
+        :raises ValueError: If the data has a byte value without a code.
+        """
+        # Encode a chunk at a time as a string of '0's and '1's, which is much faster than a bit at a time.
+        bits_of = [None] * 256
+        for symbol, (code, length) in self.codes.items():
+            if symbol < 256:
+                bits_of[symbol] = format(code, '0{}b'.format(length))
+        view = memoryview(data).cast('B')
+        for start in range(0, len(view), _CHUNK_SIZE):
+            try:
+                bits = ''.join(map(bits_of.__getitem__, view[start:start + _CHUNK_SIZE]))
+            except TypeError:
+                missing = next(byte for byte in view[start:start + _CHUNK_SIZE] if bits_of[byte] is None)
+                raise ValueError('HuffmanCode: byte value {} has no code'.format(missing)) from None
+            if bits:
+                stream.writebits(int(bits, 2), len(bits))
+
+    def encode_end(self, stream):
+        """Write PSEUDO_EOF to an :class:`~campy.io.bitstream.obitstream`."""
+        stream.write_code(self.codes[PSEUDO_EOF])
+
+    ############
+    # Decoding #
+    ############
+    def _decoding_table(self):
+        """Return the table mapping each TABLE_BITS-bit index to (decoded bytes, bits used, whether PSEUDO_EOF was reached).
+
+        An entry is None if the index doesn't start with a whole code.
+        """
+        if self._table is not None:
+            return self._table
+        size = 1 << TABLE_BITS
+        first = [None] * size  # The first symbol encoded by each index, and its code length.
+        for symbol, (code, length) in self.codes.items():
+            if length <= TABLE_BITS:
+                start = code << (TABLE_BITS - length)
+                first[start:start + (1 << (TABLE_BITS - length))] = [(symbol, length)] * (1 << (TABLE_BITS - length))
+        table = [None] * size
+        for index in range(size):
+            decoded = bytearray()
+            used = 0
+            done = False
+            while True:
+                entry = first[(index << used) & (size - 1)]
+                if entry is None or used + entry[1] > TABLE_BITS:
+                    break
+                symbol, length = entry
+                used += length
+                if symbol == PSEUDO_EOF:
+                    done = True
+                    break
+                decoded.append(symbol)
+            if used:
+                table[index] = (bytes(decoded), used, done)
+        self._table = table
+        return table
+
+    def _decode_long(self, acc, nbits):
+        """Decode a symbol whose code is too long for the table. Return (symbol, code length)."""
+        for length in range(TABLE_BITS + 1, self.max_length + 1):
+            offset = ((acc >> (nbits - length)) & ((1 << length) - 1)) - self._first_code[length]
+            index = self._first_index[length] + offset
+            if offset >= 0 and index < len(self._symbols) and self.lengths[self._symbols[index]] == length:
+                return self._symbols[index], length
+        raise ValueError('HuffmanCode: invalid code in encoded data')
+
+    def decode_from(self, stream, write):
+        """Decode symbols from a binary stream until PSEUDO_EOF, passing the decoded bytes to write.
+
+        The stream is read in chunks, so its position afterwards is unspecified.
+
+        :param stream: A binary stream, like an :class:`~campy.io.bitstream.ibitstream`, positioned after the header.
+        :param write: A function called with bytes-like chunks of decoded data.
+        :raises ValueError: If the data is invalid or ends before PSEUDO_EOF.
+        """
+        table = self._decoding_table()
+        mask = (1 << TABLE_BITS) - 1
+        need = max(TABLE_BITS, self.max_length)
+        # The low nbits bits of acc are the next bits to decode.
+        acc = nbits = 0
+        chunk, pos = b'', 0
+        padding = 0
+        out = bytearray()
+        done = False
+        while not done:
+            # Refill the accumulator, 16 bytes at a time.
+            if pos >= len(chunk):
+                if out:
+                    write(out)
+                    out = bytearray()
+                chunk, pos = stream.read(_CHUNK_SIZE), 0
+                if not chunk:
+                    if padding:
+                        raise ValueError('HuffmanCode: encoded data ends before PSEUDO_EOF')
+                    # Pad with 0s so that the last codes can be looked up.
+                    padding = need
+                    acc <<= padding
+                    nbits += padding
+            else:
+                piece = chunk[pos:pos + 16]
+                pos += len(piece)
+                acc = ((acc & ((1 << nbits) - 1)) << (8 * len(piece))) | int.from_bytes(piece, 'big')
+                nbits += 8 * len(piece)
+            # Decode as much as the accumulator holds.
+            while nbits >= need:
+                entry = table[(acc >> (nbits - TABLE_BITS)) & mask]
+                if entry is not None:
+                    decoded, used, done = entry
+                    out += decoded
+                    nbits -= used
+                else:
+                    symbol, length = self._decode_long(acc, nbits)
+                    nbits -= length
+                    done = symbol == PSEUDO_EOF
+                    if not done:
+                        out.append(symbol)
+                if done:
+                    break
+        if nbits < padding:
+            raise ValueError('HuffmanCode: encoded data ends before PSEUDO_EOF')
+        if out:
+            write(out)
+
+
+def _read_exactly(stream, size):
+    data = stream.read(size)
+    if len(data) != size:
+        raise ValueError('HuffmanCode: header ends early')
+    return data
+
+
+#############
+# Streaming #
+#############
+def encode_stream(input, stream, code=None):
+    """Compress a binary input stream into an :class:`~campy.io.bitstream.obitstream`.
+
+    If no code is given, the input is read twice (if it is seekable) or into
+    memory (if it isn't) to count its bytes. Neither stream is closed.
+
+    :param input: A binary stream to read uncompressed data from.
+    :param stream: An :class:`~campy.io.bitstream.obitstream` to write compressed data to.
+    :param code: A :class:`HuffmanCode` to use, which must have a code for every byte in the input.
+    :returns: The :class:`HuffmanCode` used.
+    """
+    if code is None:
+        if input.seekable():
+            start = input.tell()
+            frequencies = _collections.Counter()
+            for chunk in iter(lambda: input.read(_CHUNK_SIZE), b''):
+                count_frequencies(chunk, frequencies)
+            input.seek(start)
+        else:
+            input = _io.BytesIO(input.read())
+            frequencies = count_frequencies(input.getbuffer())
+        code = HuffmanCode.from_frequencies(frequencies)
+    code.write_header(stream)
+    for chunk in iter(lambda: input.read(_CHUNK_SIZE), b''):
+        code.encode_to(chunk, stream)
+    code.encode_end(stream)
+    return code
+
+
+def decode_stream(stream, output):
+    """Decompress data from an :class:`~campy.io.bitstream.ibitstream` into a binary output stream.
+
+    :param stream: An :class:`~campy.io.bitstream.ibitstream` to read compressed data from.
+    :param output: A binary stream to write uncompressed data to.
+    :raises ValueError: If the compressed data is invalid.
+    """
+    HuffmanCode.read_header(stream).decode_from(stream, output.write)
+
+
+###########
+# Buffers #
+###########
+def encode(data, code=None):
+    """Compress a bytes-like object and return the compressed bytes.
+
+    :param code: A :class:`HuffmanCode` to use. Defaults to the optimal code for the data.
+    """
+    if code is None:
+        code = HuffmanCode.from_data(data)
+    with ostringbitstream() as stream:
+        code.write_header(stream)
+        code.encode_to(data, stream)
+        code.encode_end(stream)
+        return stream.getvalue()
+
+
+def decode(data):
+    """Decompress a bytes-like object compressed by :func:`encode` and return the original bytes.
+
+    :raises ValueError: If the compressed data is invalid.
+    """
+    output = _io.BytesIO()
+    with istringbitstream(bytes(data)) as stream:
+        decode_stream(stream, output)
+    return output.getvalue()
+
+
+#########
+# Files #
+#########
+def encode_file(infilename, outfilename):
+    """Compress the file named infilename into the file named outfilename."""
+    with open(infilename, 'rb') as input, ofbitstream(outfilename) as stream:
+        encode_stream(input, stream)
+
+
+def decode_file(infilename, outfilename):
+    """Decompress the file named infilename, compressed by :func:`encode_file`, into the file named outfilename."""
+    with ifbitstream(infilename) as stream, open(outfilename, 'wb') as output:
+        decode_stream(stream, output)
+
+
+__all__ = ['HuffmanCode', 'count_frequencies', 'encode', 'decode', 'encode_stream', 'decode_stream',
+           'encode_file', 'decode_file']
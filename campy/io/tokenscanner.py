@@ -1,9 +1,57 @@
+"""Divide a stream of text into tokens, as in the Stanford C++ library.
+
+A :class:`TokenScanner` reads its input in large chunks, so it works on any
+text stream, including pipes, and matches each token with a single compiled
+regular expression. The expression is rebuilt only when the scanner's options,
+word characters or operators change, and is shared by scanners with the same
+configuration::
+
+    scanner = TokenScanner(io.StringIO('x += 3.14 // the answer'))
+    scanner.ignore_whitespace()
+    scanner.ignore_comments(python_style=False, c_style=True)
+    scanner.scan_numbers()
+    scanner.add_operator('+=')
+    while scanner.has_more_tokens():
+        print(scanner.next_token())  # => x, +=, 3.14
+
+A scanner can also work in place on a string, bytes, or a memory-mapped file,
+and keeps track of the line and column it has reached::
+
+    with TokenScanner.from_file('server.log', mmap=True) as scanner:
+        for token in iter(scanner.next_token, b''):
+            if token == b'ERROR':
+                print('Error at line {}, column {}'.format(*scanner.get_position()))
+
+Iterating over a scanner yields :class:`Token` records, which already hold
+each token's type and where it is, so parsers don't need to look them up::
+
+    scanner = TokenScanner.from_string('total = price * 1.08')
+    scanner.scan_numbers()
+    for token in scanner:
+        if token.type == TokenType.NUMBER:
+            print(token.text, token.start, token.end)  # => 1.08 16 20
+
+Operators are matched longest first: the operators are arranged in a trie, which
+becomes nested optional groups of the expression, so each character of an
+operator is only tried once.
+"""
 # TODO: rewrite the functinos in this module to be more Pythonic
 
+import collections as _collections
 import enum as _enum
+import functools as _functools
+import itertools as _itertools
+import mmap as _mmap
+import re as _re
+import sys as _sys
 
 from campy.system.error import error
 
+# How many characters to read from the input stream at once.
+_CHUNK_SIZE = 1 << 16
+# How many tokens to match at once.
+_BATCH_SIZE = 4096
+
 @_enum.unique
 class TokenType(_enum.IntEnum):
     """The enumerated values of the <code>get_token_type</code> method."""
@@ -14,96 +62,202 @@ class TokenType(_enum.IntEnum):
     OPERATOR = 4
 
 
+class Token(_collections.namedtuple('Token', ['type', 'text', 'start', 'end'])):
+    """A token from iterating over a :class:`TokenScanner`.
+
+    Its type is a :class:`TokenType`, and start and end are the offsets of its
+    text in the whole input (None for a token pushed back as a string).
+    """
+    __slots__ = ()
+
+
+_new_tuple = tuple.__new__
+
+
 class TokenScanner():
     def __init__(self, input_stream):
-        self.input_stream = input_stream
         self._init_scannner()
+        self.set_input(input_stream)
+
+    @classmethod
+    def from_string(cls, text):
+        """Return a scanner over a string, which it scans in place, without copying."""
+        scanner = cls(None)
+        scanner._set_buffer(text)
+        return scanner
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Return a scanner over a bytes-like object (like bytes, a memoryview or an mmap), which it scans in place.
+
+        Tokens are bytes. Letters, digits and whitespace are ASCII only, but
+        word characters and operators may be any characters, which are matched
+        in their UTF-8 encoding.
+        """
+        scanner = cls(None)
+        scanner._set_buffer(data)
+        return scanner
+
+    @classmethod
+    def from_file(cls, filename, mmap=False, encoding=None):
+        """Return a scanner over the contents of a file. Close it with :meth:`close`, or use it in a with statement.
+
+        Usage::
+
+            with TokenScanner.from_file('settings.cfg', mmap=True) as scanner:
+                scanner.ignore_whitespace()
+                for token in iter(scanner.next_token, b''):
+                    ...
+
+        :param filename: The name of the file to scan.
+        :param mmap: Whether to memory-map the file and scan its bytes in place,
+                     as by :meth:`from_bytes`, rather than read it as text in chunks.
+        :param encoding: The encoding of a file read as text.
+        """
+        if not mmap:
+            stream = open(filename, encoding=encoding)
+            scanner = cls(stream)
+            scanner._resource = stream
+            return scanner
+        with open(filename, 'rb') as f:
+            try:
+                # The mapping stays valid after the file is closed.
+                mapped = _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ)
+            except ValueError:  # An empty file can't be mapped.
+                return cls.from_bytes(b'')
+        scanner = cls.from_bytes(mapped)
+        scanner._resource = mapped
+        return scanner
+
+    def close(self):
+        """Close the file or mapping that this scanner opened, if any."""
+        if self._resource is not None:
+            self._resource.close()
+            self._resource = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def set_input(self, input_stream):
+        self._set_buffer('')
         self.input_stream = input_stream
+        self._eof = input_stream is None
 
     def has_more_tokens(self):
-        token = self.next_token()
-        self.save_token(token)
-        return token != ""
+        if self._saved_tokens or self._index < len(self._batch):
+            return True
+        return self._scan_batch()
 
     def next_token(self):
         if self._saved_tokens:
-            return self._saved_tokens.pop(0)
-
-        while True:
-            if self.ignore_whitespace:
-                self._skip_spaces()
-            ch = self.input_stream.read(1)
-
-            if ch == '/' and self._ignore_comments:
-                ch = self.input_stream.read(1)
-                if ch == '/':
-                    while True:
-                        ch = self.input_stream.read(1)
-                        if ch in ('', '\r', '\n'):
-                            break
-                    continue
-                elif ch == '*':
-                    prev = ''
-                    while True:
-                        ch = self.input_stream.read(1)
-                        if not ch or (prev == '*' and ch == '/'):
-                            break
-                        prev = ch
-                    continue
-                if ch:
-                    self.unget_char(ch)
-                ch = '/'
-            if not ch:
-                return ''
-            if ch in ('"', "'") and self._scan_strings:
-                self.unget_char(ch)
-                return self._scan_string()
-            if ch.isdigit() and self._scan_numbers:
-                self.unget_char(ch)
-                return self._scan_number()
-            if self.is_word_character(ch):
-                self.unget_char(ch)
-                return self._scan_word()
-            op = ch
-            while self._is_operator_prefix(op):
-                ch = self.input_stream.read(1)
-                if not ch:
-                    break
-                op += ch
-            while len(op) > 1 and not self._is_operator(op):
-                self.unget_char(op[-1])
-                op = op[:-1]
-            return op
-
+            return self._saved_tokens.pop().text
+        index = self._index
+        if index >= len(self._batch):
+            if not self._scan_batch():
+                return self._empty
+            index = 0
+        self._index = index + 1
+        match = self._batch[index]
+        kind = match.lastgroup
+        if kind == 'unterminated':
+            error('TokenScanner.next_token: found unterminated string')
+        return match.group(kind)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        """Return the next token as a :class:`Token`, whose type is already known."""
+        if self._saved_tokens:
+            return self._saved_tokens.pop()
+        index = self._index
+        if index >= len(self._batch):
+            if not self._scan_batch():
+                raise StopIteration
+            index = 0
+        self._index = index + 1
+        match = self._batch[index]
+        kind = match.lastgroup
+        if kind == 'unterminated':
+            error('TokenScanner.next_token: found unterminated string')
+        text = match.group(kind)
+        token_type = self._group_types[kind]
+        if token_type is None:
+            # The type depends only on the first character.
+            first = text[:1]
+            token_type = self._types_by_first.get(first)
+            if token_type is None:
+                token_type = self._types_by_first[first] = self.get_token_type(first)
+        start, end = match.span(kind)
+        offset = self._offset
+        # This skips the argument handling of Token.__new__.
+        return _new_tuple(Token, (token_type, text, offset + start, offset + end))
 
     def save_token(self, token):
+        """Push a token back, so that it is the next token returned.
+
+        Tokens are pushed back onto a stack, so the last token saved is the
+        first one returned. The token may be a string (or bytes), or a
+        :class:`Token` from iterating over this scanner.
+        """
+        if not isinstance(token, Token):
+            token = Token(self.get_token_type(token) if token else None, token, None, None)
         self._saved_tokens.append(token)
 
     def get_position(self):
-        pass
+        """Return the (line, column) in the input just past the last token scanned.
+
+        Lines are numbered from 1 and columns from 0, as in the :mod:`tokenize`
+        module. For bytes, columns count bytes. Only the input since the
+        previous call is examined, so this is cheap to call after every token.
+        """
+        return self._line_and_column(self._offset + self._current_pos())
 
     def ignore_whitespace(self):
-        pass
+        """Skip whitespace between tokens, rather than returning each whitespace character as a token."""
+        self._sync()
+        self._ignore_whitespace = True
+        self._pattern = None
 
     def ignore_comments(self, python_style=True, c_style=False):
-        pass
+        """Skip comments between tokens.
+
+        :param python_style: Whether to skip comments from # to the end of the line.
+        :param c_style: Whether to skip comments from // to the end of the line, and from /* to */.
+        """
+        self._sync()
+        self._python_comments = python_style
+        self._ignore_comments = c_style
+        self._pattern = None
 
     def scan_numbers(self):
-        pass
+        """Return numbers, like 3.14 or 6.02e23, as single tokens."""
+        self._sync()
+        self._scan_numbers = True
+        self._pattern = None
 
     def scan_strings(self):
-        pass
+        """Return quoted strings, including their quotes, as single tokens."""
+        self._sync()
+        self._scan_strings = True
+        self._pattern = None
 
     def add_word_characters(self, characters):
+        self._sync()
         self._word_characters += characters
+        self._types_by_first = {}
+        self._pattern = None
 
     def is_word_character(self, ch):
         return ch.isalnum() or ch in self._word_characters
 
     def add_operator(self, op):
+        self._sync()
         self._operators.append(op)
+        self._pattern = None
 
     def verify_token(self, expected):
         token = self.next_token()
@@ -116,7 +270,9 @@ class TokenScanner():
         if not token:
             error('Empty token: TODO(EOF)?')
 
-        ch = token[0]
+        ch = token[:1]
+        if not isinstance(ch, str):
+            ch = ch.decode('latin-1')
         if ch.isspace():
             return TokenType.SEPARATOR
         elif ch == '"' or (ch == "'" and len(token) > 1):
@@ -129,177 +285,270 @@ class TokenScanner():
             return TokenType.OPERATOR
 
     def get_char(self):
-        return self.input_stream.read(1)
+        self._sync()
+        if self._pos >= len(self._buffer) and not self._fill():
+            return self._empty
+        ch = self._buffer[self._pos:self._pos + 1]
+        self._pos += 1
+        return bytes(ch) if self._binary else ch
 
     def unget_char(self, ch):
         # TODO: char must match current location
-        current = self.input_stream.tell()
-        if current > 0:
-            self.input_stream.seek(current - 1)
+        self._sync()
+        if self._pos > 0:
+            self._pos -= 1
+        else:
+            self._buffer = ch + self._buffer
 
     def get_string_value(self, token):
-        out = ''
-        start = 0
-        finish = len(token)
-        if finish > 1 and (token[0] == '"' or token[0] == "'"):
-            start = 1
-            finish -= 1
-
-        for i in range(start, finish):
-            ch = token[i]
-            if ch == '\\':
-                i += 1
-                ch = token[i]
-                if ch.isdigit() or ch == 'x':
-                    base = 8
-                    if ch == 'x':
-                        base = 16
-                        i += 1
-                    result = 0
-                    digit = 0
-                    while i < finish:
-                        ch = token[i]
-                        if ch.isdigit():
-                            digit = ord(ch) - ord(0)
-                        elif ch.isalpha():
-                            digit = ord(ch.upper()) - ord('A') + 10
-                        else:
-                            digit = base
-                        if digit >= base:
-                            break
-                        result = base * result + digit
-                        i += 1
-                    ch = chr(result)
-                    i -= 1
-                else:
-                    if ch == 'a': ch = '\a'
-                    elif ch == 'b': ch = '\b'
-                    elif ch == 'f': ch = '\f'
-                    elif ch == 'n': ch = '\n'
-                    elif ch == 'r': ch = '\r'
-                    elif ch == 't': ch = '\t'
-                    elif ch == 'v': ch = '\v'
-                    # TODO: other delims?
-            out += ch
-        return out
+        """Return the value of a string token, removing its quotes and replacing escape sequences.
+
+        Besides the usual escapes, like \\n and \\", a backslash may be followed by
+        up to three octal digits or by x and hexadecimal digits to give a
+        character's code. A token without quotes is decoded as is.
+
+        Usage::
+
+            scanner.get_string_value(r'"\\x41\\102C\\n"')  # => 'ABC\\n', ending in a newline
+
+        :param token: The string token, as str or bytes.
+        :returns: The value of the string, of the same type as the token.
+        :raises ValueError: If a str token escapes a code that isn't a valid character.
+        """
+        start, finish = 0, len(token)
+        if finish > 1 and token[:1] in _QUOTES:
+            start, finish = 1, finish - 1
+        value = token[start:finish]
+        if isinstance(value, str):
+            if '\\' not in value:
+                return value
+            return _ESCAPE.sub(_unescape, value)
+        value = bytes(value)
+        if b'\\' not in value:
+            return value
+        return _BYTES_ESCAPE.sub(_unescape_bytes, value)
 
 
     # Private
     def _init_scannner(self):
         self._buffer = None
-        self._isp = None
-        self._string_input = False
+        self._resource = None
         self._ignore_whitespace = False
         self._ignore_comments = False
+        self._python_comments = False
         self._scan_numbers = False
         self._scan_strings = False
-        self._word_characters = []
-        self._saved_tokens = []
+        self._word_characters = ''
+        self._types_by_first = {}
+        self._saved_tokens = _collections.deque()
         self._operators = []
-
-    def _skip_spaces(self):
-        while True:
-            ch = self.input_stream.read(1)
-            if not ch:
-                return
-            if not ch.isspace():
-                self.unget_char(ch)
-                return
-
-    def _scan_word(self):
-        token = ''
+        self._pattern = None
+        self._batch = []
+        self._index = 0
+
+    def _set_buffer(self, buffer):
+        self.input_stream = None
+        self._buffer = buffer
+        self._binary = not isinstance(buffer, str)
+        self._empty = b'' if self._binary else ''
+        self._pos = 0
+        self._eof = True
+        self._batch = []
+        self._index = 0
+        self._saved_tokens = _collections.deque()
+        self._pattern = None
+        # The absolute offset of the start of the buffer, and the last offset whose line and column are known.
+        self._offset = 0
+        self._mark = 0
+        self._line = 1
+        self._line_start = 0
+
+    def _master(self):
+        """Compile (or look up) the expression for the current options, and how near the end of the buffer it can stop."""
+        self._pattern, self._margin = _compile(self._ignore_whitespace, self._python_comments, self._ignore_comments,
+                                               self._scan_strings, self._scan_numbers,
+                                               ''.join(sorted(set(self._word_characters))),
+                                               tuple(sorted(set(self._operators))), self._binary)
+        # The type of each kind of token, or None if it depends on the token's first character.
+        self._group_types = {
+            'string': TokenType.STRING,
+            'number': TokenType.NUMBER,
+            # A word can only start with a digit if numbers aren't scanned.
+            'word': TokenType.WORD if self._scan_numbers else None,
+            'operator': None,
+            'other': None,
+        }
+
+    def _scan_batch(self):
+        """Match the next tokens in the buffer that can't change with more input. Return whether there were any."""
+        self._sync()
+        if self._pattern is None:
+            self._master()
         while True:
-            ch = self.input_stream.read(1)
-            if not ch:
-                break
-            if not self.is_word_character(ch):
-                self.unget_char(ch)
-                break
-            token += ch
-        return token
-
-    def _scan_number(self):
-        token = ''
-        state = _NumberScannerState.INITIAL_STATE
-        while state != _NumberScannerState.FINAL_STATE:
-            ch = self.input_stream.read(1)
-            if state == _NumberScannerState.INITIAL_STATE:
-                if not ch.isdigit():
-                    error('internal error: illegal call')
-                state = _NumberScannerState.BEFORE_DECIMAL_POINT
-            elif state == _NumberScannerState.BEFORE_DECIMAL_POINT:
-                if ch == '.':
-                    state = _NumberScannerState.AFTER_DECIMAL_POINT
-                elif ch in ('e', 'E'):
-                    state = _NumberScannerState.STARTING_EXPONENT
-                elif not ch.isdigit():
-                    if ch:
-                        self.unget_char(ch)
-                    state = _NumberScannerState.FINAL_STATE
-            elif state == _NumberScannerState.AFTER_DECIMAL_POINT:
-                if ch in ('e', 'E'):
-                    state = _NumberScannerState.STARTING_EXPONENT
-                elif not ch.isdigit():
-                    if ch:
-                        self.unget_char(ch)
-                    state = _NumberScannerState.FINAL_STATE
-            elif state == _NumberScannerState.STARTING_EXPONENT:
-                if ch in ('-', '+'):
-                    state = _NumberScannerState.FOUND_EXPONENT_SIGN
-                elif ch.isdigit():
-                    state = _NumberScannerState.SCANNING_EXPONENT
-                else:
-                    if ch:
-                        self.input_stream.unget_char(ch)
-                    self.input_stream.unget_char(ch)
-                    state = _NumberScannerState.FINAL_STATE
-            elif state == _NumberScannerState.FOUND_EXPONENT_SIGN:
-                if ch.isdigit():
-                    state = _NumberScannerState.SCANNING_EXPONENT
-                else:
-                    if ch:
-                        self.input_stream.unget_char(ch)
-                    self.input_stream.unget_char(ch)
-                    self.input_stream.unget_char(ch)
-                    state = _NumberScannerState.FINAL_STATE
-            elif case == _NumberScannerState.SCANNING_EXPONENT:
-                if not ch.isdigit():
-                    if ch:
-                        self.input_stream.unget_char(ch)
-                    state = _NumberScannerState.FINAL_STATE
-            else:
-                state = _NumberScannerState.FINAL_STATE
-            if state != _NumberScannerState.FINAL_STATE:
-                token += ch
-        return token
-
-    def _scan_string(self):
-        token = ''
-        delim = self.input_stream.read(1)
-        token += delim
-        escape = False
-        while True:
-            ch = self.input_stream.read(1)
-            if not ch:
-                error('found unterminated string') # TODO: fn name
-            if ch == delim and not escape:
-                break
-            escape = ch == '\\' and not escape
-            token += ch
-        return token
-
-    def _is_operator(self, op):
-        return op in self._operators
-
-    def _is_operator_prefix(self, op):
-        return any(operator.startswith(op) for operator in self._operators)
-
-@_enum.unique
-class _NumberScannerState(_enum.IntEnum):
-    INITIAL_STATE = 0
-    BEFORE_DECIMAL_POINT = 1
-    AFTER_DECIMAL_POINT = 2
-    STARTING_EXPONENT = 3
-    FOUND_EXPONENT_SIGN = 4
-    SCANNING_EXPONENT = 5
-    FINAL_STATE = 6
+            batch = list(_itertools.islice(self._pattern.finditer(self._buffer, self._pos), _BATCH_SIZE))
+            # An incomplete token (like an unterminated string) runs to the end of the buffer, so it is last.
+            # A token that reaches (nearly) to the end of the buffer might continue in the next chunk.
+            limit = len(self._buffer) - self._margin
+            while batch and (batch[-1].lastgroup is None or not self._eof and batch[-1].end() >= limit):
+                batch.pop()
+            if batch:
+                self._batch = batch
+                self._index = 0
+                self._pos = -1  # Unknown until the batch is synced.
+                return True
+            if self._eof:
+                self._pos = len(self._buffer)
+                return False
+            self._fill()
+
+    def _current_pos(self):
+        """Return the position in the buffer just past the last token returned, without giving back any tokens."""
+        if not self._batch:
+            return self._pos
+        if self._index:
+            return self._batch[self._index - 1].end()
+        return self._batch[0].start()
+
+    def _sync(self):
+        """Give back the scanned tokens that haven't been returned, so that the buffer is at the next token."""
+        if self._batch:
+            self._pos = self._current_pos()
+            self._batch = []
+            self._index = 0
+
+    def _fill(self):
+        """Read another chunk of input into the buffer. Return whether there was any."""
+        if self._eof:
+            return False
+        # Read at least as much as is buffered, so that a long token takes few reads.
+        chunk = self.input_stream.read(max(_CHUNK_SIZE, len(self._buffer) - self._pos))
+        if not chunk:
+            self._eof = True
+            return False
+        # Drop the characters that have already been scanned, except one for unget_char.
+        drop = max(self._pos - 1, 0)
+        self._line_and_column(self._offset + drop)  # Count the lines in the dropped characters first.
+        self._buffer = self._buffer[drop:] + chunk
+        self._pos -= drop
+        self._offset += drop
+        return True
+
+    def _line_and_column(self, offset):
+        """Return the line and column of an absolute offset in the buffer, counting lines from the last such offset."""
+        start, end = self._mark - self._offset, offset - self._offset
+        newlines, last_line = _NEWLINES[self._binary]
+        if end >= start:
+            count = len(newlines.findall(self._buffer, start, end))
+            if count:
+                self._line += count
+                self._line_start = self._offset + last_line.match(self._buffer, start, end).end()
+        else:  # Moving back, as after unget_char.
+            self._line -= len(newlines.findall(self._buffer, end, start))
+            previous = last_line.match(self._buffer, 0, end)
+            if previous is not None:
+                self._line_start = self._offset + previous.end()
+            elif self._offset == 0:
+                self._line_start = 0
+        self._mark = offset
+        return self._line, offset - self._line_start
+
+
+def _operator_pattern(trie):
+    """Return an expression matching the longest path through a trie of operators."""
+    alternatives = []
+    for ch in sorted(trie):
+        if ch:
+            alternatives.append(_re.escape(ch) + _operator_pattern(trie[ch]))
+    if not alternatives:
+        return ''
+    pattern = '(?:{})'.format('|'.join(alternatives))
+    # Where an operator ends, continuing is optional. Optional groups are greedy, so the longest operator wins.
+    return pattern + '?' if '' in trie else pattern
+
+
+@_functools.lru_cache(maxsize=64)
+def _compile(ignore_whitespace, python_comments, c_comments, scan_strings, scan_numbers, word_characters, operators,
+             binary=False):
+    """Compile the master expression for a scanner configuration.
+
+    The expression skips anything that should be ignored, and then matches one
+    token in a named group, tried in the same order as the Stanford library: a
+    string, a number, a word, an operator, or any other single character.
+
+    Returns the expression, and how many characters past the end of a match
+    the buffer must hold to be sure that the match wouldn't change with more input.
+    If binary, the expression matches bytes, in which the word characters and
+    operators are encoded in UTF-8.
+    """
+    skip = []
+    if ignore_whitespace:
+        skip.append(r'\s+')
+    if python_comments:
+        skip.append(r'#[^\r\n]*')
+    if c_comments:
+        skip.append(r'//[^\r\n]*')
+        skip.append(r'/\*.*?(?:\*/|\Z)')
+    tokens = []
+    if scan_strings:
+        tokens.append(r'(?P<string>"[^"\\]*(?:\\.[^"\\]*)*"' + r"|'[^'\\]*(?:\\.[^'\\]*)*')")
+        tokens.append(r'(?P<unterminated>["\'].*)')
+    if scan_numbers:
+        tokens.append(r'(?P<number>\d+(?:\.\d*)?(?:[eE][+-]?\d+)?)')
+    # In bytes, a word character that takes more than one byte can't go in a character class.
+    singles = ''.join(_re.escape(ch) for ch in word_characters if not binary or ord(ch) < 128)
+    multiples = [_re.escape(ch) for ch in word_characters if binary and ord(ch) >= 128]
+    tokens.append(r'(?P<word>(?:[^\W_]{}{})+)'.format('|[{}]'.format(singles) if singles else '',
+                                                     ''.join('|' + ch for ch in multiples)))
+    trie = {}
+    for op in operators:
+        node = trie
+        for ch in op:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+    if trie:
+        tokens.append('(?P<operator>{})'.format(_operator_pattern(trie)))
+    tokens.append('(?P<other>.)')
+    pattern = '(?:{})*(?:{})?'.format('|'.join(skip), '|'.join(tokens)) if skip else '(?:{})?'.format('|'.join(tokens))
+    # A number may give back up to two characters (as in 1e+), and an operator may give back all but one.
+    margin = max([2] + [len(op.encode('utf-8') if binary else op) for op in operators])
+    if binary:
+        pattern = pattern.encode('utf-8')
+    return _re.compile(pattern, _re.DOTALL), margin
+
+
+# For str and for bytes, expressions to find newlines and the end of the last line.
+_NEWLINES = {
+    False: (_re.compile('\n'), _re.compile('.*\n', _re.DOTALL)),
+    True: (_re.compile(b'\n'), _re.compile(b'.*\n', _re.DOTALL)),
+}
+
+
+# Quotes around string tokens, as str and as bytes (which index to ints, so slices are compared).
+_QUOTES = ('"', "'", b'"', b"'")
+
+# An escape sequence: a backslash followed by hex digits, up to three octal digits (as in C), or any single character.
+_ESCAPE = _re.compile(r'\\(?:x([0-9A-Fa-f]+)|([0-7]{1,3})|(.))', _re.DOTALL)
+_BYTES_ESCAPE = _re.compile(_ESCAPE.pattern.encode('ascii'), _re.DOTALL)
+
+# The values of escapes of a single character. Any other character stands for itself.
+_SIMPLE_ESCAPES = {'a': '\a', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t', 'v': '\v'}
+_SIMPLE_BYTES_ESCAPES = {ch.encode('ascii'): value.encode('ascii') for ch, value in _SIMPLE_ESCAPES.items()}
+
+
+def _unescape(match):
+    """Return the character written by an escape sequence in a str."""
+    hex_digits, octal_digits, ch = match.groups()
+    if ch is not None:
+        return _SIMPLE_ESCAPES.get(ch, ch)
+    code = int(hex_digits, 16) if hex_digits is not None else int(octal_digits, 8)
+    if code > _sys.maxunicode:
+        raise ValueError('TokenScanner: escape sequence {!r} is not a valid character code'.format(match.group()))
+    return chr(code)
+
+
+def _unescape_bytes(match):
+    """Return the byte written by an escape sequence in bytes, keeping the low byte of larger codes like C."""
+    hex_digits, octal_digits, ch = match.groups()
+    if ch is not None:
+        return _SIMPLE_BYTES_ESCAPES.get(ch, ch)
+    return bytes([(int(hex_digits, 16) if hex_digits is not None else int(octal_digits, 8)) & 0xFF])
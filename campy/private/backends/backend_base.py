@@ -33,6 +33,8 @@ class GraphicsBackendBase(abc.ABC):
     def gwindow_clear(self, gwindow): pass
     def gwindow_clear_canvas(self, gwindow): pass
     def gwindow_repaint(self, gwindow): pass
+    def gwindow_begin_batch(self, gwindow): pass
+    def gwindow_end_batch(self, gwindow): pass
     def gwindow_draw(self, gwindow, gobject): pass
 
     # GWindow attributes.
@@ -86,6 +86,12 @@ class TkWindow:
         self._left = None
         self._right = None
 
+        # Batching state. While the batch depth is positive, canvas operations
+        # only mark this window as dirty, and the redraw happens at the end of
+        # the outermost batch (or whenever the event loop is next pumped).
+        self._batch_depth = 0
+        self._dirty = False
+
     @property
     def canvas(self):
         return self._canvas
@@ -150,6 +156,29 @@ class TkWindow:
         # Delete all canvas elements, but leave the canvas (and all interactor regions) in place.
         self.canvas.delete('all')
 
+    def request_update(self):
+        """Redraw this window now, or defer the redraw if a batch is open."""
+        if self._batch_depth:
+            self._dirty = True
+        else:
+            self._master.update_idletasks()
+
+    def begin_batch(self):
+        # Batches nest, so only the outermost batch triggers a flush.
+        self._batch_depth += 1
+
+    def end_batch(self):
+        if not self._batch_depth: return
+        self._batch_depth -= 1
+        if not self._batch_depth:
+            self.flush()
+
+    def flush(self):
+        """Process any pending redraws for this window exactly once."""
+        if self._dirty and not self._closed:
+            self._dirty = False
+            self._master.update_idletasks()
+
     def _close(self):
         if self._closed: return
         self._closed = True
@@ -227,9 +256,16 @@ class TkBackend(GraphicsBackendBase):
         gwindow._tkwin.clear_canvas()
 
     def gwindow_repaint(self, gwindow):
-        # Update any unresolved tasks.
+        # Update any unresolved tasks, even in the middle of a batch.
+        gwindow._tkwin._dirty = False
         gwindow._tkwin._master.update_idletasks()
 
+    def gwindow_begin_batch(self, gwindow):
+        gwindow._tkwin.begin_batch()
+
+    def gwindow_end_batch(self, gwindow):
+        gwindow._tkwin.end_batch()
+
     def gwindow_draw(self, gwindow, gobject): pass
 
     ####################
@@ -286,7 +322,7 @@ class TkBackend(GraphicsBackendBase):
 
         coords = win.canvas.coords(tkid)
         win.canvas.move(tkid, x - coords[0], y - coords[1])
-        win._master.update_idletasks()
+        win.request_update()
 
     def gobject_set_filled(self, gobject, flag):
         from campy.graphics.gobjects import GArc
@@ -303,7 +339,7 @@ class TkBackend(GraphicsBackendBase):
             if isinstance(object, GArc):
                 self.itemconfig(tkid, style=tkinter.ARC)
 
-        win._master.update_idletasks()
+        win.request_update()
 
     def gobject_remove(self, gobject):
         if not hasattr(gobject, '_tkid'): return
@@ -314,7 +350,7 @@ class TkBackend(GraphicsBackendBase):
         delattr(gobject, '_tkid')
         delattr(gobject, '_tkwin')
 
-        win._master.update_idletasks()
+        win.request_update()
 
     def gobject_set_color(self, gobject, color):
         if not hasattr(gobject, '_tkid'): return
@@ -329,7 +365,7 @@ class TkBackend(GraphicsBackendBase):
             # GLabels and GLines are special because their "color" is actually a fill color.
             win.canvas.itemconfig(tkid, fill=color.hex)
 
-        win._master.update_idletasks()
+        win.request_update()
 
     def gobject_set_fill_color(self, gobject, color):
         if not hasattr(gobject, '_tkid'): return
@@ -338,7 +374,7 @@ class TkBackend(GraphicsBackendBase):
 
         win.canvas.itemconfig(tkid, fill=color.hex)
 
-        win._master.update_idletasks()
+        win.request_update()
 
     def gobject_send_forward(self, gobject): pass
     def gobject_send_to_front(self, gobject):
@@ -348,7 +384,7 @@ class TkBackend(GraphicsBackendBase):
 
         win.canvas.tag_raise(tkid)
 
-        win._master.update_idletasks()
+        win.request_update()
 
     def gobject_send_backward(self, gobject): pass
     def gobject_send_to_back(self, gobject):
@@ -358,7 +394,7 @@ class TkBackend(GraphicsBackendBase):
 
         win.canvas.tag_lower(tkid)
 
-        win._master.update_idletasks()
+        win.request_update()
 
     def gobject_set_size(self, gobject, width, height): pass
     def gobject_get_size(self, gobject):
@@ -399,7 +435,7 @@ class TkBackend(GraphicsBackendBase):
             grect.x, grect.y, grect.x + grect.width, grect.y + grect.height,
             outline=grect.color.hex, fill=grect.fill_color.hex if grect.filled else '',
             state=tk.NORMAL if grect.visible else tk.HIDDEN)
-        win._master.update_idletasks()
+        win.request_update()
 
     def groundrect_constructor(self, gobject, width, height, corner): pass
     def g3drect_constructor(self, gobject, width, height, raised): pass
@@ -420,7 +456,7 @@ class TkBackend(GraphicsBackendBase):
             outline=goval.color.hex, fill=goval.fill_color.hex if goval.filled else '',
             state=tk.NORMAL if goval.visible else tk.HIDDEN)
 
-        win._master.update_idletasks()
+        win.request_update()
 
     def garc_constructor(self, garc):
         if hasattr(garc, '_tkwin'):
@@ -436,7 +472,7 @@ class TkBackend(GraphicsBackendBase):
             style=tk.PIESLICE if garc.filled else tk.ARC,
             state=tk.NORMAL if garc.visible else tk.HIDDEN)
 
-        win._master.update_idletasks()
+        win.request_update()
 
     def garc_set_start_angle(self, garc, angle):
         if not hasattr(garc, '_tkid'): return
@@ -445,7 +481,7 @@ class TkBackend(GraphicsBackendBase):
 
         win.canvas.itemconfig(tkid, start=angle)
 
-        win._master.update_idletasks()
+        win.request_update()
 
     def garc_set_sweep_angle(self, garc, angle):
         if not hasattr(garc, '_tkid'): return
@@ -454,7 +490,7 @@ class TkBackend(GraphicsBackendBase):
 
         win.canvas.itemconfig(tkid, extent=angle)
 
-        win._master.update_idletasks()
+        win.request_update()
 
     def garc_set_frame_rectangle(self, garc, x, y, width, height): pass
 
@@ -474,7 +510,7 @@ class TkBackend(GraphicsBackendBase):
             fill=gline.color.hex,
             state=tk.NORMAL if gline.visible else tk.HIDDEN)
 
-        win._master.update_idletasks()
+        win.request_update()
 
     def gline_set_start_point(self, gline, x, y):
         if not hasattr(gline, '_tkid'): return
@@ -483,7 +519,7 @@ class TkBackend(GraphicsBackendBase):
 
         win.canvas.coords(tkid, x, y, gline.end.x, gline.end.y,)
 
-        win._master.update_idletasks()
+        win.request_update()
 
     def gline_set_end_point(self, gline, x, y):
         if not hasattr(gline, '_tkid'): return
@@ -492,7 +528,7 @@ class TkBackend(GraphicsBackendBase):
 
         win.canvas.coords(tkid, gline.start.x, gline.start.y, x, y)
 
-        win._master.update_idletasks()
+        win.request_update()
 
     ##############
     # GCompounds #
@@ -551,7 +587,7 @@ class TkBackend(GraphicsBackendBase):
 
         self.glabel_set_font(glabel, glabel.font)
 
-        win._master.update_idletasks()
+        win.request_update()
 
     def glabel_set_font(self, glabel, gfont):
         if not hasattr(glabel, '_tkid'): return
@@ -596,7 +632,7 @@ class TkBackend(GraphicsBackendBase):
             outline=gpolygon.color.hex, fill=gpolygon.fill_color.hex if gpolygon.filled else '',
             state=tk.NORMAL if gpolygon.visible else tk.HIDDEN)
 
-        win._master.update_idletasks()
+        win.request_update()
 
     def gpolygon_add_vertex(self, gpolygon, x, y):
         if not hasattr(gpolygon, '_tkid'): return
@@ -605,7 +641,7 @@ class TkBackend(GraphicsBackendBase):
 
         win.canvas.coords(tkid, x, y, gpolygon.end.x, gpolygon.end.y,)
 
-        win._master.update_idletasks()
+        win.request_update()
 
     ##########
     # Images #
@@ -661,7 +697,7 @@ class TkBackend(GraphicsBackendBase):
         # doesn't destroy the data.
         gimage._tkim = image
 
-        win._master.update_idletasks()
+        win.request_update()
 
     def gimage_blank(self, gimage, width, height): pass
     def gimage_get_pixel(self, gimage, row, col):
@@ -763,7 +799,10 @@ class TkBackend(GraphicsBackendBase):
 
     def event_pump_one(self):
         # Forcibly process queued tasks, but don't process newly queued ones.
+        # This redraws every window, so any deferred batch updates are done.
         self._root.update_idletasks()
+        for win in self._windows:
+            win._dirty = False
         self._root.dooneevent(DONT_WAIT)
 
     # TODO(sredmond): Rename these backend events for consistency.
@@ -815,7 +854,7 @@ class TkBackend(GraphicsBackendBase):
         gcheckbox._tkobj.var = var
         gcheckbox._tkobj.pack()
 
-        win._master.update_idletasks()
+        win.request_update()
 
 
     def gcheckbox_is_selected(self, gcheckbox):
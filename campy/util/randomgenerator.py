@@ -21,7 +21,9 @@ class RandomGenerator(_random.Random):
 
     """ NOTE: a student shouldn't ever instantiate a RandomGenerator"""
     """ Rather, they should access one using getInstance """
-    def __init__(self):
+    """ (or create a seeded one, for reproducible results) """
+    def __init__(self, seed=None):
+        super().__init__(seed)
         self._fixed_bools = _deque()
         self._fixed_ints = _deque()
         self._fixed_reals = _deque()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3 -tt
+"""Measure how quickly campy.io.huffman compresses and decompresses a file.
+
+Usage:
+
+    python3 huffman_benchmark.py [FILENAME] [--megabytes N]
+
+Without a filename, this benchmarks N megabytes (default 20) of English-like
+text made from the library's own source code.
+"""
+import argparse
+import glob
+import os
+import time
+
+from campy.io import huffman
+
+
+def sample_data(megabytes):
+    root = os.path.join(os.path.dirname(os.path.abspath(huffman.__file__)), '..')
+    text = b''.join(open(filename, 'rb').read() for filename in glob.glob(os.path.join(root, '**', '*.py'), recursive=True))
+    size = int(megabytes * 1000000)
+    return (text * (size // len(text) + 1))[:size]
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('filename', nargs='?')
+    parser.add_argument('--megabytes', type=float, default=20)
+    args = parser.parse_args()
+
+    if args.filename:
+        with open(args.filename, 'rb') as f:
+            data = f.read()
+    else:
+        data = sample_data(args.megabytes)
+    megabytes = len(data) / 1000000
+
+    code, count_time = timed(huffman.HuffmanCode.from_data, data)
+    compressed, encode_time = timed(huffman.encode, data, code)
+    decompressed, decode_time = timed(huffman.decode, compressed)
+    assert decompressed == data
+
+    print('Input:       {:.1f} MB'.format(megabytes))
+    print('Compressed:  {:.1f} MB ({:.1%})'.format(len(compressed) / 1000000, len(compressed) / max(len(data), 1)))
+    print('Counting:    {:.1f} MB/s'.format(megabytes / count_time))
+    print('Encoding:    {:.1f} MB/s'.format(megabytes / encode_time))
+    print('Decoding:    {:.1f} MB/s'.format(megabytes / decode_time))
+
+
+if __name__ == '__main__':
+    main()
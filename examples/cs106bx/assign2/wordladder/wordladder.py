@@ -1,11 +1,15 @@
 #!/usr/bin/env python
 """CS106B/X Assignment 2 Example: Word Ladder
 
-
+A word ladder connects two words by changing one letter at a time, where every
+intermediate step is also a word. We search outward from the first word in
+breadth-first order, so the first ladder we find is a shortest one.
 """
 from campy.datastructures.lexicon import Lexicon
 from campy.util.simpio import get_line
 
+import collections
+
 
 def greet():
     print("Welcome to CS 106B/X Word Ladder!")
@@ -17,6 +21,46 @@ def load_dictionary():
     # TODO(sredmond): Handle bad dictionary name.
     return Lexicon(get_line("Dictionary file name:"))
 
+def find_ladder(lex, start, end):
+    """Return a shortest word ladder from start to end, or None if there isn't one."""
+    start, end = start.lower(), end.lower()
+    previous = {start: None}
+    frontier = collections.deque([start])
+    while frontier:
+        word = frontier.popleft()
+        if word == end:
+            ladder = []
+            while word:
+                ladder.append(word)
+                word = previous[word]
+            return ladder[::-1]
+        # The lexicon prunes its search to words one letter away.
+        for neighbor in lex.neighbors(word, same_length=True):
+            if neighbor not in previous:
+                previous[neighbor] = word
+                frontier.append(neighbor)
+    return None
+
 if __name__ == '__main__':
     greet()
-    # TODO(sredmond): Finish wordladder!
+    lex = load_dictionary()
+    while True:
+        print()
+        start = get_line("Word 1 (or Enter to quit):")
+        if not start:
+            break
+        end = get_line("Word 2 (or Enter to quit):")
+        if not end:
+            break
+        if start not in lex or end not in lex:
+            print("The two words must be found in the dictionary.")
+        elif len(start) != len(end):
+            print("The two words must be the same length.")
+        else:
+            ladder = find_ladder(lex, start, end)
+            if ladder:
+                print("A ladder from {} back to {}:".format(end, start))
+                print(' '.join(reversed(ladder)))
+            else:
+                print("No word ladder found from {} back to {}.".format(end, start))
+    print("Have a nice day.")
@@ -130,7 +130,6 @@ setup(
 
         # Supported Python versions.
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.4',
         'Programming Language :: Python :: 3.5',
         'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
@@ -145,7 +144,7 @@ setup(
     # Supported Python versions. Unlike the classifiers above, `pip install`
     # will check this and refuse to install the project if the version does not
     # match.
-    python_requires='>=3.4, <4',
+    python_requires='>=3.5, <4',
 
     # Run-time dependencies, installed by pip when this project is installed.
     install_requires=[],  # No dependencies. Woohoo!
@@ -157,6 +156,7 @@ setup(
         'dev': ['check-manifest', 'pycodestyle'],
         'test': ['tox', 'pytest', 'pytest-cov', 'coverage'],
         'with-pillow': ['Pillow'],
+        'with-numpy': ['numpy'],
     },
 
     # Include data files in the package.
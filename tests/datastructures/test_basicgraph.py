@@ -1 +1,95 @@
 """Tests for the :mod:`campy.datastructures.basicgraph` module."""
+from campy.datastructures.basicgraph import BasicGraph
+
+import random
+
+import pytest
+
+
+def names(path):
+    return [vertex.name for vertex in path]
+
+
+@pytest.fixture
+def roads():
+    graph = BasicGraph()
+    graph.add_edge('a', 'b', cost=4.0)
+    graph.add_edge('a', 'c', cost=1.0)
+    graph.add_edge('c', 'b', cost=1.0)
+    graph.add_edge('b', 'd', cost=1.0)
+    graph.add_edge('c', 'd', cost=5.0)
+    graph.add_vertex('island')
+    return graph
+
+
+def test_breadth_first_search(roads):
+    assert names(roads.breadth_first_search('a', 'd')) in (['a', 'b', 'd'], ['a', 'c', 'd'])
+    assert roads.breadth_first_search('a', 'island') == []
+    assert names(roads.breadth_first_search('a', 'a')) == ['a']
+
+
+def test_depth_first_search(roads):
+    path = roads.depth_first_search('a', 'd')
+    assert path[0].name == 'a' and path[-1].name == 'd'
+    for before, after in zip(path, path[1:]):
+        assert roads.is_connected(before, after)
+    assert roads.depth_first_search('d', 'a') == []
+
+
+def test_dijkstra_records_costs(roads):
+    path = roads.dijkstras_algorithm('a', 'd')
+    assert names(path) == ['a', 'c', 'b', 'd']
+    assert path[-1].cost == 3.0
+    assert path[-1].previous.name == 'b'
+    assert roads.get_vertex('d').visited
+    assert not roads.get_vertex('island').visited
+
+
+def test_a_star_with_heuristic(roads):
+    calls = []
+
+    def heuristic(vertex, end):
+        calls.append(vertex.name)
+        return 0.0
+
+    assert names(roads.a_star('a', 'd', heuristic=heuristic)) == ['a', 'c', 'b', 'd']
+    assert calls
+
+
+def test_reset_between_searches_is_lazy(roads):
+    roads.dijkstras_algorithm('a', 'd')
+    roads.breadth_first_search('island', 'island')
+    d = roads.get_vertex('d')
+    assert not d.visited and d.previous is None and d.cost == 0.0
+    roads.reset_enabled = False
+    roads.dijkstras_algorithm('a', 'd')
+    roads.breadth_first_search('island', 'island')
+    assert d.visited
+
+
+def test_bidirectional_search_finds_shortest_paths():
+    rng = random.Random(106)
+    graph = BasicGraph()
+    for i in range(200):
+        graph.add_vertex(i)
+    for _ in range(600):
+        graph.add_edge(rng.randrange(200), rng.randrange(200))
+    for _ in range(50):
+        start, end = rng.randrange(200), rng.randrange(200)
+        expected = graph.breadth_first_search(start, end)
+        path = graph.bidirectional_search(start, end)
+        assert len(path) == len(expected)
+        if path:
+            assert path[0].name == start and path[-1].name == end
+            for before, after in zip(path, path[1:]):
+                assert graph.is_connected(before, after)
+
+
+def test_topological_sort(roads):
+    order = names(roads.topological_sort())
+    assert sorted(order) == ['a', 'b', 'c', 'd', 'island']
+    for arc in roads.arcs:
+        assert order.index(arc.start.name) < order.index(arc.finish.name)
+    roads.add_edge('d', 'a')
+    with pytest.raises(ValueError):
+        roads.topological_sort()
@@ -30,3 +30,83 @@ def test_basic_operations():
     # TODO(sredmond): What the heck is this queue comparison?
     bq.enqueue(12)
     assert bq > bq2
+
+def test_empty_access_raises():
+    import pytest
+    bq = BasicQueue()
+    for method in (bq.dequeue, bq.peek, bq.back):
+        with pytest.raises(IndexError):
+            method()
+
+def test_bulk_operations():
+    bq = BasicQueue(range(3))
+    bq.enqueue_many(x for x in range(3, 6))
+    assert bq.dequeue_many(2) == [0, 1]
+    assert bq.dequeue_many() == [2, 3, 4, 5]
+    assert bq.dequeue_many(10) == []
+
+def test_bounded_queue_raises_when_full():
+    import pytest
+    bq = BasicQueue([1, 2], capacity=3)
+    bq.enqueue(3)
+    assert bq.is_full()
+    with pytest.raises(OverflowError):
+        bq.enqueue(4)
+    bq.dequeue()
+    with pytest.raises(OverflowError):
+        bq.enqueue_many([4, 5])
+    assert list(bq) == [2, 3]
+    with pytest.raises(OverflowError):
+        BasicQueue(range(4), capacity=3)
+
+def test_bounded_queue_drops_oldest():
+    from campy.datastructures.basicqueue import Overflow
+    bq = BasicQueue(capacity=3, overflow=Overflow.DROP_OLDEST)
+    bq.enqueue_many(range(5))
+    bq.enqueue(5)
+    assert list(bq) == [3, 4, 5]
+    assert str(bq) == "BasicQueue([3, 4, 5])"
+
+def test_only_thread_safe_queues_block():
+    import pytest
+    with pytest.raises(ValueError):
+        BasicQueue(capacity=3, overflow='block')
+    with pytest.raises(ValueError):
+        BasicQueue(capacity=0)
+
+def test_thread_safe_queue_producer_consumer():
+    import threading
+    from campy.datastructures.basicqueue import ThreadSafeBasicQueue
+    bq = ThreadSafeBasicQueue(capacity=5)
+    received = []
+
+    def consume():
+        while True:
+            value = bq.dequeue()
+            if value is None:
+                return
+            received.append(value)
+
+    consumers = [threading.Thread(target=consume) for _ in range(3)]
+    for consumer in consumers:
+        consumer.start()
+    for start in range(0, 1000, 100):
+        bq.enqueue_many(range(start, start + 100))
+    for _ in consumers:
+        bq.enqueue(None)
+    for consumer in consumers:
+        consumer.join(timeout=10)
+    assert sorted(received) == list(range(1000))
+
+def test_thread_safe_queue_timeouts():
+    import pytest
+    from campy.datastructures.basicqueue import ThreadSafeBasicQueue
+    bq = ThreadSafeBasicQueue(capacity=1)
+    with pytest.raises(IndexError):
+        bq.dequeue(timeout=0.01)
+    with pytest.raises(IndexError):
+        bq.dequeue(block=False)
+    bq.enqueue('a')
+    with pytest.raises(OverflowError):
+        bq.enqueue('b', timeout=0.01)
+    assert bq.dequeue_many(block=False) == ['a']
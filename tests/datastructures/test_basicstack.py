@@ -32,3 +32,55 @@ def test_basic_operations():
     # TODO(sredmond): What the heck is this stack comparison?
     bs.add(12)
     assert bs > bs2
+
+
+def test_iteration_is_bottom_to_top():
+    bs = BasicStack()
+    bs.push_many([1, 2, 3])
+    assert list(bs) == [1, 2, 3]
+    assert bs.peek() == 3
+
+
+def test_empty_access_raises():
+    import pytest
+    bs = BasicStack()
+    for method in (bs.pop, bs.peek, bs.back):
+        with pytest.raises(IndexError):
+            method()
+
+
+def test_bulk_and_bounded_operations():
+    import pytest
+    bs = BasicStack(capacity=3)
+    bs.push_many(['a', 'b'])
+    with pytest.raises(OverflowError):
+        bs.push_many(['c', 'd'])
+    bs.push('c')
+    with pytest.raises(OverflowError):
+        bs.push('d')
+    assert bs.pop_many(2) == ['c', 'b']
+    assert bs.pop_many() == ['a']
+
+
+def test_bounded_stack_drops_bottom():
+    bs = BasicStack(capacity=2, overflow='drop_oldest')
+    bs.push_many(['type', 'delete', 'paste'])
+    assert bs.pop_many() == ['paste', 'delete']
+
+
+def test_bounded_stack_keeps_top_of_initial_data():
+    bs = BasicStack([1, 2, 3, 4, 5], capacity=3, overflow='drop_oldest')
+    assert bs.peek() == 1
+    assert bs.pop_many() == [1, 2, 3]
+
+
+def test_thread_safe_stack():
+    import threading
+    from campy.datastructures.basicstack import ThreadSafeBasicStack
+    bs = ThreadSafeBasicStack(capacity=2)
+    bs.push_many([1, 2])
+    pusher = threading.Thread(target=bs.push, args=(3,))
+    pusher.start()
+    assert bs.pop() == 2
+    pusher.join(timeout=10)
+    assert bs.pop_many() == [3, 1]
@@ -0,0 +1,144 @@
+"""Tests for the :mod:`campy.datastructures.frozengraph` module."""
+from campy.datastructures.basicgraph import BasicGraph
+from campy.datastructures.frozengraph import FrozenGraph, INFINITY
+
+import random
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def roads():
+    graph = BasicGraph()
+    graph.add_edge('a', 'b', cost=4.0)
+    graph.add_edge('a', 'c', cost=1.0)
+    graph.add_edge('c', 'b', cost=1.0)
+    graph.add_edge('b', 'd', cost=1.0)
+    graph.add_edge('c', 'd', cost=5.0)
+    graph.add_vertex('island')
+    return graph
+
+
+def test_freeze_snapshot(roads):
+    frozen = roads.freeze()
+    assert frozen.num_nodes == 5
+    assert frozen.num_arcs == 5
+    a = frozen.id_of('a')
+    assert sorted(frozen.names_of(frozen.neighbors(a))) == ['b', 'c']
+    assert sorted((frozen.name_of(node), cost) for node, cost in frozen.arcs(a)) == [('b', 4.0), ('c', 1.0)]
+    assert frozen.is_connected(a, frozen.id_of('b'))
+    roads.add_edge('island', 'a')
+    assert frozen.num_arcs == 5
+
+
+def test_searches(roads):
+    frozen = roads.freeze()
+    a, d, island = frozen.id_of('a'), frozen.id_of('d'), frozen.id_of('island')
+    assert frozen.names_of(frozen.dijkstras_algorithm(a, d)) == ['a', 'c', 'b', 'd']
+    assert frozen.names_of(frozen.a_star(a, d, heuristic=lambda node, end: 0.0)) == ['a', 'c', 'b', 'd']
+    assert len(frozen.breadth_first_search(a, d)) == 3
+    assert frozen.breadth_first_search(a, island) == []
+    assert frozen.dijkstras_algorithm(a, a) == [a]
+    distance, previous = frozen.shortest_path_costs(a)
+    assert distance[d] == 3.0
+    assert distance[island] == INFINITY
+    assert previous[island] == -1
+
+
+def test_matches_basicgraph_dijkstra():
+    rng = random.Random(106)
+    graph = BasicGraph()
+    for i in range(100):
+        graph.add_vertex(i)
+    for _ in range(400):
+        graph.add_edge(rng.randrange(100), rng.randrange(100), cost=rng.random())
+    frozen = graph.freeze()
+    distance, _ = frozen.shortest_path_costs(frozen.id_of(0))
+    for name in range(100):
+        path = graph.dijkstras_algorithm(0, name)
+        if path:
+            assert distance[frozen.id_of(name)] == pytest.approx(path[-1].cost)
+        else:
+            assert distance[frozen.id_of(name)] == INFINITY
+
+
+def test_from_arcs():
+    frozen = FrozenGraph.from_arcs('xyz', [(2, 0, 1.0), (0, 1, 2.0), (2, 1, 5.0)])
+    assert list(frozen.neighbors(0)) == [1]
+    assert list(frozen.neighbors(1)) == []
+    assert sorted(frozen.neighbors(2)) == [0, 1]
+    assert frozen.names_of(frozen.dijkstras_algorithm(2, 1)) == ['z', 'x', 'y']
+
+
+def test_inconsistent_arrays():
+    with pytest.raises(ValueError):
+        FrozenGraph(['a'], [0], [], [])
+
+
+def test_binary_round_trip(roads, tmp_path):
+    path = str(tmp_path / 'roads.bin')
+    frozen = roads.freeze()
+    frozen.write_binary(path)
+    copy = FrozenGraph.read_binary(path)
+    assert copy.names == frozen.names
+    assert list(copy.neighbors(0)) == list(frozen.neighbors(0))
+    assert copy.names_of(copy.dijkstras_algorithm(copy.id_of('a'), copy.id_of('d'))) == ['a', 'c', 'b', 'd']
+    roads.write_binary(path)
+    assert FrozenGraph.read_binary(path).num_arcs == 5
+
+
+def test_read_binary_unordered(tmp_path):
+    from campy.datastructures import graphio
+    path = str(tmp_path / 'unordered.bin')
+    graphio.write_binary(path, 'xyz', [2, 0, 2], [0, 1, 1], [1.0, 2.0, 5.0])
+    frozen = FrozenGraph.read_binary(path)
+    assert sorted(frozen.neighbors(2)) == [0, 1]
+    assert frozen.names_of(frozen.dijkstras_algorithm(2, 1)) == ['z', 'x', 'y']
+
+
+def test_read_binary_rejects_other_files(tmp_path):
+    path = tmp_path / 'text.txt'
+    path.write_text('{a, b}')
+    with pytest.raises(ValueError):
+        FrozenGraph.read_binary(str(path))
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_all_pairs_shortest_paths(workers):
+    rng = random.Random(106)
+    graph = BasicGraph()
+    for i in range(60):
+        graph.add_vertex(i)
+    for _ in range(200):
+        graph.add_edge(rng.randrange(60), rng.randrange(60), cost=rng.random())
+    frozen = graph.freeze()
+    results = dict(frozen.all_pairs_shortest_paths(workers=workers))
+    assert sorted(results) == list(range(60))
+    for source, distances in results.items():
+        assert list(distances) == list(frozen.shortest_path_costs(source)[0])
+
+    names = list(graph.node_map)
+    results = dict(graph.all_pairs_shortest_paths([0, graph.get_vertex(5)], workers=workers))
+    assert sorted(results) == [0, 5]
+    path = graph.dijkstras_algorithm(0, 7)
+    if path:
+        assert results[0][names.index(7)] == pytest.approx(path[-1].cost)
+
+
+def test_all_pairs_shortest_paths_from_concurrent_threads():
+    frozen = [FrozenGraph.from_arcs(range(n), [(i, i + 1, 1.0) for i in range(n - 1)]) for n in (20, 30)]
+    results = [None, None]
+
+    def run(index):
+        results[index] = dict(frozen[index].all_pairs_shortest_paths(workers=2))
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for graph, result in zip(frozen, results):
+        assert len(result) == graph.num_nodes
+        for source, distances in result.items():
+            assert list(distances) == list(graph.shortest_path_costs(source)[0])
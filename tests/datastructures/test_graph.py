@@ -1 +1,135 @@
 """Tests for the :mod:`campy.datastructures.graph` module."""
+from campy.datastructures.basicgraph import Edge, Vertex
+from campy.datastructures.graph import Graph
+
+
+def make_graph(names, pairs):
+    graph = Graph(Vertex, Edge)
+    nodes = {name: graph.add_node(Vertex(name)) for name in names}
+    for start, finish in pairs:
+        graph.add_arc(Edge(nodes[start], nodes[finish]))
+    return graph, nodes
+
+
+def test_add_arc_indexes_both_directions():
+    graph, nodes = make_graph('abc', ['ab', 'ac', 'cb'])
+    a, b, c = nodes['a'], nodes['b'], nodes['c']
+    assert graph.get_neighbors(a) == {b, c}
+    assert graph.get_inverse_neighbors(b) == {a, c}
+    assert graph.is_connected(a, b)
+    assert not graph.is_connected(b, a)
+    assert graph.is_connected('c', 'b', named=True)
+    assert len(graph.arcs) == 3
+
+
+def test_add_arc_by_nodes():
+    graph, nodes = make_graph('ab', [])
+    arc = graph.add_arc_by_nodes('a', 'b', named=True)
+    assert arc.start is nodes['a'] and arc.finish is nodes['b']
+    assert graph.get_arcs_between(nodes['a'], nodes['b']) == {arc}
+
+
+def test_remove_arc_by_nodes_removes_parallel_arcs():
+    graph, nodes = make_graph('ab', ['ab', 'ab', 'ba'])
+    a, b = nodes['a'], nodes['b']
+    graph.remove_arc_by_nodes(a, b)
+    assert not graph.is_connected(a, b)
+    assert graph.is_connected(b, a)
+    assert graph.get_inverse_arc_set(b) == set()
+    assert len(graph.arcs) == 1
+
+
+def test_remove_node_removes_incident_arcs():
+    graph, nodes = make_graph('abcd', ['ab', 'ba', 'bc', 'cd', 'bb'])
+    a, b, c, d = (nodes[name] for name in 'abcd')
+    graph.remove_node('b', named=True)
+    assert b not in graph.nodes
+    assert 'b' not in graph.node_map
+    assert graph.get_neighbors(a) == set()
+    assert graph.get_inverse_neighbors(c) == set()
+    assert graph.get_neighbors(c) == {d}
+    assert len(graph.arcs) == 1
+    assert not graph.is_connected(a, b)
+
+
+def test_add_existing_node_keeps_arcs():
+    graph, nodes = make_graph('ab', ['ab'])
+    a, b = nodes['a'], nodes['b']
+    assert graph.add_node(b) is b
+    assert graph.get_inverse_neighbors(b) == {a}
+    graph.remove_node(b)
+    assert len(graph.arcs) == 0
+    assert a.arcs == set()
+
+
+def test_clear():
+    graph, nodes = make_graph('ab', ['ab'])
+    graph.clear()
+    assert graph.is_empty()
+    assert not graph.is_connected(nodes['a'], nodes['b'])
+
+
+def test_text_round_trip():
+    import io
+    graph, nodes = make_graph('abc', ['ab', 'bc'])
+    graph.add_node(Vertex('with space, comma'))
+    graph.add_arc(Edge(nodes['a'], graph.node_map['with space, comma'], 2.5))
+    out = io.StringIO()
+    graph.write(out)
+    copy = Graph(Vertex, Edge).read(io.StringIO(out.getvalue()))
+    assert set(copy.node_map) == {'a', 'b', 'c', 'with space, comma'}
+    assert copy.is_connected('a', 'b', named=True)
+    assert copy.is_connected('b', 'c', named=True)
+    arc, = copy.get_arcs_between('a', 'with space, comma', named=True)
+    assert arc.cost == 2.5
+
+
+def test_read_stanford_format():
+    import io
+    graph = Graph(Vertex, Edge).read(io.StringIO('{a, b, a -> b : 3,\n b <-> c, d->a}'))
+    assert set(graph.node_map) == {'a', 'b', 'c', 'd'}
+    assert graph.is_connected('c', 'b', named=True) and graph.is_connected('b', 'c', named=True)
+    assert graph.is_connected('d', 'a', named=True)
+    arc, = graph.get_arcs_between('a', 'b', named=True)
+    assert arc.cost == 3.0
+
+
+def test_read_malformed():
+    import io
+    import pytest
+    with pytest.raises(ValueError):
+        Graph(Vertex, Edge).read(io.StringIO('a, b'))
+    with pytest.raises(ValueError):
+        Graph(Vertex, Edge).read(io.StringIO('{a, b'))
+    with pytest.raises(ValueError):
+        Graph(Vertex, Edge).read(io.StringIO('{a -> b -> c}'))
+
+
+def test_binary_round_trip(tmp_path):
+    graph, nodes = make_graph('abc', ['ab', 'bc', 'ca'])
+    path = str(tmp_path / 'graph.bin')
+    graph.write_binary(path)
+    copy = Graph(Vertex, Edge).read_binary(path)
+    assert set(copy.node_map) == {'a', 'b', 'c'}
+    assert len(copy.arcs) == 3
+    assert copy.is_connected('c', 'a', named=True)
+
+
+def test_missing_cost_is_the_same_in_every_format(tmp_path):
+    import io
+
+    class Arc():
+        pass
+
+    graph = Graph(Vertex, Arc)
+    a, b = graph.add_node(Vertex('a')), graph.add_node(Vertex('b'))
+    graph.add_arc_by_nodes(a, b)
+    out = io.StringIO()
+    graph.write(out)
+    text_arc, = Graph(Vertex, Edge).read(io.StringIO(out.getvalue())).get_arcs_between('a', 'b', named=True)
+    path = str(tmp_path / 'graph.bin')
+    graph.write_binary(path)
+    binary_arc, = Graph(Vertex, Edge).read_binary(path).get_arcs_between('a', 'b', named=True)
+    frozen = graph.freeze()
+    (_, frozen_cost), = frozen.arcs(frozen.id_of('a'))
+    assert text_arc.cost == binary_arc.cost == frozen_cost
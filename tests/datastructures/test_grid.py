@@ -1 +1,165 @@
 """Tests for the :mod:`campy.datastructures.grid` module."""
+import campy.datastructures.grid as grid_module
+from campy.datastructures.grid import Grid
+
+import pytest
+
+
+@pytest.fixture(params=['numpy', 'array'])
+def storage(request, monkeypatch):
+    """Run a test against NumPy-backed numeric grids (when available) and array-backed ones."""
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(grid_module, '_np', None)
+    return request.param
+
+
+def test_create_grid():
+    grid = Grid(2, 3, value=0)
+    assert len(grid) == 2
+    assert grid.width == 3
+    assert grid.height == 2
+    assert repr(grid) == '[[0, 0, 0], [0, 0, 0]]'
+    assert Grid().empty()
+
+
+def test_get_and_set():
+    grid = Grid(2, 3)
+    grid.set(0, 1, 'a')
+    grid[1, 2] = 'b'
+    grid[1][0] = 'c'
+    assert grid.get(0, 1) == 'a'
+    assert grid[1, 2] == 'b'
+    assert grid[1][0] == 'c'
+    assert grid.row(1) == ['c', None, 'b']
+    assert grid.col(1) == ['a', None]
+    with pytest.raises(IndexError):
+        grid.get(0, 3)
+
+
+def test_slice_region():
+    grid = Grid(3, 3)
+    for row in range(3):
+        for col in range(3):
+            grid[row, col] = 3 * row + col
+    assert grid[0:2, 1:].row(1) == [4, 5]
+    assert grid[:, 1].col(0) == [1, 4, 7]
+
+
+def test_row_slices_and_negative_indices():
+    grid = Grid(3, 2)
+    for row in range(3):
+        for col in range(2):
+            grid[row, col] = 2 * row + col
+    assert [list(row) for row in grid[0:2]] == [[0, 1], [2, 3]]
+    assert grid[::-1][0] == [4, 5]
+    assert grid[-1, 0] == grid[-1][0] == grid.get(2, -2) == 4
+    assert grid[-1, :].row(0) == [4, 5]
+    assert grid.row(-1) == [4, 5] and grid.col(-1) == [1, 3, 5]
+    grid[-1, -1] = 'x'
+    assert grid[2, 1] == 'x'
+    with pytest.raises(IndexError):
+        grid[-4, 0]
+    with pytest.raises(IndexError):
+        grid[3]
+
+
+def test_bool_dtype_is_rejected():
+    with pytest.raises(TypeError):
+        Grid(2, 2, value=False, dtype=bool)
+
+
+def test_copy_does_not_alias():
+    grid = Grid(2, 2, value=0)
+    copy = Grid.from_grid(grid)
+    copy[0, 0] = 1
+    assert grid[0, 0] == 0
+    assert copy != grid
+
+
+def test_numeric_grid(storage):
+    grid = Grid(2, 3, value=1, dtype=int)
+    assert grid.uses_numpy == (storage == 'numpy')
+    grid.apply(lambda x: x * 2)
+    assert grid.row(0) == [2, 2, 2]
+    assert grid.map(lambda cells: cells + 1, vectorized=True).row(1) == [3, 3, 3]
+    grid.fill(7)
+    assert grid.col(2) == [7, 7]
+    assert grid == Grid(2, 3, value=7, dtype=int)
+
+
+def test_lossy_results_raise(storage):
+    grid = Grid(2, 2, value=1, dtype=int)
+    with pytest.raises(TypeError):
+        grid.map(lambda x: x / 2)
+    with pytest.raises(TypeError):
+        grid.map(lambda cells: cells / 2, vectorized=True)
+    with pytest.raises(TypeError):
+        grid.apply(lambda x: x / 2)
+    with pytest.raises(TypeError):
+        grid.step(lambda value, total: total / 8)
+    assert grid.row(0) == [1, 1]
+    assert grid.map(lambda x: x + 1).row(1) == [2, 2]
+    assert Grid(2, 2, value=1, dtype=float).map(lambda x: x / 2).row(0) == [0.5, 0.5]
+
+
+def test_resize_retain(storage):
+    grid = Grid(2, 3, value=0, dtype='i')
+    grid[0, 0] = 1
+    grid[1, 2] = 2
+    grid.resize(3, 2, retain=True)
+    assert repr(grid) == '[[1, 0], [0, 0], [0, 0]]'
+    grid.resize(1, 1)
+    assert repr(grid) == '[[0]]'
+
+
+def life(alive, num_neighbors):
+    return 1 if num_neighbors == 3 or (alive and num_neighbors == 2) else 0
+
+
+def test_neighbors():
+    grid = Grid(3, 3)
+    assert grid.neighbors(0, 0) == [(0, 1), (1, 0)]
+    assert len(grid.neighbors(1, 1)) == 4
+    assert len(grid.neighbors(1, 1, diagonal=True)) == 8
+    assert grid.neighbors(2, 2, diagonal=True) == [(1, 1), (1, 2), (2, 1)]
+
+
+def test_flood_fill():
+    grid = Grid(3, 4, value='.')
+    for row in range(3):
+        grid[row, 1] = '#'
+    assert grid.flood_fill(0, 0, 'o') == 3
+    assert grid.col(0) == ['o', 'o', 'o']
+    assert grid.col(2) == ['.', '.', '.']
+    assert grid.flood_fill(0, 0, 'o') == 0
+
+
+def test_stencil_apply(storage):
+    grid = Grid(3, 3, value=0, dtype=int)
+    grid[1, 1] = 4
+    plus = [[0, 1, 0], [1, 1, 1], [0, 1, 0]]
+    assert repr(grid.stencil_apply(plus)) == '[[0, 4, 0], [4, 4, 4], [0, 4, 0]]'
+    assert grid.stencil_apply([[0.25]]).row(1) == [0.0, 1.0, 0.0]
+    assert grid.stencil_apply([[1, 1, 1]], boundary=1).row(0) == [1, 0, 1]
+    with pytest.raises(ValueError):
+        grid.stencil_apply([[1, 1]])
+
+
+def test_step_blinker(storage):
+    grid = Grid(5, 5, value=0, dtype=int)
+    for col in (1, 2, 3):
+        grid[2, col] = 1
+    grid.step(life)
+    assert grid.col(2) == [0, 1, 1, 1, 0]
+    assert sum(grid.row(2)) == 1
+    grid.step(lambda alive, n: (n == 3) | ((alive == 1) & (n == 2)), vectorized=storage == 'numpy')
+    assert grid.row(2) == [0, 1, 1, 1, 0]
+
+
+def test_step_untyped_grid():
+    grid = Grid(3, 3, value=0)
+    grid[0, 0] = grid[0, 1] = grid[1, 0] = 1
+    grid.step(life)
+    assert repr(grid) == '[[1, 1, 0], [1, 1, 0], [0, 0, 0]]'
@@ -1,6 +1,14 @@
 """Tests for the :mod:`campy.datastructures.lexicon` module."""
 from campy.datastructures.lexicon import Lexicon
 
+import pathlib
+import time
+
+import pytest
+
+# The full-size word lists that ship with the CS106B word ladder example.
+RESOURCES = pathlib.Path(__file__).resolve().parents[2] / 'examples' / 'cs106bx' / 'assign2' / 'wordladder' / 'res'
+
 
 def test_create_lexicon(tmp_path):
     f = tmp_path / 'small.lex'
@@ -17,3 +25,135 @@ def test_create_lexicon(tmp_path):
     assert 'aardvark' in it
     assert next(it) == 'balloon'
 
+
+def _dawg_edge(letter, children=0, last=False, accept=False):
+    return ((children << 8) | (accept << 6) | (last << 5) | (ord(letter) - ord('a') + 1)).to_bytes(4, 'big')
+
+
+def test_load_lexicon_from_dawg(tmp_path):
+    # The words 'a', 'at', and 'be'.
+    edges = b''.join([
+        b'\x00\x00\x00\x00',  # Index 0 is reserved to mean "no children".
+        _dawg_edge('t', last=True, accept=True),  # 1: Children of 'a'.
+        _dawg_edge('e', last=True, accept=True),  # 2: Children of 'b'.
+        _dawg_edge('a', children=1, accept=True),  # 3: The root list.
+        _dawg_edge('b', children=2, last=True),  # 4
+    ])
+    f = tmp_path / 'small.dat'
+    f.write_bytes('DAWG:3:{}:'.format(len(edges)).encode() + edges)
+
+    lex = Lexicon(str(f))
+    assert len(lex) == 3
+    assert list(lex) == ['a', 'at', 'be']
+    assert 'AT' in lex
+    assert 'b' not in lex
+    assert lex.contains_prefix('b')
+    assert not lex.contains_prefix('c')
+
+    # Modifying a DAWG-backed lexicon copies its words into a trie.
+    lex.add('bee')
+    assert list(lex) == ['a', 'at', 'be', 'bee']
+
+
+def test_bulk_add_and_remove():
+    lex = Lexicon.from_words(['cat', 'Cats', 'cot', 'dog', '', 'c4t'])
+    assert len(lex) == 4
+    assert list(lex) == ['cat', 'cats', 'cot', 'dog']
+
+    assert lex.remove('cat')
+    assert not lex.remove('cat')
+    assert 'cats' in lex
+    assert lex.contains_prefix('ca')
+
+    assert lex.remove_prefix('c')
+    assert not lex.contains_prefix('c')
+    assert list(lex) == ['dog']
+
+
+@pytest.mark.skipif(not (RESOURCES / 'dictionary.txt').is_file(), reason='Full dictionary is not available.')
+def test_benchmark_full_dictionary():
+    # Run with `pytest -s` to see the timings.
+    path = RESOURCES / 'dictionary.txt'
+    words = path.read_text().split()
+
+    start = time.perf_counter()
+    lex = Lexicon(str(path))
+    loaded = time.perf_counter()
+    assert all(word in lex for word in words)
+    looked_up = time.perf_counter()
+    assert all(lex.contains_prefix(word[:3]) for word in words)
+    prefixed = time.perf_counter()
+    assert list(lex) == sorted(words)
+    iterated = time.perf_counter()
+
+    assert len(lex) == len(words)
+    print()
+    print('Loaded {} words in {:.3f}s'.format(len(words), loaded - start))
+    print('Checked membership in {:.3f}s'.format(looked_up - loaded))
+    print('Checked prefixes in {:.3f}s'.format(prefixed - looked_up))
+    print('Iterated in {:.3f}s'.format(iterated - prefixed))
+
+
+def test_words_with_prefix():
+    lex = Lexicon.from_words(['car', 'cart', 'carton', 'cat', 'dog'])
+    assert list(lex.words_with_prefix('car')) == ['car', 'cart', 'carton']
+    assert list(lex.words_with_prefix('CA')) == ['car', 'cart', 'carton', 'cat']
+    assert list(lex.words_with_prefix('cz')) == []
+    assert list(lex.words_with_prefix('')) == list(lex)
+
+
+def test_match_wildcards():
+    lex = Lexicon.from_words(['cat', 'cot', 'coat', 'cut', 'act', 'scat'])
+    assert list(lex.match('c?t')) == ['cat', 'cot', 'cut']
+    assert list(lex.match('c*t')) == ['cat', 'coat', 'cot', 'cut']
+    assert list(lex.match('*c*t')) == ['act', 'cat', 'coat', 'cot', 'cut', 'scat']
+    assert list(lex.match('c??')) == ['cat', 'cot', 'cut']
+    assert list(lex.match('d*')) == []
+
+
+def test_neighbors():
+    lex = Lexicon.from_words(['at', 'bat', 'cat', 'chat', 'cot', 'dog', 'scat'])
+    assert list(lex.neighbors('cat')) == ['at', 'bat', 'chat', 'cot', 'scat']
+    assert list(lex.neighbors('cat', same_length=True)) == ['bat', 'cot']
+    assert 'dog' not in set(lex.neighbors('cat', max_edits=2))
+    assert 'dog' in set(lex.neighbors('cat', max_edits=3))
+
+
+def test_save_and_load_binary(tmp_path):
+    words = ['bat', 'bats', 'cat', 'cats', 'dog']
+    f = tmp_path / 'words.dat'
+    Lexicon.from_words(words).save(str(f))
+
+    lex = Lexicon(str(f))
+    assert list(lex) == words
+    assert len(lex) == len(words)
+
+
+def test_cached_lexicon_tracks_source(tmp_path):
+    source = tmp_path / 'words.txt'
+    source.write_text('apple\nbanana\n')
+
+    lex = Lexicon(str(source), cache=True)
+    assert list(lex) == ['apple', 'banana']
+    assert (tmp_path / 'words.txt.lexcache').is_file()
+
+    # The second load comes from the cache.
+    lex = Lexicon(str(source), cache=True)
+    assert list(lex) == ['apple', 'banana']
+    assert lex._dawg is not None
+
+    # Changing the source invalidates the cache.
+    source.write_text('apple\ncherry\ndate\n')
+    lex = Lexicon(str(source), cache=True)
+    assert list(lex) == ['apple', 'cherry', 'date']
+    assert list(Lexicon(str(source), cache=True)) == ['apple', 'cherry', 'date']
+
+
+def test_cached_lexicon_in_cache_directory(tmp_path):
+    source = tmp_path / 'words.txt'
+    source.write_text('apple\nbanana\n')
+    cache_dir = tmp_path / 'cache'
+
+    Lexicon(str(source), cache=str(cache_dir))
+    assert len(list(cache_dir.iterdir())) == 1
+    assert list(Lexicon(str(source), cache=str(cache_dir))) == ['apple', 'banana']
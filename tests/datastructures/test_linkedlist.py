@@ -1 +1,127 @@
 """Tests for the :mod:`campy.datastructures.linkedlist` module."""
+from campy.datastructures.linkedlist import LinkedList
+
+import random
+
+import pytest
+
+
+def test_ends():
+    lst = LinkedList([2, 3])
+    lst.appendleft(1)
+    lst.append(4)
+    lst.add(5)
+    assert list(lst) == [1, 2, 3, 4, 5]
+    assert list(reversed(lst)) == [5, 4, 3, 2, 1]
+    assert lst.popleft() == 1
+    assert lst.pop() == 5
+    assert len(lst) == 3
+    assert lst.head.value == 2 and lst.tail.value == 4
+    empty = LinkedList()
+    with pytest.raises(IndexError):
+        empty.pop()
+    with pytest.raises(IndexError):
+        empty.popleft()
+
+
+def test_matches_list_behavior():
+    rng = random.Random(106)
+    lst, expected = LinkedList(), []
+    for _ in range(2000):
+        op = rng.randrange(6)
+        if op == 0 or not expected:
+            index = rng.randrange(-len(expected) - 1, len(expected) + 2)
+            lst.insert(index, _)
+            expected.insert(index, _)
+        elif op == 1:
+            index = rng.randrange(-len(expected), len(expected))
+            assert lst[index] == expected[index]
+        elif op == 2:
+            index = rng.randrange(len(expected))
+            lst[index] = -_
+            expected[index] = -_
+        elif op == 3:
+            index = rng.randrange(len(expected))
+            del lst[index]
+            del expected[index]
+        elif op == 4:
+            index = rng.randrange(len(expected))
+            assert lst.pop(index) == expected.pop(index)
+        else:
+            assert lst.index(expected[-1]) == expected.index(expected[-1])
+        assert len(lst) == len(expected)
+    assert list(lst) == expected
+
+
+def test_slices():
+    lst = LinkedList(range(10))
+    assert lst[2:5] == LinkedList([2, 3, 4])
+    assert list(lst[::-3]) == [9, 6, 3, 0]
+    lst[2:5] = 'ab'
+    assert list(lst) == [0, 1, 'a', 'b', 5, 6, 7, 8, 9]
+    lst[::2] = [None] * 5
+    assert list(lst) == [None, 1, None, 'b', None, 6, None, 8, None]
+    del lst[1::2]
+    assert list(lst) == [None] * 5
+    with pytest.raises(ValueError):
+        lst[::2] = [1]
+
+
+def test_slice_assignment_from_itself():
+    lst = LinkedList([1, 2, 3])
+    lst[2:2] = lst
+    assert list(lst) == [1, 2, 1, 2, 3, 3]
+    lst[:] = lst
+    assert list(lst) == [1, 2, 1, 2, 3, 3]
+    lst[1:] = (value * 10 for value in lst)
+    assert list(lst) == [1, 10, 20, 10, 20, 30, 30]
+
+
+def test_splice():
+    first, second = LinkedList([1, 2]), LinkedList([3, 4])
+    first.splice(second)
+    assert list(first) == [1, 2, 3, 4]
+    assert len(second) == 0 and second.head is None
+    first.splice(LinkedList(['a', 'b']), 0)
+    first.splice(LinkedList(['c']), 3)
+    assert list(first) == ['a', 'b', 1, 'c', 2, 3, 4]
+    assert list(reversed(first)) == [4, 3, 2, 'c', 1, 'b', 'a']
+    first.splice(LinkedList())
+    assert len(first) == 7
+    with pytest.raises(ValueError):
+        first.splice(first)
+
+
+def test_cursor_editing():
+    lst = LinkedList([1, 2, 3, 4])
+    cursor = lst.cursor()
+    for value in cursor:
+        if value % 2 == 0:
+            cursor.remove()
+    assert list(lst) == [1, 3]
+    assert cursor.at_end
+    cursor.insert_before(5)
+    assert list(lst) == [1, 3, 5]
+    assert cursor.move_prev() and cursor.value == 5
+    cursor.insert_after(6)
+    cursor.insert_before(4)
+    cursor.value = 'five'
+    assert list(lst) == [1, 3, 4, 'five', 6]
+    cursor.splice(LinkedList(['x']))
+    assert list(lst) == [1, 3, 4, 'x', 'five', 6]
+    assert list(reversed(lst)) == [6, 'five', 'x', 4, 3, 1]
+
+
+def test_cursor_is_stable_and_detects_removal():
+    lst = LinkedList('abc')
+    cursor = lst.cursor(1)
+    lst.appendleft('z')
+    lst.append('d')
+    assert cursor.value == 'b'
+    other = lst.cursor(2)
+    other.remove()
+    with pytest.raises(ValueError):
+        cursor.value
+    assert lst.cursor(len(lst)).at_end
+    with pytest.raises(IndexError):
+        lst.cursor(len(lst)).value
@@ -1 +1,149 @@
 """Tests for the :mod:`campy.datastructures.pqueue` module."""
+from campy.datastructures.pqueue import PriorityQueue
+
+import random
+
+import pytest
+
+
+def drain(pq):
+    return [pq.dequeue() for _ in range(len(pq))]
+
+
+def test_orders_by_priority():
+    pq = PriorityQueue([(3, 'c'), (1, 'a'), (2, 'b')])
+    assert len(pq) == 3
+    assert pq.peek() == (1, 'a')
+    assert drain(pq) == ['a', 'b', 'c']
+
+
+def test_priorities_last_initializer():
+    pq = PriorityQueue([('c', 3), ('a', 1)], priorities_first=False)
+    assert drain(pq) == ['a', 'c']
+
+
+def test_ties_are_fifo_and_values_unorderable():
+    pq = PriorityQueue()
+    values = [object() for _ in range(10)]
+    for value in values:
+        pq.add(value, 0)
+    assert drain(pq) == values
+
+
+def test_change_priority():
+    pq = PriorityQueue()
+    for i, value in enumerate('abcde'):
+        pq.add(value, i)
+    pq.change_priority('e', -1)
+    pq.change_priority('a', 10)
+    assert pq.peek() == (-1, 'e')
+    assert drain(pq) == ['e', 'b', 'c', 'd', 'a']
+    with pytest.raises(KeyError):
+        pq.change_priority('z', 0)
+
+
+def test_remove_value_and_contains():
+    pq = PriorityQueue([(i, i) for i in range(10)])
+    assert 5 in pq
+    assert pq.remove(5) == 5
+    assert 5 not in pq
+    assert pq.remove() == 0
+    assert drain(pq) == [1, 2, 3, 4, 6, 7, 8, 9]
+    with pytest.raises(KeyError):
+        pq.remove(5)
+    with pytest.raises(IndexError):
+        pq.dequeue()
+
+
+def test_duplicates_change_oldest_copy():
+    pq = PriorityQueue()
+    pq.add('x', 1)
+    pq.add('x', 2)
+    pq.change_priority('x', 3)
+    assert pq.peek() == (2, 'x')
+    pq.remove('x')  # The oldest copy, now at priority 3.
+    assert pq.peek() == (2, 'x')
+    pq.remove('x')
+    assert 'x' not in pq
+
+
+def test_unhashable_values():
+    pq = PriorityQueue()
+    pq.add([1], 2)
+    pq.add([2], 1)
+    assert [1] in pq
+    pq.change_priority([1], 0)
+    assert pq.remove([1]) == [1]
+    assert drain(pq) == [[2]]
+
+
+def test_matches_sorted_order_under_random_updates():
+    rng = random.Random(106)
+    pq = PriorityQueue()
+    expected = {}
+    for value in range(500):
+        priority = rng.randrange(100)
+        pq.add(value, priority)
+        expected[value] = priority
+    for value in rng.sample(range(500), 200):
+        priority = rng.randrange(100)
+        pq.change_priority(value, priority)
+        expected[value] = priority
+    for value in rng.sample(range(500), 100):
+        pq.remove(value)
+        del expected[value]
+    assert drain(pq) == sorted(expected, key=lambda value: (expected[value], value))
+
+
+def test_equality():
+    assert PriorityQueue([(1, 'a'), (2, 'b')]) == PriorityQueue([(2, 'b'), (1, 'a')])
+    assert PriorityQueue([(1, 'a')]) != PriorityQueue([(1, 'b')])
+
+
+def test_extend_small_and_large_batches():
+    pq = PriorityQueue([(i, i) for i in range(100)])
+    pq.extend([(-1, 'first')])
+    pq.extend([('last', 1000)], priorities_first=False)
+    pq.extend((i + 0.5, i + 0.5) for i in range(100))
+    values = drain(pq)
+    assert values[0] == 'first' and values[-1] == 'last'
+    assert values[1:-1] == sorted(values[1:-1])
+    assert len(values) == 202
+
+
+def test_merge_keeps_other_and_fifo_order():
+    pq = PriorityQueue([(1, 'a'), (1, 'b')])
+    other = PriorityQueue([(1, 'c'), (0, 'z'), (1, 'd')])
+    pq.merge(other)
+    assert len(other) == 3
+    assert drain(pq) == ['z', 'a', 'b', 'c', 'd']
+    pq.add('e', 1)
+    pq.merge(other)
+    assert drain(pq) == ['z', 'e', 'c', 'd']
+
+
+def test_pop_many():
+    pq = PriorityQueue([(i, i) for i in reversed(range(10))])
+    assert pq.pop_many(2) == [0, 1]
+    assert pq.pop_many(6) == [2, 3, 4, 5, 6, 7]
+    assert 5 not in pq
+    pq.add(-1, -1)
+    assert pq.pop_many(100) == [-1, 8, 9]
+    assert pq.pop_many(1) == []
+
+
+def test_nsmallest_does_not_mutate():
+    pq = PriorityQueue([(3, 'c'), (1, 'a'), (2, 'b')])
+    assert pq.nsmallest(2) == [(1, 'a'), (2, 'b')]
+    assert len(pq) == 3
+
+
+def test_drain():
+    pq = PriorityQueue([(2, 'b'), (1, 'a')])
+    seen = []
+    for value in pq.drain():
+        seen.append(value)
+        if value == 'a':
+            pq.add('c', 3)
+    assert seen == ['a', 'b', 'c']
+    assert len(pq) == 0
@@ -3,10 +3,14 @@
 # 3.7.2 (default, Dec 27 2018, 07:35:06) \n[Clang 10.0.0 (clang-1000.11.45.5)]
 # on macOS 10.14.2
 
-from campy.datastructures.shuffle import shuffle
+from campy.datastructures.shuffle import shuffle, shuffled_iter
+from campy.util.randomgenerator import RandomGenerator
 
+import itertools
 import random
 
+import pytest
+
 
 def test_shuffle_list():
     random.seed(41)
@@ -43,3 +47,39 @@ def test_shuffle_bytearray():
 
 # def test_shuffle_noniterable():
 
+
+@pytest.mark.parametrize('n', [0, 1, 2, 3, 10, 1000, 4097])
+def test_shuffled_iter_sequence_is_permutation(n):
+    assert sorted(shuffled_iter(range(n))) == list(range(n))
+
+
+def test_shuffled_iter_actually_shuffles():
+    orders = {tuple(shuffled_iter(range(8), random=RandomGenerator(seed=seed))) for seed in range(20)}
+    assert len(orders) > 10
+
+
+def test_shuffled_iter_is_reproducible_with_seed():
+    first = list(shuffled_iter('abcdefghij', random=RandomGenerator(seed=106)))
+    second = list(shuffled_iter('abcdefghij', random=RandomGenerator(seed=106)))
+    assert first == second
+    assert sorted(first) == list('abcdefghij')
+
+
+def test_shuffled_iter_huge_range_is_lazy():
+    rng = RandomGenerator(seed=106)
+    head = list(itertools.islice(shuffled_iter(range(10 ** 8), random=rng), 1000))
+    assert len(set(head)) == 1000
+    assert all(0 <= value < 10 ** 8 for value in head)
+
+
+def test_shuffled_iter_stream():
+    stream = (x for x in range(500))
+    result = list(shuffled_iter(stream, random=RandomGenerator(seed=106), buffer_size=50))
+    assert sorted(result) == list(range(500))
+    assert result != list(range(500))
+    with pytest.raises(ValueError):
+        list(shuffled_iter(iter([1]), buffer_size=0))
+
+
+def test_shuffle_with_generator():
+    assert shuffle([1, 2, 3, 4, 5], random=RandomGenerator(seed=1)) == shuffle([1, 2, 3, 4, 5], random=RandomGenerator(seed=1))
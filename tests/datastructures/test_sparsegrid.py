@@ -1 +1,71 @@
 """Tests for the :mod:`campy.datastructures.sparsegrid` module."""
+from campy.datastructures.grid import Grid
+from campy.datastructures.sparsegrid import SparseGrid
+
+import pytest
+
+
+def test_default_value():
+    grid = SparseGrid(1000, 1000, value=0)
+    assert grid[3, 4] == 0
+    assert len(grid) == 0
+    grid[3, 4] = 5
+    grid[999][0] = 6
+    assert grid[3, 4] == 5
+    assert grid[999][0] == 6
+    assert len(grid) == 2
+    assert (3, 4) in grid
+    assert (4, 3) not in grid
+    del grid[3, 4]
+    assert grid[3, 4] == 0
+    with pytest.raises(IndexError):
+        grid[1000, 0]
+
+
+def test_iteration_only_visits_set_cells():
+    grid = SparseGrid(10 ** 6, 10 ** 6)
+    grid[5, 5] = 'a'
+    grid[2, 7] = 'b'
+    assert sorted(grid) == [(2, 7), (5, 5)]
+    assert sorted(grid.items()) == [((2, 7), 'b'), ((5, 5), 'a')]
+    assert grid.bounding_box() == (2, 5, 5, 7)
+    assert SparseGrid(3, 3).bounding_box() is None
+
+
+def test_fill_resets_default():
+    grid = SparseGrid(10 ** 6, 10 ** 6, value=0)
+    grid[1, 1] = 1
+    grid.fill(7)
+    assert len(grid) == 0
+    assert grid[1, 1] == 7
+
+
+def test_equality():
+    first = SparseGrid(3, 3, value=0)
+    second = SparseGrid(3, 3, value=0)
+    first[1, 1] = 4
+    assert first != second
+    second[1, 1] = 4
+    second[2, 2] = 0  # Explicitly setting the default value doesn't change the grid.
+    assert first == second
+    assert first != SparseGrid(3, 4, value=0)
+    assert SparseGrid(2, 2, value=0) != SparseGrid(2, 2, value=1)
+
+
+def test_dense_conversion():
+    grid = SparseGrid.from_2d_iterable([[0, 0, 1], [0, 2, 0]], value=0)
+    assert (grid.rows, grid.cols) == (2, 3)
+    assert len(grid) == 2
+
+    dense = grid.to_dense()
+    assert isinstance(dense, Grid)
+    assert repr(dense) == '[[0, 0, 1], [0, 2, 0]]'
+    assert SparseGrid.from_grid(dense, value=0) == grid
+
+
+def test_resize_drops_out_of_bounds_cells():
+    grid = SparseGrid(5, 5)
+    grid[1, 1] = 'kept'
+    grid[4, 4] = 'dropped'
+    grid.resize(3, 3)
+    assert list(grid.items()) == [((1, 1), 'kept')]
@@ -12,3 +12,39 @@ def test_close_operation_do_nothing_exists():
     assert CloseOperation.DO_NOTHING in CloseOperation
 
 # TODO(sredmond): Add WAY more tests.
+
+
+def test_batch_defers_redraw_to_outermost_batch(monkeypatch):
+    from campy.private.backends.tk.backend_tk import TkWindow
+    import campy.graphics.gwindow as gwindow_module
+
+    class StubMaster:
+        redraws = 0
+
+        def update_idletasks(self):
+            self.redraws += 1
+
+    tkwin = TkWindow.__new__(TkWindow)
+    tkwin._master = StubMaster()
+    tkwin._closed = False
+    tkwin._batch_depth = 0
+    tkwin._dirty = False
+
+    class StubPlatform:
+        def gwindow_begin_batch(self, gwindow):
+            gwindow._tkwin.begin_batch()
+
+        def gwindow_end_batch(self, gwindow):
+            gwindow._tkwin.end_batch()
+
+    monkeypatch.setattr(gwindow_module._platform, 'Platform', StubPlatform)
+    window = GWindow.__new__(GWindow)  # Skip GWindow.__init__, which opens a real window.
+    window._tkwin = tkwin
+    with window.batch() as batched:
+        assert batched is window
+        with window.batch():
+            tkwin.request_update()
+        tkwin.request_update()
+        assert tkwin._master.redraws == 0
+    assert tkwin._master.redraws == 1
+    assert tkwin._batch_depth == 0
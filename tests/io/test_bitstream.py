@@ -1,8 +1,10 @@
 """Tests for the :mod:`campy.io.bitstream` module."""
-from campy.io.bitstream import ibitstream, obitstream, ifbitstream, ofbitstream, istringbitstream, ostringbitstream
+from campy.io.bitstream import ibitstream, obitstream, ifbitstream, ofbitstream, istringbitstream, ostringbitstream, PSEUDO_EOF
 
 import os
 
+import pytest
+
 
 def bytes_to_bits(message):
     """Convert a bytes message to a sequence of bits.
@@ -48,3 +50,69 @@ def test_write_to_buffered_string_stream():
         for bit in bytes_to_bits(message):
             stream.writebit(bit)
         assert stream.getvalue() == message
+
+
+def test_read_and_write_many_bits():
+    with ostringbitstream() as stream:
+        stream.writebits(0b101, 3)
+        stream.write_code((0b11, 2))
+        stream.write_code('010')
+        stream.writebits(0xDEADBEEFCAFE, 48)
+        value = stream.getvalue()
+    assert value[0] == 0b10111010
+    with istringbitstream(value) as stream:
+        assert stream.readbits(5) == 0b10111
+        assert stream.readbits(3) == 0b010
+        assert stream.readbits(48) == 0xDEADBEEFCAFE
+        assert stream.readbit() == PSEUDO_EOF
+
+
+def test_readbits_past_end_consumes_nothing():
+    with istringbitstream(b'\xff') as stream:
+        with pytest.raises(EOFError):
+            stream.readbits(9)
+        assert stream.readbits(8) == 0xFF
+
+
+def test_writebits_rejects_values_that_do_not_fit():
+    with ostringbitstream() as stream:
+        with pytest.raises(ValueError):
+            stream.writebits(4, 2)
+
+
+def test_large_round_trip():
+    codes = [(index % 1000, 10) for index in range(200000)]
+    with ostringbitstream() as stream:
+        for code in codes:
+            stream.write_code(code)
+        value = stream.getvalue()
+    assert len(value) == 250000
+    with istringbitstream(value) as stream:
+        assert [stream.readbits(10) for _ in codes] == [code for code, _ in codes]
+
+
+def test_partial_byte_completed_by_later_bits():
+    with ostringbitstream() as stream:
+        stream.writebit(1)
+        assert stream.getvalue() == b'\x80'
+        stream.writebits(1, 7)
+        assert stream.getvalue() == b'\x81'
+
+
+def test_mixed_byte_and_bit_reads():
+    with istringbitstream(b'ab\xf0c') as stream:
+        assert stream.read(1) == b'a'
+        assert stream.readbits(8) == ord('b')
+        assert stream.readbits(4) == 0xF
+        assert stream.tell() == 3
+        assert stream.read() == b'c'
+        assert stream.rewind()
+        assert stream.readbits(8) == ord('a')
+
+
+def test_mixed_byte_and_bit_writes():
+    with ostringbitstream() as stream:
+        stream.writebits(0b1, 1)
+        stream.write(b'x')
+        stream.writebits(0xFF, 8)
+        assert stream.getvalue() == b'\x80x\xff'
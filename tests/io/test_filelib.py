@@ -1 +1,87 @@
 """Tests for the :mod:`campy.io.filelib` module."""
+from campy.io.filelib import (find_on_path, list_directory, match_filename_pattern, open_on_path,
+                              walk_directory)
+import os
+import pytest
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for name in ['b.txt', 'a.png', 'sub/c.png', 'sub/deeper/d.png', 'sub/deeper/e.txt', 'other/f.png']:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(name)
+    return tmp_path
+
+
+@pytest.mark.parametrize('filename, pattern, expected', [
+    ('maze3.txt', 'maze[0-9].*', True),
+    ('mazeA.txt', 'maze[0-9].*', False),
+    ('mazeA.txt', 'maze[^0-9].txt', True),
+    ('a.b', 'a?b', True),
+    ('ab', 'a?b', False),
+    ('a.b', 'a.*', True),
+    ('a+b', 'a+b', True),
+    ('aab', 'a+b', False),
+    ('', '*', True),
+    ('x', '[]', False),
+])
+def test_match_filename_pattern(filename, pattern, expected):
+    assert match_filename_pattern(filename, pattern) == expected
+
+
+def test_match_filename_pattern_missing_bracket():
+    with pytest.raises(ValueError):
+        match_filename_pattern('a', '[a')
+
+
+def test_list_directory(tree):
+    assert list_directory(str(tree)) == ['a.png', 'b.txt', 'other', 'sub']
+    assert list_directory(str(tree), '*.png') == ['a.png']
+
+
+@pytest.mark.parametrize('workers', [None, 4])
+def test_walk_directory(tree, workers):
+    expected = ['a.png', 'b.txt', 'other/f.png', 'sub/c.png', 'sub/deeper/d.png', 'sub/deeper/e.txt']
+    found = [os.path.relpath(path, str(tree)).replace(os.sep, '/')
+             for path in walk_directory(str(tree), workers=workers)]
+    assert found == expected
+    pngs = [os.path.basename(path) for path in walk_directory(str(tree), '*.png', workers=workers)]
+    assert pngs == ['a.png', 'f.png', 'c.png', 'd.png']
+
+
+def test_walk_missing_directory(tmp_path):
+    with pytest.raises(OSError):
+        list(walk_directory(str(tmp_path / 'missing')))
+
+
+def test_find_and_open_on_path(tree):
+    search = os.pathsep.join([str(tree / 'missing'), str(tree / 'sub'), str(tree)])
+    assert find_on_path(search, 'c.png') == os.path.join(str(tree / 'sub'), 'c.png')
+    assert find_on_path([str(tree), str(tree / 'sub')], 'deeper/d.png') == os.path.join(str(tree / 'sub'), 'deeper/d.png')
+    assert find_on_path(search, 'nowhere.png') is None
+    with open_on_path(search, 'b.txt') as f:
+        assert f.read() == 'b.txt'
+
+
+def test_find_on_path_rechecks_cached_files(tree):
+    search = [str(tree / 'sub'), str(tree)]
+    assert find_on_path(search, 'c.png') == os.path.join(str(tree / 'sub'), 'c.png')
+    (tree / 'c.png').write_text('c.png')
+    (tree / 'sub' / 'c.png').unlink()
+    assert find_on_path(search, 'c.png') == os.path.join(str(tree), 'c.png')
+
+
+def test_find_on_path_does_not_cache_misses(tree):
+    search = [str(tree)]
+    assert find_on_path(search, 'new.txt') is None
+    (tree / 'new.txt').write_text('new')
+    assert find_on_path(search, 'new.txt') == os.path.join(str(tree), 'new.txt')
+
+
+@pytest.mark.skipif(os.pathsep == ';', reason='; separates search paths on Windows')
+def test_find_on_path_splits_on_the_platform_separator(tree):
+    directory = tree / 'semi;colon'
+    directory.mkdir()
+    (directory / 'g.txt').write_text('g')
+    assert find_on_path(str(directory), 'g.txt') == os.path.join(str(directory), 'g.txt')
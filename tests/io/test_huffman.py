@@ -0,0 +1,97 @@
+"""Tests for the :mod:`campy.io.huffman` module."""
+from campy.io.bitstream import PSEUDO_EOF, istringbitstream, ostringbitstream
+from campy.io.huffman import HuffmanCode, TABLE_BITS, count_frequencies, decode, decode_file, decode_stream, encode, encode_file, encode_stream
+
+import io
+import os
+import random
+
+import pytest
+
+
+@pytest.mark.parametrize('data', [b'', b'a', b'ab', b'abracadabra', bytes(range(256)) * 3])
+def test_round_trip(data):
+    assert decode(encode(data)) == data
+
+
+def test_round_trip_random():
+    rng = random.Random(106)
+    data = bytes(rng.choice(b'aaaaaaaabbbbccd\x00\xff') for _ in range(100000))
+    compressed = encode(data)
+    assert len(compressed) < len(data) // 3
+    assert decode(compressed) == data
+
+
+def test_codes_longer_than_table():
+    # Doubling frequencies give codes of every length, including some longer than the decoding table.
+    data = b''.join(bytes([symbol]) * (1 << symbol) for symbol in range(TABLE_BITS + 4))
+    data = bytes(random.Random(106).sample(data, len(data)))
+    code = HuffmanCode.from_data(data)
+    assert code.max_length > TABLE_BITS
+    assert decode(encode(data, code)) == data
+
+
+def test_count_frequencies():
+    frequencies = count_frequencies(b'hello')
+    assert frequencies == {ord('h'): 1, ord('e'): 1, ord('l'): 2, ord('o'): 1}
+    count_frequencies(memoryview(b'll'), frequencies)
+    assert frequencies[ord('l')] == 4
+
+
+def test_canonical_codes():
+    code = HuffmanCode({ord('a'): 1, ord('b'): 2, PSEUDO_EOF: 2})
+    assert code.codes == {ord('a'): (0b0, 1), ord('b'): (0b10, 2), PSEUDO_EOF: (0b11, 2)}
+
+
+def test_optimal_code_lengths():
+    code = HuffmanCode.from_frequencies({ord('a'): 10, ord('b'): 5, ord('c'): 2})
+    assert code.lengths == {ord('a'): 1, ord('b'): 2, ord('c'): 3, PSEUDO_EOF: 3}
+
+
+def test_invalid_codes():
+    with pytest.raises(ValueError):
+        HuffmanCode({ord('a'): 1})
+    with pytest.raises(ValueError):
+        HuffmanCode({ord('a'): 1, ord('b'): 1, PSEUDO_EOF: 1})
+
+
+def test_header_round_trip():
+    code = HuffmanCode.from_data(b'mississippi')
+    with ostringbitstream() as stream:
+        code.write_header(stream)
+        header = stream.getvalue()
+    assert HuffmanCode.read_header(io.BytesIO(header)).codes == code.codes
+
+
+def test_missing_code():
+    code = HuffmanCode.from_data(b'abc')
+    with pytest.raises(ValueError):
+        encode(b'abcd', code)
+
+
+def test_corrupt_data():
+    compressed = encode(b'hello, world')
+    with pytest.raises(ValueError):
+        decode(b'not compressed')
+    with pytest.raises(ValueError):
+        decode(compressed[:-2])
+
+
+def test_streams():
+    data = b'the quick brown fox jumps over the lazy dog' * 100
+    with ostringbitstream() as stream:
+        encode_stream(io.BytesIO(data), stream)
+        compressed = stream.getvalue()
+    output = io.BytesIO()
+    with istringbitstream(compressed) as stream:
+        decode_stream(stream, output)
+    assert output.getvalue() == data
+
+
+def test_files(tmp_path):
+    data = os.urandom(10000) + b'z' * 10000
+    original, compressed, decompressed = tmp_path / 'original', tmp_path / 'compressed', tmp_path / 'decompressed'
+    original.write_bytes(data)
+    encode_file(str(original), str(compressed))
+    decode_file(str(compressed), str(decompressed))
+    assert decompressed.read_bytes() == data
@@ -1,15 +1,17 @@
 """Tests for the :mod:`campy.io.tokenscanner` module."""
-from campy.io.tokenscanner import TokenScanner
+from campy.io.tokenscanner import Token, TokenScanner, TokenType
 import io
 
+import pytest
+
 def test_tokenscanner():
     source = io.StringIO('hello 3.14 "world" is this weird >> then I think so')
     scanner = TokenScanner(source)
     scanner.add_operator('>>')
-    scanner._scan_numbers = True
-    scanner._scan_words = True
+    scanner.ignore_whitespace()
+    scanner.scan_numbers()
+    scanner.scan_strings()
 
-    # TODO(sredmond): Actually implement TokenScanner so that these tests pass.
     assert scanner.has_more_tokens()
     assert scanner.next_token() == 'hello'
     assert scanner.has_more_tokens()
@@ -23,6 +25,8 @@ def test_tokenscanner():
     assert scanner.has_more_tokens()
     assert scanner.next_token() == 'weird'
     assert scanner.has_more_tokens()
+    assert scanner.next_token() == '>>'
+    assert scanner.has_more_tokens()
     assert scanner.next_token() == 'then'
     assert scanner.has_more_tokens()
     assert scanner.next_token() == 'I'
@@ -31,3 +35,205 @@ def test_tokenscanner():
     assert scanner.has_more_tokens()
     assert scanner.next_token() == 'so'
     assert not scanner.has_more_tokens()
+
+
+def all_tokens(scanner):
+    tokens = []
+    while scanner.has_more_tokens():
+        tokens.append(scanner.next_token())
+    return tokens
+
+
+def configured_scanner(source):
+    scanner = TokenScanner(source)
+    scanner.ignore_whitespace()
+    scanner.ignore_comments(python_style=True, c_style=True)
+    scanner.scan_numbers()
+    scanner.scan_strings()
+    for op in ['<', '<<=', '>>', '+=']:
+        scanner.add_operator(op)
+    return scanner
+
+
+SOURCE = 'x<<y <<= z>>=2 # comment\n"a \\"b\\"" 1e+ 6.02e23 /* block\ncomment */ a/b // line\n\'c\''
+TOKENS = ['x', '<', '<', 'y', '<<=', 'z', '>>', '=', '2', '"a \\"b\\""', '1', 'e', '+', '6.02e23',
+          'a', '/', 'b', "'c'"]
+
+
+def test_longest_operators_numbers_strings_and_comments():
+    assert all_tokens(configured_scanner(io.StringIO(SOURCE))) == TOKENS
+
+
+def test_whitespace_tokens():
+    assert all_tokens(TokenScanner(io.StringIO('a b\tc'))) == ['a', ' ', 'b', '\t', 'c']
+
+
+def test_word_characters():
+    scanner = TokenScanner(io.StringIO('snake_case kebab-case'))
+    scanner.ignore_whitespace()
+    scanner.add_word_characters('_')
+    assert all_tokens(scanner) == ['snake_case', 'kebab', '-', 'case']
+
+
+def test_tokens_across_chunk_boundaries(monkeypatch):
+    monkeypatch.setattr('campy.io.tokenscanner._CHUNK_SIZE', 3)
+    assert all_tokens(configured_scanner(io.StringIO(SOURCE))) == TOKENS
+
+
+def test_non_seekable_stream():
+    class Pipe:
+        def __init__(self, text):
+            self._stream = io.StringIO(text)
+
+        def read(self, size=-1):
+            return self._stream.read(size)
+
+    assert all_tokens(configured_scanner(Pipe(SOURCE))) == TOKENS
+
+
+def test_options_change_between_tokens():
+    scanner = TokenScanner(io.StringIO('a+=b+=c'))
+    assert scanner.next_token() == 'a'
+    assert scanner.next_token() == '+'
+    scanner.add_operator('+=')
+    assert scanner.next_token() == '='
+    assert all_tokens(scanner) == ['b', '+=', 'c']
+
+
+def test_get_and_unget_char():
+    scanner = TokenScanner(io.StringIO('ab cd'))
+    assert scanner.next_token() == 'ab'
+    assert scanner.get_char() == ' '
+    assert scanner.get_char() == 'c'
+    scanner.unget_char('c')
+    assert scanner.next_token() == 'cd'
+    assert scanner.get_char() == ''
+
+
+CONFIG = 'key = "value"\n# comment\nnext_key=42\n'
+
+
+def scan_config(scanner):
+    scanner.ignore_whitespace()
+    scanner.ignore_comments()
+    scanner.scan_strings()
+    scanner.scan_numbers()
+    scanner.add_word_characters('_')
+    tokens = []
+    while scanner.has_more_tokens():
+        tokens.append((scanner.next_token(), scanner.get_position()))
+    return tokens
+
+
+CONFIG_TOKENS = [('key', (1, 3)), ('=', (1, 5)), ('"value"', (1, 13)),
+                 ('next_key', (3, 8)), ('=', (3, 9)), ('42', (3, 11))]
+
+
+def test_from_string():
+    assert scan_config(TokenScanner.from_string(CONFIG)) == CONFIG_TOKENS
+
+
+def test_from_bytes():
+    expected = [(token.encode(), position) for token, position in CONFIG_TOKENS]
+    assert scan_config(TokenScanner.from_bytes(CONFIG.encode())) == expected
+    assert scan_config(TokenScanner.from_bytes(memoryview(CONFIG.encode()))) == expected
+
+
+def test_from_file(tmp_path):
+    path = tmp_path / 'settings.cfg'
+    path.write_text(CONFIG)
+    with TokenScanner.from_file(str(path)) as scanner:
+        assert scan_config(scanner) == CONFIG_TOKENS
+    with TokenScanner.from_file(str(path), mmap=True) as scanner:
+        assert scan_config(scanner) == [(token.encode(), position) for token, position in CONFIG_TOKENS]
+
+
+def test_from_empty_file(tmp_path):
+    path = tmp_path / 'empty.cfg'
+    path.write_text('')
+    with TokenScanner.from_file(str(path), mmap=True) as scanner:
+        assert not scanner.has_more_tokens()
+
+
+def test_position_across_chunks(monkeypatch):
+    monkeypatch.setattr('campy.io.tokenscanner._CHUNK_SIZE', 2)
+    assert scan_config(TokenScanner(io.StringIO(CONFIG))) == CONFIG_TOKENS
+
+
+def test_bytes_token_types():
+    scanner = TokenScanner.from_bytes(b'')
+    assert scanner.get_token_type(b'"x"') == TokenType.STRING
+    assert scanner.get_token_type(b'42') == TokenType.NUMBER
+    assert scanner.get_token_type(b'x') == TokenType.WORD
+    assert scanner.get_token_type(b'+') == TokenType.OPERATOR
+
+
+def test_iterate_over_tokens():
+    scanner = TokenScanner.from_string('total = price * 1.08 + "tax"')
+    scanner.ignore_whitespace()
+    scanner.scan_numbers()
+    scanner.scan_strings()
+    assert list(scanner) == [
+        Token(TokenType.WORD, 'total', 0, 5),
+        Token(TokenType.OPERATOR, '=', 6, 7),
+        Token(TokenType.WORD, 'price', 8, 13),
+        Token(TokenType.OPERATOR, '*', 14, 15),
+        Token(TokenType.NUMBER, '1.08', 16, 20),
+        Token(TokenType.OPERATOR, '+', 21, 22),
+        Token(TokenType.STRING, '"tax"', 23, 28),
+    ]
+
+
+def test_iterate_matches_next_token(monkeypatch):
+    monkeypatch.setattr('campy.io.tokenscanner._CHUNK_SIZE', 3)
+    tokens = list(configured_scanner(io.StringIO(SOURCE)))
+    assert [token.text for token in tokens] == TOKENS
+    for token in tokens:
+        assert SOURCE[token.start:token.end] == token.text
+        assert token.type == TokenScanner(None).get_token_type(token.text)
+
+
+def test_save_token_is_last_in_first_out():
+    scanner = TokenScanner.from_string('a b c')
+    scanner.ignore_whitespace()
+    first, second = scanner.next_token(), scanner.next_token()
+    scanner.save_token(second)
+    scanner.save_token(first)
+    assert all_tokens(scanner) == ['a', 'b', 'c']
+
+
+def test_saved_tokens_while_iterating():
+    scanner = TokenScanner.from_string('x 42')
+    scanner.ignore_whitespace()
+    scanner.scan_numbers()
+    token = next(scanner)
+    scanner.save_token(token)
+    assert next(scanner) is token
+    scanner.save_token('y')
+    assert next(scanner) == Token(TokenType.WORD, 'y', None, None)
+    assert [token.text for token in scanner] == ['42']
+    assert not scanner.has_more_tokens()
+
+
+def test_get_string_value():
+    scanner = TokenScanner(None)
+    assert scanner.get_string_value('"plain"') == 'plain'
+    assert scanner.get_string_value("'single'") == 'single'
+    assert scanner.get_string_value('bare') == 'bare'
+    assert scanner.get_string_value(r'"say \"hi\"\n"') == 'say "hi"\n'
+    assert scanner.get_string_value(r'"a\\b\tc\q"') == 'a\\b\tcq'
+    assert scanner.get_string_value(r'"\x41\102C\0"') == 'ABC\0'
+    assert scanner.get_string_value(r'"\1014"') == 'A4'
+
+
+def test_get_string_value_rejects_oversized_escape():
+    scanner = TokenScanner(None)
+    with pytest.raises(ValueError, match='valid character code'):
+        scanner.get_string_value(r'"\x110000"')
+
+
+def test_get_string_value_of_bytes():
+    scanner = TokenScanner.from_bytes(b'"caf\\xe9\\n" \'plain\'')
+    scanner.ignore_whitespace()
+    scanner.scan_strings()
+    assert [scanner.get_string_value(token) for token in all_tokens(scanner)] == [b'caf\xe9\n', b'plain']
@@ -0,0 +1,81 @@
+"""Tests for batched redrawing in the :mod:`campy.private.backends.tk.backend_tk` module."""
+from campy.private.backends.tk.backend_tk import DONT_WAIT, TkBackend, TkWindow
+
+
+class StubTk:
+    """Stands in for a Tk root or toplevel, counting the calls that redraw."""
+    def __init__(self):
+        self.redraws = 0
+        self.events = []
+
+    def update_idletasks(self):
+        self.redraws += 1
+
+    def dooneevent(self, flags):
+        self.events.append(flags)
+
+
+def make_window():
+    # Skip TkWindow.__init__, which needs a display.
+    window = TkWindow.__new__(TkWindow)
+    window._master = StubTk()
+    window._closed = False
+    window._batch_depth = 0
+    window._dirty = False
+    return window
+
+
+def test_update_without_batch_redraws_immediately():
+    window = make_window()
+    window.request_update()
+    window.request_update()
+    assert window._master.redraws == 2
+
+
+def test_nested_batches_redraw_once_at_outermost_end():
+    window = make_window()
+    window.begin_batch()
+    window.request_update()
+    window.begin_batch()
+    window.request_update()
+    window.end_batch()
+    assert window._master.redraws == 0
+    assert window._dirty
+    window.request_update()
+    window.end_batch()
+    assert window._master.redraws == 1
+    assert not window._dirty
+
+
+def test_batch_without_updates_does_not_redraw():
+    window = make_window()
+    window.begin_batch()
+    window.end_batch()
+    window.end_batch()  # An unmatched end is ignored.
+    assert window._master.redraws == 0
+    assert window._batch_depth == 0
+
+
+def test_closed_window_is_not_redrawn():
+    window = make_window()
+    window.begin_batch()
+    window.request_update()
+    window._closed = True
+    window.end_batch()
+    assert window._master.redraws == 0
+
+
+def test_event_pump_one_clears_dirty_windows():
+    backend = TkBackend.__new__(TkBackend)
+    backend._root = StubTk()
+    backend._windows = [make_window(), make_window()]
+    for window in backend._windows:
+        window.begin_batch()
+        window.request_update()
+    backend.event_pump_one()
+    assert backend._root.redraws == 1
+    assert backend._root.events == [DONT_WAIT]
+    for window in backend._windows:
+        assert not window._dirty
+        window.end_batch()
+        assert window._master.redraws == 0